@@ -0,0 +1,259 @@
+"""Baseline: the schema create_all built before migrations
+
+Databases created by the application before migrations existed already have
+these tables; mark them with `alembic stamp 0001_baseline` (or 0002 if they
+have the document pipeline tables too) instead of running this revision.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '0001_baseline'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('google_id', sa.String(), nullable=True),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('profile_pic', sa.String(), nullable=True),
+        sa.Column('hashed_password', sa.String(), nullable=True),
+        sa.Column('is_admin', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_google_id', 'users', ['google_id'], unique=True)
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    op.create_table(
+        'properties',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('address', sa.String(length=255), nullable=False),
+        sa.Column('num_bedrooms', sa.Integer(), nullable=True),
+        sa.Column('num_bathrooms', sa.Integer(), nullable=True),
+        sa.Column('num_floors', sa.Integer(), nullable=True),
+        sa.Column('is_commercial', sa.Boolean(), nullable=True),
+        sa.Column('is_hoa', sa.Boolean(), nullable=True),
+        sa.Column('hoa_fee', sa.Float(), nullable=True),
+        sa.Column('is_nnn', sa.Boolean(), nullable=True),
+        sa.Column('purchase_price', sa.Float(), nullable=True),
+        sa.Column('purchase_date', sa.Date(), nullable=True),
+        sa.Column('property_type', sa.String(length=50), nullable=True),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_properties_id', 'properties', ['id'])
+
+    op.create_table(
+        'vendors',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('contact_person', sa.String(length=100), nullable=True),
+        sa.Column('phone_number', sa.String(length=20), nullable=True),
+        sa.Column('email', sa.String(length=120), nullable=True),
+        sa.Column('address', sa.String(length=255), nullable=True),
+        sa.Column('services_provided', sa.String(length=255), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_vendors_id', 'vendors', ['id'])
+
+    op.create_table(
+        'utilities',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('utility_type', sa.String(length=50), nullable=False),
+        sa.Column('utility_cost', sa.Float(), nullable=True),
+        sa.Column('company_name', sa.String(length=100), nullable=False),
+        sa.Column('account_number', sa.String(length=50), nullable=True),
+        sa.Column('contact_number', sa.String(length=20), nullable=True),
+        sa.Column('website', sa.String(length=255), nullable=True),
+        sa.Column('property_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['property_id'], ['properties.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_utilities_id', 'utilities', ['id'])
+
+    op.create_table(
+        'leases',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('property_id', sa.Integer(), nullable=False),
+        sa.Column('lease_type', sa.String(length=50), nullable=False),
+        sa.Column('description', sa.String(length=200), nullable=True),
+        sa.Column('rent_amount_total', sa.Float(), nullable=True),
+        sa.Column('rent_amount_monthly', sa.Float(), nullable=True),
+        sa.Column('security_deposit_amount', sa.String(length=50), nullable=True),
+        sa.Column('security_deposit_held_by', sa.String(length=100), nullable=True),
+        sa.Column('start_date', sa.Date(), nullable=True),
+        sa.Column('end_date', sa.Date(), nullable=True),
+        sa.Column('payment_frequency', sa.String(length=20), nullable=True),
+        sa.Column('tenant_info', postgresql.JSONB(), nullable=True),
+        sa.Column('special_lease_terms', postgresql.JSONB(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(['property_id'], ['properties.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_leases_id', 'leases', ['id'])
+
+    op.create_table(
+        'tenants',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('property_id', sa.Integer(), nullable=True),
+        sa.Column('lease_id', sa.Integer(), nullable=True),
+        sa.Column('first_name', sa.String(), nullable=False),
+        sa.Column('last_name', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('phone_number', sa.String(), nullable=True),
+        sa.Column('date_of_birth', sa.Date(), nullable=True),
+        sa.Column('landlord', sa.String(), nullable=True),
+        sa.Column('address', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['lease_id'], ['leases.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_tenants_id', 'tenants', ['id'])
+
+    op.create_table(
+        'payments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('lease_id', sa.Integer(), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('payment_date', sa.Date(), nullable=False),
+        sa.Column('due_date', sa.Date(), nullable=False),
+        sa.Column('payment_method', sa.String(length=50), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['lease_id'], ['leases.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.create_table(
+        'invoices',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('property_id', sa.Integer(), nullable=False),
+        sa.Column('vendor_id', sa.Integer(), nullable=True),
+        sa.Column('invoice_number', sa.String(length=50), nullable=True),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('paid_amount', sa.Float(), nullable=True),
+        sa.Column('remaining_balance', sa.Float(), nullable=False),
+        sa.Column('invoice_date', sa.Date(), nullable=True),
+        sa.Column('due_date', sa.Date(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['vendor_id'], ['vendors.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_invoices_id', 'invoices', ['id'])
+
+    op.create_table(
+        'invoice_items',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('invoice_id', sa.Integer(), nullable=False),
+        sa.Column('description', sa.String(length=255), nullable=False),
+        sa.Column('quantity', sa.Float(), nullable=True),
+        sa.Column('unit_price', sa.Float(), nullable=False),
+        sa.Column('total_price', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['invoice_id'], ['invoices.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_invoice_items_id', 'invoice_items', ['id'])
+
+    op.create_table(
+        'expenses',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('property_id', sa.Integer(), nullable=False),
+        sa.Column('vendor_id', sa.Integer(), nullable=True),
+        sa.Column('invoice_id', sa.Integer(), nullable=True),
+        sa.Column('category', sa.String(length=50), nullable=True),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('transaction_date', sa.Date(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('receipt_url', sa.String(length=255), nullable=True),
+        sa.Column('is_recurring', sa.Boolean(), nullable=True),
+        sa.Column('frequency', sa.String(length=20), nullable=True),
+        sa.Column('bank_account', sa.String(length=100), nullable=True),
+        sa.Column('method', sa.String(length=50), nullable=True),
+        sa.Column('entity', sa.String(length=100), nullable=True),
+        sa.ForeignKeyConstraint(['property_id'], ['properties.id']),
+        sa.ForeignKeyConstraint(['vendor_id'], ['vendors.id']),
+        sa.ForeignKeyConstraint(['invoice_id'], ['invoices.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('invoice_id'),
+    )
+
+    op.create_table(
+        'incomes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('property_id', sa.Integer(), nullable=False),
+        sa.Column('category', sa.String(length=50), nullable=True),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('transaction_date', sa.Date(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('bank_account', sa.String(length=100), nullable=True),
+        sa.Column('method', sa.String(length=50), nullable=True),
+        sa.Column('entity', sa.String(length=100), nullable=True),
+        sa.ForeignKeyConstraint(['property_id'], ['properties.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.create_table(
+        'contracts',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('property_id', sa.Integer(), nullable=False),
+        sa.Column('vendor_id', sa.Integer(), nullable=True),
+        sa.Column('contract_type', sa.String(length=50), nullable=False),
+        sa.Column('start_date', sa.Date(), nullable=True),
+        sa.Column('end_date', sa.Date(), nullable=True),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('terms', postgresql.JSONB(), nullable=True),
+        sa.Column('parties_involved', postgresql.JSONB(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['vendor_id'], ['vendors.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.create_table(
+        'documents',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('property_id', sa.Integer(), nullable=True),
+        sa.Column('lease_id', sa.Integer(), nullable=True),
+        sa.Column('tenant_id', sa.Integer(), nullable=True),
+        sa.Column('expense_id', sa.Integer(), nullable=True),
+        sa.Column('invoice_id', sa.Integer(), nullable=True),
+        sa.Column('contract_id', sa.Integer(), nullable=True),
+        sa.Column('document_type', sa.String(length=50), nullable=False),
+        sa.Column('upload_date', sa.DateTime(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['lease_id'], ['leases.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['expense_id'], ['expenses.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['invoice_id'], ['invoices.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['contract_id'], ['contracts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('invoice_id'),
+    )
+
+
+def downgrade() -> None:
+    for table in (
+        'documents', 'contracts', 'incomes', 'expenses', 'invoice_items', 'invoices',
+        'payments', 'tenants', 'leases', 'utilities', 'vendors', 'properties', 'users',
+    ):
+        op.drop_table(table)
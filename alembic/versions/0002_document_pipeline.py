@@ -0,0 +1,162 @@
+"""Document pipeline: packets, page cache, image fingerprints, usage and telemetry
+
+Revision ID: 0002_document_pipeline
+Revises: 0001_baseline
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0002_document_pipeline'
+down_revision = '0001_baseline'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'document_packets',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('property_id', sa.Integer(), nullable=True),
+        sa.Column('filename', sa.String(length=255), nullable=True),
+        sa.Column('page_count', sa.Integer(), nullable=False),
+        sa.Column('upload_date', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.add_column('documents', sa.Column('packet_id', sa.Integer(), nullable=True))
+    op.add_column('documents', sa.Column('owner_id', sa.Integer(), nullable=True))
+    op.add_column('documents', sa.Column('prompt_version', sa.String(length=100), nullable=True))
+    op.add_column(
+        'documents',
+        sa.Column('status', sa.String(length=30), nullable=False, server_default='processed')
+    )
+    op.add_column('documents', sa.Column('extracted_text', sa.Text(), nullable=True))
+    op.add_column('documents', sa.Column('trace_parent', sa.String(length=55), nullable=True))
+    op.create_foreign_key(
+        'documents_packet_id_fkey', 'documents', 'document_packets', ['packet_id'], ['id'], ondelete='SET NULL'
+    )
+    op.create_foreign_key(
+        'documents_owner_id_fkey', 'documents', 'users', ['owner_id'], ['id'], ondelete='CASCADE'
+    )
+    op.create_index('ix_documents_status', 'documents', ['status'])
+
+    op.create_table(
+        'document_pages',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('document_id', sa.Integer(), nullable=False),
+        sa.Column('page_number', sa.Integer(), nullable=False),
+        sa.Column('text_hash', sa.String(length=64), nullable=False),
+        sa.Column('image_hash', sa.String(length=16), nullable=True),
+        sa.Column('is_ocr', sa.Boolean(), nullable=True),
+        sa.Column('text', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_document_pages_document_id', 'document_pages', ['document_id'])
+
+    op.create_table(
+        'image_fingerprints',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('invoice_id', sa.Integer(), nullable=True),
+        sa.Column('document_id', sa.Integer(), nullable=True),
+        sa.Column('dhash', sa.String(length=16), nullable=False),
+        sa.Column('phash', sa.String(length=16), nullable=False),
+        sa.Column('filename', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['invoice_id'], ['invoices.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_image_fingerprints_owner_id', 'image_fingerprints', ['owner_id'])
+
+    op.create_table(
+        'llm_usage',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('document_id', sa.Integer(), nullable=True),
+        sa.Column('stage', sa.String(length=30), nullable=False),
+        sa.Column('task', sa.String(length=50), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('tier', sa.String(length=20), nullable=True),
+        sa.Column('prompt_tokens', sa.Integer(), nullable=False),
+        sa.Column('completion_tokens', sa.Integer(), nullable=False),
+        sa.Column('cached_tokens', sa.Integer(), nullable=False),
+        sa.Column('cost', sa.Float(), nullable=False),
+        sa.Column('latency_ms', sa.Integer(), nullable=False),
+        sa.Column('success', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_llm_usage_document_id', 'llm_usage', ['document_id'])
+    op.create_index('ix_llm_usage_owner_created', 'llm_usage', ['owner_id', 'created_at'])
+
+    op.create_table(
+        'llm_budgets',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('monthly_limit', sa.Float(), nullable=False),
+        sa.Column('hard_limit', sa.Boolean(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('owner_id'),
+    )
+
+    op.create_table(
+        'document_telemetry',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('document_id', sa.Integer(), nullable=True),
+        sa.Column('packet_id', sa.Integer(), nullable=True),
+        sa.Column('document_type', sa.String(length=50), nullable=False),
+        sa.Column('file_type', sa.String(length=10), nullable=True),
+        sa.Column('bytes', sa.Integer(), nullable=False),
+        sa.Column('pages', sa.Integer(), nullable=False),
+        sa.Column('ocr_pages', sa.Integer(), nullable=False),
+        sa.Column('text_layer_pages', sa.Integer(), nullable=False),
+        sa.Column('reused_pages', sa.Integer(), nullable=False),
+        sa.Column('read_ms', sa.Float(), nullable=True),
+        sa.Column('ocr_ms', sa.Float(), nullable=True),
+        sa.Column('classify_ms', sa.Float(), nullable=True),
+        sa.Column('extract_ms', sa.Float(), nullable=True),
+        sa.Column('map_ms', sa.Float(), nullable=True),
+        sa.Column('db_ms', sa.Float(), nullable=True),
+        sa.Column('total_ms', sa.Float(), nullable=False),
+        sa.Column('llm_calls', sa.Integer(), nullable=False),
+        sa.Column('llm_retries', sa.Integer(), nullable=False),
+        sa.Column('prompt_tokens', sa.Integer(), nullable=False),
+        sa.Column('completion_tokens', sa.Integer(), nullable=False),
+        sa.Column('cached_tokens', sa.Integer(), nullable=False),
+        sa.Column('outcome', sa.String(length=30), nullable=False),
+        sa.Column('error', sa.String(length=500), nullable=True),
+        sa.Column('resumed', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['packet_id'], ['document_packets.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_document_telemetry_document_id', 'document_telemetry', ['document_id'])
+    op.create_index('ix_document_telemetry_owner_created', 'document_telemetry', ['owner_id', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_table('document_telemetry')
+    op.drop_table('llm_budgets')
+    op.drop_table('llm_usage')
+    op.drop_table('image_fingerprints')
+    op.drop_table('document_pages')
+    op.drop_index('ix_documents_status', table_name='documents')
+    op.drop_constraint('documents_owner_id_fkey', 'documents', type_='foreignkey')
+    op.drop_constraint('documents_packet_id_fkey', 'documents', type_='foreignkey')
+    for column in ('trace_parent', 'extracted_text', 'status', 'prompt_version', 'owner_id', 'packet_id'):
+        op.drop_column('documents', column)
+    op.drop_table('document_packets')
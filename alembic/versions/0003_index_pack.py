@@ -0,0 +1,49 @@
+"""Index pack: foreign keys used by owner-scoped joins, and list filter indexes
+
+Built with CREATE INDEX CONCURRENTLY, so writes continue while the indexes
+are built on a live database. Foreign keys led by a composite index
+(expenses.property_id, incomes.property_id, payments.lease_id) get no
+separate index.
+
+Revision ID: 0003_index_pack
+Revises: 0002_document_pipeline
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = '0003_index_pack'
+down_revision = '0002_document_pipeline'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('ix_properties_owner_id', 'properties', ['owner_id']),
+    ('ix_tenants_owner_id', 'tenants', ['owner_id']),
+    ('ix_vendors_owner_id', 'vendors', ['owner_id']),
+    ('ix_leases_property_id', 'leases', ['property_id']),
+    ('ix_documents_property_id', 'documents', ['property_id']),
+    ('ix_utilities_property_id', 'utilities', ['property_id']),
+    ('ix_contracts_property_id', 'contracts', ['property_id']),
+    ('ix_invoice_items_invoice_id', 'invoice_items', ['invoice_id']),
+    ('ix_expenses_property_date', 'expenses', ['property_id', 'transaction_date']),
+    ('ix_expenses_vendor_date', 'expenses', ['vendor_id', 'transaction_date']),
+    ('ix_incomes_property_date', 'incomes', ['property_id', 'transaction_date']),
+    ('ix_invoices_property_due', 'invoices', ['property_id', 'due_date']),
+    ('ix_invoices_status_due', 'invoices', ['status', 'due_date']),
+    ('ix_payments_lease_date', 'payments', ['lease_id', 'payment_date']),
+    ('ix_payments_status_due', 'payments', ['status', 'due_date']),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            # Databases created with create_all may already have them
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,21 @@
+"""Document claims: when the extraction worker claimed a pending document
+
+Revision ID: 0004_document_claimed_at
+Revises: 0003_index_pack
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0004_document_claimed_at'
+down_revision = '0003_index_pack'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('documents', sa.Column('claimed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('documents', 'claimed_at')
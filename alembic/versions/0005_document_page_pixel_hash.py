@@ -0,0 +1,21 @@
+"""Document pages: exact pixel hash of scanned pages
+
+Revision ID: 0005_document_page_pixel_hash
+Revises: 0004_document_claimed_at
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0005_document_page_pixel_hash'
+down_revision = '0004_document_claimed_at'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('document_pages', sa.Column('pixel_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('document_pages', 'pixel_hash')
@@ -5,8 +5,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, desc
 from app.schemas.chat import ChatMessage, ChatResponse
 from app.services.openai.copilot import OpenAIService
+from app.services.openai.circuit_breaker import LLMUnavailableError
+from app.services.usage_accounting import BudgetExceededError, enforce_budget, record_usage
 from app.core.security import get_current_user
-from app.db.database import get_db
+from app.db.database import get_db, release_connection
 from app.models.user import User
 from app.models.property import Property
 from app.models.expense import Expense
@@ -36,7 +38,17 @@ async def copilot_message(
     openai_service = OpenAIService()
 
     # Use OpenAI to parse the intent and entities
-    intent_and_entities = await openai_service.parse_intent_and_entities(chat_message.message)
+    try:
+        await enforce_budget(db, current_user.id)
+        await release_connection(db)
+        intent_and_entities = await openai_service.parse_intent_and_entities(chat_message.message)
+    except BudgetExceededError as e:
+        return {"response": str(e)}
+    except LLMUnavailableError:
+        return {"response": "The assistant is temporarily unavailable. Please try again in a few minutes."}
+    finally:
+        record_usage(db, current_user.id, "intent", openai_service.usage)
+        await db.commit()
 
     if not intent_and_entities:
         return {"response": "I'm sorry, I didn't understand that."}
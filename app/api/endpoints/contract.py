@@ -2,14 +2,23 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Union
 from app import schemas, crud
-from app.db.database import get_db
+from app.db.database import get_db, use_read_replica
 from app.core.security import get_current_user
 from app.models.user import User
+from app.models.contract import Contract
 from app.services.contract_processor import process_contract_upload
+from app.services.openai.circuit_breaker import LLMUnavailableError
+from app.services.pending_extraction import ExtractionPendingError, pending_extraction_response, llm_unavailable_exception
+from app.utils.timing import start_stage_timer
+from app.utils.field_selection import FieldSelection, FieldSelector
+from app.utils.pagination import PageRequest, page_params, page_response
 
-router = APIRouter()
+# GET endpoints read from a replica when one is configured
+router = APIRouter(dependencies=[Depends(use_read_replica)])
+
+contract_fields = FieldSelector(schemas.Contract, Contract)
 
 @router.post("/upload", response_model=schemas.Contract)
 async def upload_contract(
@@ -33,7 +42,8 @@ async def upload_contract(
         )
         
     try:
-        file_content = await file.read()
+        with start_stage_timer().stage("read"):
+            file_content = await file.read()
         contract = await process_contract_upload(
             file_content=file_content,
             filename=file.filename,
@@ -43,6 +53,10 @@ async def upload_contract(
             owner_id=current_user.id
         )
         return contract
+    except ExtractionPendingError as e:
+        return pending_extraction_response(e)
+    except LLMUnavailableError as e:
+        raise llm_unavailable_exception(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -58,26 +72,31 @@ async def create_contract(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/", response_model=List[schemas.Contract])
+@router.get("/", response_model=Union[List[schemas.Contract], schemas.Page[schemas.Contract]])
 async def read_contracts(
-    skip: int = 0,
-    limit: int = 100,
+    page: PageRequest = Depends(page_params),
+    selection: FieldSelection = Depends(contract_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    contracts = await crud.crud_contract.get_contracts(db=db, owner_id=current_user.id, skip=skip, limit=limit)
-    return contracts
+    contracts = await crud.crud_contract.get_contracts(
+        db=db, owner_id=current_user.id, selection=selection, page=page
+    )
+    return page_response(contracts, selection)
 
 @router.get("/{contract_id}", response_model=schemas.Contract)
 async def read_contract(
     contract_id: int,
+    selection: FieldSelection = Depends(contract_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    contract = await crud.crud_contract.get_contract(db=db, contract_id=contract_id, owner_id=current_user.id)
+    contract = await crud.crud_contract.get_contract(
+        db=db, contract_id=contract_id, owner_id=current_user.id, selection=selection
+    )
     if contract is None:
         raise HTTPException(status_code=404, detail="Contract not found")
-    return contract
+    return selection.respond(contract)
 
 @router.put("/{contract_id}", response_model=schemas.Contract)
 async def update_contract(
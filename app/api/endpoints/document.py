@@ -11,16 +11,25 @@ from fastapi import (
 )
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import List, Optional, Union
 from app import schemas, crud
-from app.db.database import get_db
+from app.db.database import get_db, use_read_replica
 from app.core.security import get_current_user
 from app.models.user import User
+from app.models.document import Document
+from app.utils.field_selection import FieldSelection, FieldSelector
+from app.utils.pagination import PageRequest, page_params, page_response
 import os
 import logging
 from app.core.config import settings  
+from app.services.amendment_processor import process_document_reupload
+from app.services.openai.circuit_breaker import LLMUnavailableError
+from app.services.pending_extraction import llm_unavailable_exception
 
-router = APIRouter()
+# GET endpoints read from a replica when one is configured
+router = APIRouter(dependencies=[Depends(use_read_replica)])
+
+document_fields = FieldSelector(schemas.Document, Document)
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -30,13 +39,13 @@ if not logger.hasHandlers():
 
 @router.get(
     "/", 
-    response_model=List[schemas.Document],
+    response_model=Union[List[schemas.Document], schemas.Page[schemas.Document]],
     summary="Retrieve all documents",
     description="Fetches a list of all documents uploaded by the authenticated user."
 )
 async def read_documents(
-    skip: int = 0,
-    limit: int = 100,
+    page: PageRequest = Depends(page_params),
+    selection: FieldSelection = Depends(document_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -44,26 +53,30 @@ async def read_documents(
     Retrieves a list of documents uploaded by the user.
 
     Args:
-        skip (int): Number of records to skip.
-        limit (int): Maximum number of records to return.
+        page (PageRequest): skip/limit, or the cursor of a keyset page (?cursor=).
+        selection (FieldSelection): The fields to return (?fields=).
         db (AsyncSession): The database session.
         current_user (User): The authenticated user.
 
     Returns:
-        List[Document]: A list of documents.
+        List[Document]: A list of documents, or a Page of them in keyset mode.
     """
-    logger.info(f"User {current_user.id} is requesting documents with skip={skip} and limit={limit}")
+    logger.info(f"User {current_user.id} is requesting documents with {page}")
 
     try:
-        documents = await crud.crud_document.get_documents(db=db, owner_id=current_user.id, skip=skip, limit=limit)
-        logger.info(f"Fetched {len(documents)} documents for user {current_user.id}")
+        documents = await crud.crud_document.get_documents(
+            db=db, owner_id=current_user.id, selection=selection, page=page
+        )
+        logger.info(f"Fetched {len(documents.items)} documents for user {current_user.id}")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to fetch documents for user {current_user.id}: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch documents."
         )
-    return documents
+    return page_response(documents, selection)
 
 
 @router.get(
@@ -74,6 +87,7 @@ async def read_documents(
 )
 async def read_document(
     document_id: int,
+    selection: FieldSelection = Depends(document_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -82,6 +96,7 @@ async def read_document(
 
     Args:
         document_id (int): The ID of the document.
+        selection (FieldSelection): The fields to return (?fields=).
         db (AsyncSession): The database session.
         current_user (User): The authenticated user.
 
@@ -91,7 +106,9 @@ async def read_document(
     logger.info(f"User {current_user.id} is requesting document with ID {document_id}")
 
     try:
-        document = await crud.crud_document.get_document(db=db, document_id=document_id, user_id=current_user.id)
+        document = await crud.crud_document.get_document(
+            db=db, document_id=document_id, owner_id=current_user.id, selection=selection
+        )
         if document is None:
             logger.warning(f"Document {document_id} not found for user {current_user.id}")
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
@@ -104,7 +121,7 @@ async def read_document(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch document."
         )
-    return document
+    return selection.respond(document)
 
 
 @router.put(
@@ -136,7 +153,7 @@ async def update_document(
     logger.info(f"User {current_user.id} is attempting to update document {document_id}")
 
     try:
-        document = await crud.crud_document.get_document(db=db, document_id=document_id, user_id=current_user.id)
+        document = await crud.crud_document.get_document(db=db, document_id=document_id, owner_id=current_user.id)
         if document is None:
             logger.warning(f"Document {document_id} not found for user {current_user.id}")
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
@@ -222,4 +239,59 @@ async def delete_document(
             detail="Failed to delete document."
         )
 
-    return {"id": document_id, "message": "Document deleted successfully."}
\ No newline at end of file
+    return {"id": document_id, "message": "Document deleted successfully."}
+
+
+@router.post(
+    "/{document_id}/reupload",
+    response_model=schemas.DocumentRevision,
+    summary="Re-upload an amended document",
+    description="Compares an amended PDF with the stored pages of a document and re-extracts only the changed pages."
+)
+async def reupload_document(
+    document_id: int,
+    file: UploadFile = File(...),
+    diff_only: bool = False,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Re-processes an amended version of a lease or contract document.
+
+    Args:
+        document_id (int): The ID of the document being amended.
+        file (UploadFile): The amended PDF.
+        diff_only (bool): Only return the page-level diff without re-extracting.
+        db (AsyncSession): The database session.
+        current_user (User): The authenticated user.
+
+    Returns:
+        DocumentRevision: Changed and removed pages, updated fields and a text diff.
+    """
+    logger.info(f"User {current_user.id} is re-uploading document {document_id}")
+    file_content = await file.read()
+    try:
+        revision = await process_document_reupload(
+            file_content=file_content,
+            filename=file.filename,
+            document_id=document_id,
+            db=db,
+            owner_id=current_user.id,
+            diff_only=diff_only
+        )
+    except HTTPException:
+        raise
+    except LLMUnavailableError as e:
+        raise llm_unavailable_exception(e)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Failed to re-process document {document_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to re-process document."
+        )
+    return revision
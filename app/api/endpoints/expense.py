@@ -1,14 +1,20 @@
 # app/api/endpoints/expense.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Annotated, List, Union
 from app import schemas, crud
-from app.db.database import get_db
+from app.db.database import get_db, use_read_replica
 from app.core.security import get_current_user
 from app.models.user import User
+from app.models.expense import Expense
+from app.utils.field_selection import FieldSelection, FieldSelector
+from app.utils.pagination import PageRequest, page_params, page_response
 
-router = APIRouter()
+# GET endpoints read from a replica when one is configured
+router = APIRouter(dependencies=[Depends(use_read_replica)])
+
+expense_fields = FieldSelector(schemas.Expense, Expense)
 
 @router.post("/", response_model=schemas.Expense)
 async def create_expense(
@@ -22,26 +28,32 @@ async def create_expense(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/", response_model=List[schemas.Expense])
+@router.get("/", response_model=Union[List[schemas.Expense], schemas.Page[schemas.Expense]])
 async def read_expenses(
-    skip: int = 0,
-    limit: int = 100,
+    filters: Annotated[schemas.ExpenseFilter, Query()],
+    page: PageRequest = Depends(page_params),
+    selection: FieldSelection = Depends(expense_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    expenses = await crud.crud_expense.get_expenses(db=db, owner_id=current_user.id, skip=skip, limit=limit)
-    return expenses
+    expenses = await crud.crud_expense.get_expenses(
+        db=db, owner_id=current_user.id, selection=selection, page=page, filters=filters
+    )
+    return page_response(expenses, selection)
 
 @router.get("/{expense_id}", response_model=schemas.Expense)
 async def read_expense(
     expense_id: int,
+    selection: FieldSelection = Depends(expense_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    expense = await crud.crud_expense.get_expense(db=db, expense_id=expense_id, owner_id=current_user.id)
+    expense = await crud.crud_expense.get_expense(
+        db=db, expense_id=expense_id, owner_id=current_user.id, selection=selection
+    )
     if expense is None:
         raise HTTPException(status_code=404, detail="Expense not found")
-    return expense
+    return selection.respond(expense)
 
 @router.put("/{expense_id}", response_model=schemas.Expense)
 async def update_expense(
@@ -1,14 +1,20 @@
 # app/api/endpoints/income.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Annotated, List, Union
 from app import schemas, crud
-from app.db.database import get_db
+from app.db.database import get_db, use_read_replica
 from app.core.security import get_current_user
 from app.models.user import User
+from app.models.income import Income
+from app.utils.field_selection import FieldSelection, FieldSelector
+from app.utils.pagination import PageRequest, page_params, page_response
 
-router = APIRouter()
+# GET endpoints read from a replica when one is configured
+router = APIRouter(dependencies=[Depends(use_read_replica)])
+
+income_fields = FieldSelector(schemas.Income, Income)
 
 @router.post("/", response_model=schemas.Income)
 async def create_income(
@@ -22,26 +28,32 @@ async def create_income(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/", response_model=List[schemas.Income])
+@router.get("/", response_model=Union[List[schemas.Income], schemas.Page[schemas.Income]])
 async def read_incomes(
-    skip: int = 0,
-    limit: int = 100,
+    filters: Annotated[schemas.IncomeFilter, Query()],
+    page: PageRequest = Depends(page_params),
+    selection: FieldSelection = Depends(income_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    incomes = await crud.crud_income.get_incomes(db=db, owner_id=current_user.id, skip=skip, limit=limit)
-    return incomes
+    incomes = await crud.crud_income.get_incomes(
+        db=db, owner_id=current_user.id, selection=selection, page=page, filters=filters
+    )
+    return page_response(incomes, selection)
 
 @router.get("/{income_id}", response_model=schemas.Income)
 async def read_income(
     income_id: int,
+    selection: FieldSelection = Depends(income_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    income = await crud.crud_income.get_income(db=db, income_id=income_id, owner_id=current_user.id)
+    income = await crud.crud_income.get_income(
+        db=db, income_id=income_id, owner_id=current_user.id, selection=selection
+    )
     if income is None:
         raise HTTPException(status_code=404, detail="Income not found")
-    return income
+    return selection.respond(income)
 
 @router.put("/{income_id}", response_model=schemas.Income)
 async def update_income(
@@ -1,29 +1,41 @@
 # app/api/endpoints/invoice.py
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Annotated, List, Union
 from app import schemas, crud
-from app.db.database import get_db
+from app.db.database import get_db, use_read_replica
 from app.core.security import get_current_user
 from app.models.user import User
+from app.models.invoice.invoice import Invoice
 from app.services.invoice_processor import process_invoice_upload
+from app.services.duplicate_detection import DuplicateDocumentError
+from app.services.openai.circuit_breaker import LLMUnavailableError
+from app.services.pending_extraction import ExtractionPendingError, pending_extraction_response, llm_unavailable_exception
 import logging
+from app.utils.timing import start_stage_timer
+from app.utils.field_selection import FieldSelection, FieldSelector
+from app.utils.pagination import PageRequest, page_params, page_response
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+# GET endpoints read from a replica when one is configured
+router = APIRouter(dependencies=[Depends(use_read_replica)])
+
+invoice_fields = FieldSelector(schemas.Invoice, Invoice)
 
 @router.post("/upload", response_model=schemas.Invoice)
 async def upload_invoice(
     property_id: int = Form(...),
     document_type: str = Form(...),
     file: UploadFile = File(...),
+    allow_duplicate: bool = Form(False),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Upload an invoice document, process it, and create an invoice.
+    Near-duplicates of earlier uploads are rejected with 409 unless `allow_duplicate` is set.
     """
 
     # Verify that the property exists and belongs to the owner
@@ -39,7 +51,8 @@ async def upload_invoice(
         )
 
     # Read the file content
-    file_content = await file.read()
+    with start_stage_timer().stage("read"):
+        file_content = await file.read()
 
     try:
         invoice = await process_invoice_upload(
@@ -48,8 +61,18 @@ async def upload_invoice(
             property_id=property_id,
             document_type=document_type,
             db=db,
-            owner_id=current_user.id
+            owner_id=current_user.id,
+            allow_duplicate=allow_duplicate
+        )
+    except DuplicateDocumentError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
         )
+    except ExtractionPendingError as e:
+        return pending_extraction_response(e)
+    except LLMUnavailableError as e:
+        raise llm_unavailable_exception(e)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -84,32 +107,38 @@ async def create_invoice(
         raise HTTPException(status_code=400, detail=str(e))
     return invoice
 
-@router.get("/", response_model=List[schemas.Invoice])
+@router.get("/", response_model=Union[List[schemas.Invoice], schemas.Page[schemas.Invoice]])
 async def read_invoices(
-    skip: int = 0,
-    limit: int = 100,
+    filters: Annotated[schemas.InvoiceFilter, Query()],
+    page: PageRequest = Depends(page_params),
+    selection: FieldSelection = Depends(invoice_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Retrieve invoices belonging to the current user.
     """
-    invoices = await crud.crud_invoice.get_invoices(db=db, owner_id=current_user.id, skip=skip, limit=limit)
-    return invoices
+    invoices = await crud.crud_invoice.get_invoices(
+        db=db, owner_id=current_user.id, selection=selection, page=page, filters=filters
+    )
+    return page_response(invoices, selection)
 
 @router.get("/{invoice_id}", response_model=schemas.Invoice)
 async def read_invoice(
     invoice_id: int,
+    selection: FieldSelection = Depends(invoice_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Retrieve a specific invoice by ID.
     """
-    invoice = await crud.crud_invoice.get_invoice(db=db, invoice_id=invoice_id, owner_id=current_user.id)
+    invoice = await crud.crud_invoice.get_invoice(
+        db=db, invoice_id=invoice_id, owner_id=current_user.id, selection=selection
+    )
     if invoice is None:
         raise HTTPException(status_code=404, detail="Invoice not found")
-    return invoice
+    return selection.respond(invoice)
 
 @router.put("/{invoice_id}", response_model=schemas.Invoice)
 async def update_invoice(
@@ -2,22 +2,31 @@
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import List, Optional, Union
 from app import schemas, crud
-from app.db.database import get_db
+from app.db.database import get_db, use_read_replica
 from app.core.security import get_current_user
 from app.models.user import User
+from app.models.lease import Lease
 from app.services.document_processor import extract_text_from_file
 from app.services.openai.openai_document import OpenAIService
 from app.services.mapping_functions import parse_json, map_lease_data
 from app.services.lease_processor import process_lease_upload
+from app.services.openai.circuit_breaker import LLMUnavailableError
+from app.services.pending_extraction import ExtractionPendingError, pending_extraction_response, llm_unavailable_exception
 from io import BytesIO
 import json
 import logging
+from app.utils.timing import start_stage_timer
+from app.utils.field_selection import FieldSelection, FieldSelector
+from app.utils.pagination import PageRequest, page_params, page_response
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+# GET endpoints read from a replica when one is configured
+router = APIRouter(dependencies=[Depends(use_read_replica)])
+
+lease_fields = FieldSelector(schemas.Lease, Lease)
 
 @router.post("/upload", response_model=schemas.Lease)
 async def upload_lease(
@@ -45,7 +54,8 @@ async def upload_lease(
             )
 
     # Read the file content
-    file_content = await file.read()
+    with start_stage_timer().stage("read"):
+        file_content = await file.read()
     
     try:
         lease = await process_lease_upload(
@@ -56,6 +66,10 @@ async def upload_lease(
             db=db,
             owner_id=current_user.id
         )
+    except ExtractionPendingError as e:
+        return pending_extraction_response(e)
+    except LLMUnavailableError as e:
+        raise llm_unavailable_exception(e)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -90,32 +104,35 @@ async def create_lease(
         raise HTTPException(status_code=400, detail=str(e))
     return lease
 
-@router.get("/", response_model=List[schemas.Lease])
+@router.get("/", response_model=Union[List[schemas.Lease], schemas.Page[schemas.Lease]])
 async def read_leases(
-    skip: int = 0,
-    limit: int = 100,
+    page: PageRequest = Depends(page_params),
+    selection: FieldSelection = Depends(lease_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Retrieve leases belonging to the current user.
     """
-    leases = await crud.crud_lease.get_leases(db=db, owner_id=current_user.id, skip=skip, limit=limit)
-    return leases
+    leases = await crud.crud_lease.get_leases(
+        db=db, owner_id=current_user.id, selection=selection, page=page
+    )
+    return page_response(leases, selection)
 
 @router.get("/{lease_id}", response_model=schemas.Lease)
 async def read_lease(
     lease_id: int,
+    selection: FieldSelection = Depends(lease_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Retrieve a specific lease by ID.
     """
-    lease = await crud.crud_lease.get_lease(db=db, lease_id=lease_id, owner_id=current_user.id)
+    lease = await crud.crud_lease.get_lease(db=db, lease_id=lease_id, owner_id=current_user.id, selection=selection)
     if lease is None:
         raise HTTPException(status_code=404, detail="Lease not found")
-    return lease
+    return selection.respond(lease)
 
 @router.put("/{lease_id}", response_model=schemas.Lease)
 async def update_lease(
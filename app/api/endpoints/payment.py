@@ -1,14 +1,20 @@
 # app/api/endpoints/payment.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Annotated, List, Union
 from app import schemas, crud
-from app.db.database import get_db
+from app.db.database import get_db, use_read_replica
 from app.core.security import get_current_user
 from app.models.user import User
+from app.models.payment import Payment
+from app.utils.field_selection import FieldSelection, FieldSelector
+from app.utils.pagination import PageRequest, page_params, page_response
 
-router = APIRouter()
+# GET endpoints read from a replica when one is configured
+router = APIRouter(dependencies=[Depends(use_read_replica)])
+
+payment_fields = FieldSelector(schemas.Payment, Payment)
 
 @router.post("/", response_model=schemas.Payment)
 async def create_payment(
@@ -22,26 +28,32 @@ async def create_payment(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/", response_model=List[schemas.Payment])
+@router.get("/", response_model=Union[List[schemas.Payment], schemas.Page[schemas.Payment]])
 async def read_payments(
-    skip: int = 0,
-    limit: int = 100,
+    filters: Annotated[schemas.PaymentFilter, Query()],
+    page: PageRequest = Depends(page_params),
+    selection: FieldSelection = Depends(payment_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    payments = await crud.crud_payment.get_payments(db=db, owner_id=current_user.id, skip=skip, limit=limit)
-    return payments
+    payments = await crud.crud_payment.get_payments(
+        db=db, owner_id=current_user.id, selection=selection, page=page, filters=filters
+    )
+    return page_response(payments, selection)
 
 @router.get("/{payment_id}", response_model=schemas.Payment)
 async def read_payment(
     payment_id: int,
+    selection: FieldSelection = Depends(payment_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    payment = await crud.crud_payment.get_payment(db=db, payment_id=payment_id, owner_id=current_user.id)
+    payment = await crud.crud_payment.get_payment(
+        db=db, payment_id=payment_id, owner_id=current_user.id, selection=selection
+    )
     if payment is None:
         raise HTTPException(status_code=404, detail="Payment not found")
-    return payment
+    return selection.respond(payment)
 
 @router.put("/{payment_id}", response_model=schemas.Payment)
 async def update_payment(
@@ -2,21 +2,34 @@
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime
 from app import schemas, crud
-from app.db.database import get_db
+from app.db.database import get_db, SessionLocal, release_connection, share_request
+from app.core.access import share_access
 from app.core.security import get_current_user
 from app.models.user import User
 from app.services.document_processor import extract_text_from_file
 from app.services.contract_processor import process_contract_upload
 from app.services.invoice_processor import process_invoice_upload
+from app.services.duplicate_detection import DuplicateDocumentError
 from app.services.lease_processor import process_lease_upload
+from app.services.packet_processor import process_packet_upload
 from app.services.openai.openai_document import OpenAIService
+from app.services.openai.model_router import routing_stats
+from app.services.openai.circuit_breaker import LLMUnavailableError
+from app.services.usage_accounting import BudgetExceededError, enforce_budget, record_usage
+from app.services.pending_extraction import ExtractionPendingError, pending_extraction_response, llm_unavailable_exception
 from io import BytesIO
 import logging
-from app.utils.timing import log_timing
+from app.utils.timing import log_timing, start_stage_timer
+from app.utils.single_flight import SingleFlight, content_key
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
+
+classification_flight = SingleFlight("document classification")
+processing_flight = SingleFlight("document processing")
 @router.post("/upload")
 async def upload_document(
     file: UploadFile = File(...),
@@ -29,18 +42,43 @@ async def upload_document(
     # Read the file content
     file_content = await file.read()
     filename = file.filename
-    # Extract text from the file
-    file_like = BytesIO(file_content)
-    text = extract_text_from_file(file_like, filename)
-    if not text:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Could not extract text from the document."
-        )
-    # Initialize OpenAIService
-    openai_service = OpenAIService()
-    document_type = None
-    document_type = await openai_service.determine_document_type(text)
+    owner_id = current_user.id
+
+    async def classify():
+        # Runs in its own session: the result is shared with identical concurrent requests
+        # Extract text from the file
+        file_like = BytesIO(file_content)
+        text = extract_text_from_file(file_like, filename)
+        if not text:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Could not extract text from the document."
+            )
+        # Initialize OpenAIService
+        openai_service = OpenAIService()
+        async with SessionLocal() as session:
+            share_request(db, session)
+            try:
+                await enforce_budget(session, owner_id)
+                await release_connection(session)
+                return await openai_service.determine_document_type(text)
+            except BudgetExceededError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(e)
+                )
+            except LLMUnavailableError as e:
+                raise llm_unavailable_exception(e)
+            finally:
+                record_usage(session, owner_id, "classification", openai_service.usage)
+                await session.commit()
+
+    # The flight works in its own session; return the request's connection meanwhile
+    await release_connection(db)
+    document_type = await classification_flight.do(
+        ("classify", owner_id, content_key(file_content)),
+        classify
+    )
     if not document_type:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -54,11 +92,15 @@ async def process_document(
     property_id: int = Form(...),
     document_type: str = Form(...),
     file: UploadFile = File(...),
+    allow_duplicate: bool = Form(False),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Process the document based on the confirmed document type.
+    Invoices that look like a re-upload of an earlier image are rejected with 409
+    unless `allow_duplicate` is set. While the model provider is unavailable the
+    document is stored and 202 is returned; extraction resumes automatically.
     """
     # Verify that the property exists and belongs to the owner
     property = await crud.crud_property.get_property_by_owner(
@@ -71,47 +113,72 @@ async def process_document(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Property not found or you do not have access to this property."
         )
-    # Read the file content
-    file_content = await file.read()
+    if document_type.lower() not in {'lease', 'invoice', 'contract'}:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported document type: {document_type}"
+        )
+    # Read the file content; the pipeline's telemetry picks up this timer
+    with start_stage_timer().stage("read"):
+        file_content = await file.read()
+    filename = file.filename
+    owner_id = current_user.id
+
+    async def run_pipeline():
+        # Runs in its own session: the result is shared with identical concurrent requests
+        async with SessionLocal() as session:
+            # The property was checked above; the pipeline's CRUD calls reuse that
+            share_access(db, session)
+            share_request(db, session)
+            if document_type.lower() == 'lease':
+                # Process lease
+                return await process_lease_upload(
+                    file_content=file_content,
+                    filename=filename,
+                    property_id=property_id,
+                    document_type=document_type,
+                    db=session,
+                    owner_id=owner_id
+                )
+            elif document_type.lower() == 'invoice':
+                # Process invoice
+                return await process_invoice_upload(
+                    file_content=file_content,
+                    filename=filename,
+                    property_id=property_id,
+                    document_type=document_type,
+                    db=session,
+                    owner_id=owner_id,
+                    allow_duplicate=allow_duplicate
+                )
+            else:
+                # Process contract
+                return await process_contract_upload(
+                    file_content=file_content,
+                    filename=filename,
+                    property_id=property_id,
+                    document_type=document_type,
+                    db=session,
+                    owner_id=owner_id
+                )
+
+    # The flight works in its own session; return the request's connection meanwhile
+    await release_connection(db)
     try:
-        if document_type.lower() == 'lease':
-            # Process lease
-            lease = await process_lease_upload(
-                file_content=file_content,
-                filename=file.filename,
-                property_id=property_id,
-                document_type=document_type,
-                db=db,
-                owner_id=current_user.id
-            )
-            data = lease
-        elif document_type.lower() == 'invoice':
-            # Process invoice
-            invoice = await process_invoice_upload(
-                file_content=file_content,
-                filename=file.filename,
-                property_id=property_id,
-                document_type=document_type,
-                db=db,
-                owner_id=current_user.id
-            )
-            data = invoice
-        elif document_type.lower() == 'contract':
-            # Process contract
-            contract = await process_contract_upload(
-                file_content=file_content,
-                filename=file.filename,
-                property_id=property_id,
-                document_type=document_type,
-                db=db,
-                owner_id=current_user.id
-            )
-            data = contract
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Unsupported document type: {document_type}"
-            )
+        # Double-clicks and client retries share one pipeline run
+        data = await processing_flight.do(
+            ("process", owner_id, content_key(file_content), property_id, document_type.lower(), allow_duplicate),
+            run_pipeline
+        )
+    except DuplicateDocumentError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except ExtractionPendingError as e:
+        return pending_extraction_response(e)
+    except LLMUnavailableError as e:
+        raise llm_unavailable_exception(e)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -124,4 +191,104 @@ async def process_document(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred."
         )
-    return data
\ No newline at end of file
+    return data
+
+@router.post("/packet", response_model=schemas.DocumentPacket)
+@log_timing("Total Packet Processing")
+async def process_packet(
+    property_id: int = Form(...),
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Split a multi-document packet (e.g. lease, addenda and invoices in one PDF)
+    and process each document it contains.
+    """
+    # Verify that the property exists and belongs to the owner
+    property = await crud.crud_property.get_property_by_owner(
+        db=db,
+        property_id=property_id,
+        owner_id=current_user.id
+    )
+    if not property:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Property not found or you do not have access to this property."
+        )
+    # Read the file content
+    file_content = await file.read()
+    try:
+        packet = await process_packet_upload(
+            file_content=file_content,
+            filename=file.filename,
+            property_id=property_id,
+            db=db,
+            owner_id=current_user.id
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.exception("Unexpected error during packet processing.")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred."
+        )
+    return packet
+
+@router.get("/model-routing")
+async def get_model_routing_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Return call counts, token usage, cost and latency per task and model tier
+    since startup, for tuning the routing thresholds.
+    """
+    return routing_stats()
+
+@router.get("/telemetry", response_model=List[schemas.DocumentTelemetrySummary])
+async def get_pipeline_telemetry(
+    document_type: Optional[str] = None,
+    outcome: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    all_owners: bool = False,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    p50/p95 duration of each pipeline stage (read, OCR, classify, extract, map,
+    DB writes and total) per document type, with outcome counts and average
+    pages, retries and tokens. Admins can include every owner's documents.
+    """
+    if all_owners and not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient permissions"
+        )
+    return await crud.crud_document_telemetry.summarize(
+        db=db,
+        owner_id=None if all_owners else current_user.id,
+        document_type=document_type,
+        start=start,
+        end=end,
+        outcome=outcome
+    )
+
+@router.get("/telemetry/documents/{document_id}", response_model=List[schemas.DocumentTelemetry])
+async def get_document_telemetry(
+    document_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Every pipeline run recorded for a document, e.g. the deferred upload and its resumed extraction.
+    """
+    return await crud.crud_document_telemetry.get_document_telemetry(
+        db=db,
+        document_id=document_id,
+        owner_id=current_user.id
+    )
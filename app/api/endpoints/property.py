@@ -3,54 +3,87 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Union
 from app import schemas, crud
-from app.db.database import get_db
+from app.db.database import get_db, pinned_to_primary, read_session, use_read_replica
 from app.core.security import get_current_user
 from app.models.user import User
+from app.models.property import Property
+from app.utils.field_selection import FieldSelection, FieldSelector
+from app.utils.pagination import PageRequest, page_params, page_response
+from app.utils.single_flight import SingleFlight
 
-router = APIRouter()
+# GET endpoints read from a replica when one is configured
+router = APIRouter(dependencies=[Depends(use_read_replica)])
+
+# Dashboards fire the property list several times on load; identical reads share one query
+properties_flight = SingleFlight("property list")
+
+# Lean by default: child collections only with ?expand=
+property_fields = FieldSelector(schemas.PropertyListItem, Property, default_expand=())
 
 # Create a new property
-@router.post("/", response_model=schemas.Property)
+@router.post("/", response_model=schemas.PropertyListItem)
 async def create_property(
     property_in: schemas.PropertyCreate,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     try:
-        return await crud.crud_property.create_with_owner(db=db, obj_in=property_in, owner_id=current_user.id)
+        property = await crud.crud_property.create_with_owner(db=db, obj_in=property_in, owner_id=current_user.id)
+        return property_fields.default().respond(property)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 # Get all properties for the current user
-@router.get("/", response_model=List[schemas.Property])
+@router.get("/", response_model=Union[List[schemas.PropertyListItem], schemas.Page[schemas.PropertyListItem]])
 async def read_properties(
-    skip: int = 0,
-    limit: int = 100,
+    page: PageRequest = Depends(page_params),
+    selection: FieldSelection = Depends(property_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    return await crud.crud_property.get_properties_by_owner(db=db, owner_id=current_user.id, skip=skip, limit=limit)
+    owner_id = current_user.id
+    subject = current_user.email
+    primary_until = db.info.get("primary_until", 0.0)
+
+    async def load_properties():
+        # Serialized inside the flight so waiters never touch another request's session
+        async with read_session(subject) as session:
+            session.info["primary_until"] = primary_until
+            result = await crud.crud_property.get_properties_by_owner(
+                db=session, owner_id=owner_id, selection=selection, page=page
+            )
+            items = [selection.render(p) for p in result.items]
+            if not result.keyset:
+                return items
+            return {"items": items, "next_cursor": result.next_cursor, "total_estimate": result.total_estimate}
+
+    # A request pinned to the primary must not take a replica read started by an unpinned one
+    pinned = pinned_to_primary(db)
+    properties = await properties_flight.do(("properties", owner_id, page, selection, pinned), load_properties)
+    return JSONResponse(content=properties)
 
 # Get a single property by id
-@router.get("/{property_id}", response_model=schemas.Property)
+@router.get("/{property_id}", response_model=schemas.PropertyListItem)
 async def read_property(
     property_id: int,
+    selection: FieldSelection = Depends(property_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    property = await crud.crud_property.get_property_by_owner(db=db, property_id=property_id, owner_id=current_user.id)
+    property = await crud.crud_property.get_property_by_owner(
+        db=db, property_id=property_id, owner_id=current_user.id, selection=selection
+    )
     if property is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Property not found or access denied")
-    return property
+    return selection.respond(property)
 
 # Get expenses for a specific property
-@router.get("/{property_id}/expenses", response_model=List[schemas.Expense])
+@router.get("/{property_id}/expenses", response_model=Union[List[schemas.Expense], schemas.Page[schemas.Expense]])
 async def read_property_expenses(
     property_id: int,
-    skip: int = 0,
-    limit: int = 100,
+    page: PageRequest = Depends(page_params),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -71,13 +104,12 @@ async def read_property_expenses(
         db=db,
         property_id=property_id,
         owner_id=current_user.id,
-        skip=skip,
-        limit=limit
+        page=page
     )
-    return expenses
+    return page_response(expenses)
 
 # Update a property
-@router.put("/{property_id}", response_model=schemas.Property)
+@router.put("/{property_id}", response_model=schemas.PropertyListItem)
 async def update_property(
     property_id: int,
     property_in: schemas.PropertyUpdate,
@@ -88,7 +120,8 @@ async def update_property(
     if property is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Property not found or access denied")
     try:
-        return await crud.crud_property.update_property(db=db, property=property, property_in=property_in)
+        property = await crud.crud_property.update_property(db=db, property=property, property_in=property_in)
+        return property_fields.default().respond(property)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
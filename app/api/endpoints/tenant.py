@@ -2,13 +2,19 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import List, Optional, Union
 from app import schemas, crud
-from app.db.database import get_db
+from app.db.database import get_db, use_read_replica
 from app.core.security import get_current_user
 from app.models.user import User
+from app.models.tenant import Tenant
+from app.utils.field_selection import FieldSelection, FieldSelector
+from app.utils.pagination import PageRequest, page_params, page_response
 
-router = APIRouter()
+# GET endpoints read from a replica when one is configured
+router = APIRouter(dependencies=[Depends(use_read_replica)])
+
+tenant_fields = FieldSelector(schemas.TenantResponse, Tenant)
 
 @router.post("/", response_model=schemas.TenantResponse)
 async def create_tenant(
@@ -38,28 +44,31 @@ async def create_tenant_manual(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/", response_model=List[schemas.TenantResponse])
+@router.get("/", response_model=Union[List[schemas.TenantResponse], schemas.Page[schemas.TenantResponse]])
 async def read_tenants(
-    skip: int = 0,
-    limit: int = 100,
+    page: PageRequest = Depends(page_params),
+    selection: FieldSelection = Depends(tenant_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     tenants = await crud.crud_tenant.get_tenants(
-        db=db, owner_id=current_user.id, skip=skip, limit=limit
+        db=db, owner_id=current_user.id, selection=selection, page=page
     )
-    return tenants
+    return page_response(tenants, selection)
 
 @router.get("/{tenant_id}", response_model=schemas.TenantResponse)
 async def read_tenant(
     tenant_id: int,
+    selection: FieldSelection = Depends(tenant_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    tenant = await crud.crud_tenant.get_tenant(db=db, tenant_id=tenant_id, owner_id=current_user.id)
+    tenant = await crud.crud_tenant.get_tenant(
+        db=db, tenant_id=tenant_id, owner_id=current_user.id, selection=selection
+    )
     if tenant is None:
         raise HTTPException(status_code=404, detail="Tenant not found")
-    return tenant
+    return selection.respond(tenant)
 
 @router.put("/{tenant_id}", response_model=schemas.TenantResponse)
 async def update_tenant(
@@ -0,0 +1,88 @@
+# app/api/endpoints/usage.py
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime
+from app import schemas, crud
+from app.db.database import get_db
+from app.core.security import get_current_user
+from app.models.user import User
+from app.services.usage_accounting import get_owner_budget, month_start
+
+router = APIRouter()
+
+@router.get("/summary", response_model=List[schemas.LLMUsageAggregate])
+async def get_usage_summary(
+    group_by: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Total model calls, tokens and cost of the current user, optionally grouped by
+    stage, task, model, tier, document or day, most expensive first.
+    """
+    try:
+        return await crud.crud_llm_usage.aggregate_usage(
+            db=db,
+            owner_id=current_user.id,
+            group_by=group_by,
+            start=start,
+            end=end
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.get("/documents/{document_id}", response_model=List[schemas.LLMUsage])
+async def get_document_usage(
+    document_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Every model call made while processing a document.
+    """
+    return await crud.crud_llm_usage.get_document_usage(db=db, document_id=document_id, owner_id=current_user.id)
+
+@router.get("/budget", response_model=schemas.LLMBudget)
+async def get_budget(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    limit, hard_limit = await get_owner_budget(db, current_user.id)
+    spent = await crud.crud_llm_usage.get_cost_since(db=db, owner_id=current_user.id, since=month_start())
+    return schemas.LLMBudget(monthly_limit=limit, hard_limit=hard_limit, month_to_date_cost=spent)
+
+@router.put("/budget", response_model=schemas.LLMBudget)
+async def set_budget(
+    budget_in: schemas.LLMBudgetUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Set the monthly model spend limit (USD). Hard limits reject new uploads once
+    reached; soft limits only log a warning.
+    """
+    if budget_in.monthly_limit < 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="The monthly limit cannot be negative.")
+    budget = await crud.crud_llm_usage.set_budget(
+        db=db,
+        owner_id=current_user.id,
+        monthly_limit=budget_in.monthly_limit,
+        hard_limit=budget_in.hard_limit
+    )
+    spent = await crud.crud_llm_usage.get_cost_since(db=db, owner_id=current_user.id, since=month_start())
+    return schemas.LLMBudget(monthly_limit=budget.monthly_limit, hard_limit=budget.hard_limit, month_to_date_cost=spent)
+
+@router.delete("/budget", response_model=schemas.LLMBudget)
+async def delete_budget(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Remove the user's budget; the default budget from settings applies again.
+    """
+    await crud.crud_llm_usage.delete_budget(db=db, owner_id=current_user.id)
+    return await get_budget(db=db, current_user=current_user)
@@ -2,13 +2,19 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import List, Optional, Union
 from app import schemas, crud
-from app.db.database import get_db
+from app.db.database import get_db, use_read_replica
 from app.core.security import get_current_user
 from app.models.user import User
+from app.models.utility import Utility
+from app.utils.field_selection import FieldSelection, FieldSelector
+from app.utils.pagination import PageRequest, page_params, page_response
 
-router = APIRouter()
+# GET endpoints read from a replica when one is configured
+router = APIRouter(dependencies=[Depends(use_read_replica)])
+
+utility_fields = FieldSelector(schemas.Utility, Utility)
 
 @router.post("/", response_model=schemas.Utility)
 async def create_utility(
@@ -22,26 +28,31 @@ async def create_utility(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/", response_model=List[schemas.Utility])
+@router.get("/", response_model=Union[List[schemas.Utility], schemas.Page[schemas.Utility]])
 async def read_utilities(
-    skip: int = 0,
-    limit: int = 100,
+    page: PageRequest = Depends(page_params),
+    selection: FieldSelection = Depends(utility_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    utilities = await crud.crud_utility.get_utilities(db=db, owner_id=current_user.id, skip=skip, limit=limit)
-    return utilities
+    utilities = await crud.crud_utility.get_utilities(
+        db=db, owner_id=current_user.id, selection=selection, page=page
+    )
+    return page_response(utilities, selection)
 
 @router.get("/{utility_id}", response_model=schemas.Utility)
 async def read_utility(
     utility_id: int,
+    selection: FieldSelection = Depends(utility_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    utility = await crud.crud_utility.get_utility(db=db, utility_id=utility_id, owner_id=current_user.id)
+    utility = await crud.crud_utility.get_utility(
+        db=db, utility_id=utility_id, owner_id=current_user.id, selection=selection
+    )
     if utility is None:
         raise HTTPException(status_code=404, detail="Utility not found")
-    return utility
+    return selection.respond(utility)
 
 @router.put("/{utility_id}", response_model=schemas.Utility)
 async def update_utility(
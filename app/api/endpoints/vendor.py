@@ -2,13 +2,19 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import List, Optional, Union
 from app import schemas, crud
-from app.db.database import get_db
+from app.db.database import get_db, use_read_replica
 from app.core.security import get_current_user
 from app.models.user import User
+from app.models.vendor import Vendor
+from app.utils.field_selection import FieldSelection, FieldSelector
+from app.utils.pagination import PageRequest, page_params, page_response
 
-router = APIRouter()
+# GET endpoints read from a replica when one is configured
+router = APIRouter(dependencies=[Depends(use_read_replica)])
+
+vendor_fields = FieldSelector(schemas.Vendor, Vendor)
 
 @router.post("/", response_model=schemas.Vendor)
 async def create_vendor(
@@ -22,26 +28,31 @@ async def create_vendor(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/", response_model=List[schemas.Vendor])
+@router.get("/", response_model=Union[List[schemas.Vendor], schemas.Page[schemas.Vendor]])
 async def read_vendors(
-    skip: int = 0,
-    limit: int = 100,
+    page: PageRequest = Depends(page_params),
+    selection: FieldSelection = Depends(vendor_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    vendors = await crud.crud_vendor.get_vendors(db=db, owner_id=current_user.id, skip=skip, limit=limit)
-    return vendors
+    vendors = await crud.crud_vendor.get_vendors(
+        db=db, owner_id=current_user.id, selection=selection, page=page
+    )
+    return page_response(vendors, selection)
 
 @router.get("/{vendor_id}", response_model=schemas.Vendor)
 async def read_vendor(
     vendor_id: int,
+    selection: FieldSelection = Depends(vendor_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    vendor = await crud.crud_vendor.get_vendor(db=db, vendor_id=vendor_id, owner_id=current_user.id)
+    vendor = await crud.crud_vendor.get_vendor(
+        db=db, vendor_id=vendor_id, owner_id=current_user.id, selection=selection
+    )
     if vendor is None:
         raise HTTPException(status_code=404, detail="Vendor not found")
-    return vendor
+    return selection.respond(vendor)
 
 @router.put("/{vendor_id}", response_model=schemas.Vendor)
 async def update_vendor(
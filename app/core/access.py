@@ -0,0 +1,85 @@
+# app/core/access.py
+
+from typing import Dict, Iterable, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session
+
+from app.models.property import Property
+
+# Key of the per-session access contexts in Session.info
+ACCESS_INFO_KEY = "property_access"
+
+FORBIDDEN_PROPERTY = "Property not found or you do not have permission to access this property."
+
+
+class PropertyAccess:
+    """
+    The properties an owner may use, resolved once per request: every id is
+    looked up at most once, and ids not seen yet are looked up together in one
+    query. Answers either way are remembered until the session rolls back.
+    """
+
+    def __init__(self, owner_id: int):
+        self.owner_id = owner_id
+        self._owned: Dict[int, bool] = {}
+
+    async def resolve(self, db: AsyncSession, property_ids: Iterable[Optional[int]]) -> Set[int]:
+        """
+        Returns the given ids that belong to the owner.
+        """
+        ids = {property_id for property_id in property_ids if property_id is not None}
+        unknown = ids - self._owned.keys()
+        if unknown:
+            # Whole rows, so responses serializing the property find it in the identity map
+            result = await db.execute(
+                select(Property)
+                .filter(Property.id.in_(unknown))
+                .filter(Property.owner_id == self.owner_id)
+            )
+            found = {property.id for property in result.scalars().all()}
+            for property_id in unknown:
+                self._owned[property_id] = property_id in found
+        return {property_id for property_id in ids if self._owned[property_id]}
+
+    def grant(self, property_id: int) -> None:
+        self._owned[property_id] = True
+
+    def revoke(self, property_id: int) -> None:
+        self._owned[property_id] = False
+
+
+def property_access(db: AsyncSession, owner_id: int) -> PropertyAccess:
+    contexts = db.info.setdefault(ACCESS_INFO_KEY, {})
+    if owner_id not in contexts:
+        contexts[owner_id] = PropertyAccess(owner_id)
+    return contexts[owner_id]
+
+
+async def owns_property(db: AsyncSession, owner_id: int, property_id: int) -> bool:
+    return property_id in await property_access(db, owner_id).resolve(db, [property_id])
+
+
+async def require_property(db: AsyncSession, owner_id: int, property_id: int) -> None:
+    """
+    Raises:
+        ValueError: If the property does not exist or belongs to another owner.
+    """
+    if not await owns_property(db, owner_id, property_id):
+        raise ValueError(FORBIDDEN_PROPERTY)
+
+
+def share_access(source: AsyncSession, target: AsyncSession) -> None:
+    """
+    Lets a session opened on behalf of the same request (e.g. the document
+    pipeline's) reuse the ownership already resolved in the request's session.
+    """
+    target.info[ACCESS_INFO_KEY] = source.info.setdefault(ACCESS_INFO_KEY, {})
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_access(session):
+    # Grants and revocations made in the rolled back transaction no longer hold
+    session.info.pop(ACCESS_INFO_KEY, None)
@@ -36,7 +36,6 @@ async def signup_user(db: AsyncSession, email: str, password: str, name: str):
     db.add(new_user)
     try:
         await db.commit()
-        await db.refresh(new_user)
     except Exception as e:
         await db.rollback()
         raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -135,7 +134,6 @@ async def create_user(db: AsyncSession, user_in: UserCreate) -> User:
     db.add(new_user)
     try:
         await db.commit()
-        await db.refresh(new_user)
     except Exception as e:
         await db.rollback()
         raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -153,7 +151,6 @@ async def update_user(db: AsyncSession, db_user: User, user_in: UserUpdate) -> U
 
     try:
         await db.commit()
-        await db.refresh(db_user)
     except Exception as e:
         await db.rollback()
         raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -51,7 +51,6 @@ async def authenticate_oauth_user(db: AsyncSession, token: dict):
         )
         db.add(new_user)
         await db.commit()
-        await db.refresh(new_user)
 
     # Generate both access and refresh tokens
     access_token = create_access_token(data={"sub": email})
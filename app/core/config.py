@@ -2,6 +2,7 @@
 
 from pydantic_settings import BaseSettings
 from pydantic import Field
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     OPENAI_API_KEY: str = Field(..., env="OPENAI_API_KEY")
@@ -20,6 +21,97 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 120
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # The schema is managed by migrations (alembic upgrade head). Set to create
+    # missing tables at startup instead, e.g. for a throwaway local database
+    DB_CREATE_ALL: bool = False
+
+    # Connection pool, per worker process. Set DB_PGBOUNCER when connecting through
+    # PgBouncer in transaction mode (disables asyncpg prepared statement caching)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_PGBOUNCER: bool = False
+
+    # Read replicas (same format as DATABASE_URL) for routers that opt in with
+    # use_read_replica. A user's reads stay on the primary for this long after they write
+    DATABASE_REPLICA_URLS: List[str] = []
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Field-targeted passage retrieval for long leases and contracts
+    FIELD_RETRIEVAL_ENABLED: bool = True
+    FIELD_RETRIEVAL_MIN_CHARS: int = 12000
+    FIELD_RETRIEVAL_PASSAGE_CHARS: int = 1500
+    FIELD_RETRIEVAL_TOP_K: int = 3
+
+    # Multi-document packet segmentation
+    PACKET_HEADER_LINES: int = 5
+    PACKET_CLASSIFIER_CONFIDENCE: float = 0.6
+    PACKET_MAX_CONCURRENCY: int = 4
+
+    # Near-duplicate detection for photographed and scanned invoices
+    DUPLICATE_DETECTION_ENABLED: bool = True
+    DUPLICATE_DHASH_MAX_DISTANCE: int = 10
+    DUPLICATE_PHASH_MAX_DISTANCE: int = 10
+    # Fingerprints created this long before the last refresh are fetched again, so rows
+    # committed after a later one (longer upload transaction) are not missed
+    DUPLICATE_REFRESH_LOOKBACK_SECONDS: float = 900.0
+
+    # Per-document stage timings, page counts and tokens stored in document_telemetry
+    DOCUMENT_TELEMETRY_ENABLED: bool = True
+
+    # Prometheus /metrics endpoint; set a token to require "Authorization: Bearer <token>"
+    METRICS_ENABLED: bool = True
+    METRICS_BEARER_TOKEN: Optional[str] = None
+
+    # Tracing (OpenTelemetry): routes, SQL statements, OCR pages and model calls.
+    # TRACING_EXPORTER is 'file' (JSON lines at TRACING_FILE_PATH), 'otlp' (a local
+    # collector at TRACING_OTLP_ENDPOINT) or 'console'
+    TRACING_ENABLED: bool = False
+    TRACING_EXPORTER: str = "file"
+    TRACING_FILE_PATH: str = "traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_SAMPLE_RATIO: float = 0.1
+    TRACING_SERVICE_NAME: str = "spaceify-api"
+
+    # Model transport: "openai", "record", "replay" or "stub" (canned responses for tests)
+    LLM_PROVIDER: str = "openai"
+    LLM_FAST_MODEL: str = "gpt-4o-mini"
+    LLM_FAST_TIMEOUT: float = 30.0
+    LLM_STRONG_MODEL: str = "gpt-4o"
+    LLM_STRONG_TIMEOUT: float = 90.0
+    # Leases and contracts at least this long start on the strong tier
+    LLM_STRONG_MIN_CHARS: int = 20000
+    # Per-task overrides, e.g. {"lease": "strong"} and {"classification": 15}
+    LLM_TASK_TIERS: Dict[str, str] = {}
+    LLM_TASK_TIMEOUTS: Dict[str, float] = {}
+    LLM_STUB_RESPONSES: Dict[str, str] = {}
+
+    # Record/replay transport for offline load and regression testing
+    LLM_RECORDINGS_DIR: str = "llm_recordings"
+    # Serve another recording of the same task when a request was never recorded
+    LLM_REPLAY_FALLBACK_TO_TASK: bool = True
+    LLM_REPLAY_LATENCY_SCALE: float = 1.0
+    LLM_REPLAY_EXTRA_LATENCY_MS: int = 0
+    LLM_REPLAY_JITTER_MS: int = 0
+    LLM_REPLAY_RATE_LIMIT_RATE: float = 0.0
+    LLM_REPLAY_TIMEOUT_RATE: float = 0.0
+    LLM_REPLAY_MALFORMED_RATE: float = 0.0
+    LLM_REPLAY_SEED: Optional[int] = None
+
+    # Degraded mode: stop calling the provider after repeated failures and queue extraction
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 60.0
+    LLM_RESUME_INTERVAL_SECONDS: float = 30.0
+    LLM_RESUME_BATCH_SIZE: int = 10
+    # Claims older than this are assumed abandoned (e.g. the worker died) and requeued
+    LLM_CLAIM_TIMEOUT_SECONDS: float = 1800.0
+
+    # Monthly model spend limit (USD) for owners without their own budget; None for no limit
+    LLM_DEFAULT_MONTHLY_BUDGET: Optional[float] = None
+
     class Config:
         env_file = ".env"
 
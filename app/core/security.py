@@ -37,9 +37,17 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
+    # Reads of this session follow the user's read-your-writes pin
+    db.info["subject"] = token_data.email
+
     # Query the database for the user
     result = await db.execute(select(User).filter(User.email == token_data.email))
     user = result.scalars().first()
+    if user is None and db.info.get("replica") is not None:
+        # A user who just signed up may not have reached the replica yet
+        db.info["primary"] = True
+        result = await db.execute(select(User).filter(User.email == token_data.email))
+        user = result.scalars().first()
     if user is None:
         raise credentials_exception
 
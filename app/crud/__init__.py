@@ -2,10 +2,13 @@
 
 from .crud_contract import *
 from .crud_document import *
+from .crud_document_telemetry import *
 from .crud_expense import *
+from .crud_image_fingerprint import *
 from .crud_income import *
 from .crud_invoice import *
 from .crud_lease import *
+from .crud_llm_usage import *
 from .crud_payment import *
 from .crud_property import *
 from .crud_tenant import *
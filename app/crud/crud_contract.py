@@ -8,51 +8,79 @@ from typing import List, Optional
 from app.models.contract import Contract
 from app.models.property import Property
 from app.schemas.contract import ContractCreate, ContractUpdate
+from app.core.access import require_property
+from app.utils.field_selection import FieldSelection, query_options
+from app.utils.pagination import PageRequest, fetch_page
+from app.utils.related import attach_related
 
 class CRUDContract:
-    async def get_contract(self, db: AsyncSession, contract_id: int, owner_id: int) -> Optional[Contract]:
+    async def get_contract(
+        self,
+        db: AsyncSession,
+        contract_id: int,
+        owner_id: int,
+        selection: Optional[FieldSelection] = None
+    ) -> Optional[Contract]:
         result = await db.execute(
             select(Contract)
-            .options(
+            .options(*query_options(
+                selection,
                 selectinload(Contract.property),
                 selectinload(Contract.vendor),
                 selectinload(Contract.document)
-            )
+            ))
             .join(Property)
             .filter(Contract.id == contract_id)
             .filter(Property.owner_id == owner_id)
         )
         return result.scalars().first()
 
-    async def get_contracts(self, db: AsyncSession, owner_id: int, skip: int = 0, limit: int = 100) -> List[Contract]:
-        result = await db.execute(
+    async def get_contracts(
+        self,
+        db: AsyncSession,
+        owner_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        selection: Optional[FieldSelection] = None,
+        page: Optional[PageRequest] = None
+    ) -> List[Contract]:
+        query = (
             select(Contract)
-            .options(
+            .options(*query_options(
+                selection,
                 selectinload(Contract.property),
                 selectinload(Contract.vendor),
-                selectinload(Contract.document)  
-            )
+                selectinload(Contract.document)
+            ))
             .join(Property)
             .filter(Property.owner_id == owner_id)
-            .offset(skip)
-            .limit(limit)
         )
+        if page is not None:
+            return await fetch_page(db, query, Contract.id, page)
+        result = await db.execute(query.offset(skip).limit(limit))
         return result.scalars().all()
 
-    async def create_contract(self, db: AsyncSession, contract_in: ContractCreate, owner_id: int) -> Contract:
+    async def create_contract(
+        self,
+        db: AsyncSession,
+        contract_in: ContractCreate,
+        owner_id: int,
+        commit: bool = True
+    ) -> Contract:
+        """
+        commit=False only flushes, leaving the commit to the caller.
+        """
         # Verify that the property exists and belongs to the owner
-        result = await db.execute(
-            select(Property).filter(Property.id == contract_in.property_id, Property.owner_id == owner_id)
-        )
-        property = result.scalars().first()
-        if not property:
-            raise ValueError("Property not found or you do not have permission to access this property.")
+        await require_property(db, owner_id, contract_in.property_id)
 
         db_contract = Contract(**contract_in.dict())
         db.add(db_contract)
         try:
-            await db.commit()
-            await db.refresh(db_contract)
+            if commit:
+                await db.commit()
+                await attach_related(db, db_contract, "property", "vendor")
+            else:
+                await db.flush()
         except IntegrityError as e:
             await db.rollback()
             raise ValueError("An error occurred while creating the contract: " + str(e))
@@ -64,7 +92,7 @@ class CRUDContract:
             setattr(db_contract, key, value)
         try:
             await db.commit()
-            await db.refresh(db_contract)
+            await attach_related(db, db_contract, "property", "vendor")
         except IntegrityError as e:
             await db.rollback()
             raise ValueError("An error occurred while updating the contract: " + str(e))
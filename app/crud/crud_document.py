@@ -4,78 +4,104 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload, joinedload
-from sqlalchemy import update, delete
+from sqlalchemy import update, delete, or_
+from datetime import datetime, timedelta
 from typing import List, Optional
 from app.models.document import Document
+from app.models.document_page import DocumentPage
 from app.models.property import Property
 from app.models.invoice.invoice import Invoice
 from app.schemas.document import DocumentCreate, DocumentUpdate
+from app.core.access import require_property
+from app.utils.field_selection import FieldSelection, query_options
+from app.utils.pagination import PageRequest, fetch_page
+
+# Document.status values
+PROCESSED = 'processed'
+PENDING_EXTRACTION = 'pending_extraction'
+EXTRACTING = 'extracting'
+EXTRACTION_FAILED = 'extraction_failed'
 
 class CRUDDocument:
-    async def get_document(self, db: AsyncSession, document_id: int, owner_id: int) -> Optional[Document]:
+    async def get_document(
+        self,
+        db: AsyncSession,
+        document_id: int,
+        owner_id: int,
+        selection: Optional[FieldSelection] = None
+    ) -> Optional[Document]:
         result = await db.execute(
             select(Document)
-            .options(
+            .options(*query_options(
+                selection,
                 selectinload(Document.property),
                 selectinload(Document.lease),
                 selectinload(Document.expense),
                 selectinload(Document.invoice),
                 selectinload(Document.contract)
-            )
+            ))
+            .join(Property)
             .filter(Document.id == document_id)
+            .filter(Property.owner_id == owner_id)
         )
-        document = result.scalars().first()
-        if document and document.property.owner_id != owner_id:
-            return None
-        return document
+        return result.scalars().first()
 
-    async def get_documents(self, db: AsyncSession, owner_id: int, skip: int = 0, limit: int = 100) -> List[Document]:
+    async def get_documents(
+        self,
+        db: AsyncSession,
+        owner_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        selection: Optional[FieldSelection] = None,
+        page: Optional[PageRequest] = None
+    ) -> List[Document]:
         """
         Retrieve a list of documents belonging to the specified user.
-        Eagerly loads related relationships to prevent lazy loading during serialization.
+        Eagerly loads related relationships to prevent lazy loading during serialization,
+        unless a field selection says which to load.
         """
-        result = await db.execute(
+        query = (
             select(Document)
-            .options(
+            .options(*query_options(
+                selection,
                 selectinload(Document.property),
                 selectinload(Document.lease),
                 selectinload(Document.expense),
                 selectinload(Document.invoice),
                 selectinload(Document.contract)
-            )
+            ))
             .join(Property)
             .filter(Property.owner_id == owner_id)
-            .offset(skip)
-            .limit(limit)
         )
+        if page is not None:
+            return await fetch_page(db, query, Document.id, page)
+        result = await db.execute(query.offset(skip).limit(limit))
         return result.scalars().all()
 
-    async def create_document(self, db: AsyncSession, document_in: DocumentCreate, owner_id: int) -> Document:
+    async def create_document(
+        self,
+        db: AsyncSession,
+        document_in: DocumentCreate,
+        owner_id: int,
+        commit: bool = True
+    ) -> Document:
         """
         Create a new document after verifying ownership of the associated property.
-        Eagerly loads related relationships after creation.
+
+        With commit=False the document is only flushed (it gets its id, nothing is
+        loaded) and the caller commits.
         """
         # Verify that the property exists and belongs to the user (if property_id is provided)
         if document_in.property_id:
-            result = await db.execute(
-                select(Property)
-                .filter(Property.id == document_in.property_id, Property.owner_id == owner_id)
-            )
-            property = result.scalars().first()
-            if not property:
-                raise ValueError("Property not found or you do not have permission to access this property.")
+            await require_property(db, owner_id, document_in.property_id)
 
-        db_document = Document(**document_in.dict())
+        db_document = Document(**document_in.dict(), owner_id=owner_id)
         db.add(db_document)
         try:
+            if not commit:
+                await db.flush()
+                return db_document
             await db.commit()
-            # Eagerly load relationships after creation
-            await db.refresh(
-                db_document,
-                attribute_names=["property", "lease", "expense", "invoice", "contract"]
-            )
-            # Alternatively, use selectinload with refresh
-            # await db.refresh(db_document, attribute_names=["property", "lease", "expense", "invoice", "contract"])
         except IntegrityError as e:
             await db.rollback()
             raise ValueError("An error occurred while creating the document: " + str(e))
@@ -84,18 +110,12 @@ class CRUDDocument:
     async def update_document(self, db: AsyncSession, db_document: Document, document_in: DocumentUpdate) -> Document:
         """
         Update an existing document with new data.
-        Eagerly loads related relationships after update.
         """
         update_data = document_in.dict(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_document, key, value)
         try:
             await db.commit()
-            # Eagerly load relationships after update
-            await db.refresh(
-                db_document,
-                attribute_names=["property", "lease", "expense", "invoice", "contract"]
-            )
         except IntegrityError as e:
             await db.rollback()
             raise ValueError("An error occurred while updating the document: " + str(e))
@@ -128,6 +148,153 @@ class CRUDDocument:
             await db.rollback()            
             raise ValueError(f"An error occurred while deleting the document.")
 
+    async def get_document_with_pages(self, db: AsyncSession, document_id: int, owner_id: int) -> Optional[Document]:
+        """
+        Retrieve a document owned by the user together with its stored page fingerprints.
+        """
+        result = await db.execute(
+            select(Document)
+            .options(
+                selectinload(Document.pages),
+                selectinload(Document.lease),
+                selectinload(Document.contract)
+            )
+            .join(Property)
+            .filter(Document.id == document_id)
+            .filter(Property.owner_id == owner_id)
+        )
+        return result.scalars().first()
+
+    def add_pages(self, db: AsyncSession, document_id: int, pages: list) -> None:
+        """
+        Store page fingerprints for a newly created document. Changes are written on the next commit.
+        """
+        db.add_all([
+            DocumentPage(
+                document_id=document_id,
+                page_number=page.page_number,
+                text_hash=page.text_hash,
+                image_hash=page.image_hash,
+                pixel_hash=page.pixel_hash,
+                is_ocr=page.is_ocr,
+                text=page.text
+            )
+            for page in pages
+        ])
+
+    def replace_pages(self, db_document: Document, pages: list) -> None:
+        """
+        Replace the stored page fingerprints of a document with freshly extracted pages.
+        The pages relationship must already be loaded. Changes are written on the next commit.
+        """
+        db_document.pages = [
+            DocumentPage(
+                page_number=page.page_number,
+                text_hash=page.text_hash,
+                image_hash=page.image_hash,
+                pixel_hash=page.pixel_hash,
+                is_ocr=page.is_ocr,
+                text=page.text
+            )
+            for page in pages
+        ]
+
+    async def create_pending_document(
+        self,
+        db: AsyncSession,
+        document_in: DocumentCreate,
+        owner_id: int,
+        extracted_text: str,
+        pages: Optional[list] = None,
+        trace_parent: Optional[str] = None
+    ) -> Document:
+        """
+        Store an upload whose extraction could not run, together with its OCR text
+        and page fingerprints, so that extraction can resume later.
+        """
+        if document_in.property_id:
+            await require_property(db, owner_id, document_in.property_id)
+
+        db_document = Document(
+            **document_in.dict(),
+            owner_id=owner_id,
+            status=PENDING_EXTRACTION,
+            extracted_text=extracted_text,
+            trace_parent=trace_parent
+        )
+        db.add(db_document)
+        await db.flush()
+        if pages:
+            self.add_pages(db=db, document_id=db_document.id, pages=pages)
+        await db.commit()
+        return db_document
+
+    async def claim_pending_documents(self, db: AsyncSession, limit: int) -> List[Document]:
+        """
+        Mark up to `limit` pending documents as 'extracting' and return them. The
+        status check in the UPDATE ensures two workers never claim the same document.
+        """
+        result = await db.execute(
+            select(Document.id)
+            .filter(Document.status == PENDING_EXTRACTION)
+            .order_by(Document.id)
+            .limit(limit)
+        )
+        claimed_ids = []
+        for document_id in result.scalars().all():
+            claimed = await db.execute(
+                update(Document)
+                .where(Document.id == document_id, Document.status == PENDING_EXTRACTION)
+                .values(status=EXTRACTING, claimed_at=datetime.utcnow())
+                .returning(Document.id)
+            )
+            if claimed.scalar() is not None:
+                claimed_ids.append(document_id)
+        await db.commit()
+        if not claimed_ids:
+            return []
+        result = await db.execute(select(Document).filter(Document.id.in_(claimed_ids)).order_by(Document.id))
+        return result.scalars().all()
+
+    async def requeue_stale_claims(self, db: AsyncSession, older_than: timedelta) -> int:
+        """
+        Return documents claimed more than `older_than` ago, whose worker never
+        finished them, to 'pending_extraction'. Returns the number requeued.
+        """
+        cutoff = datetime.utcnow() - older_than
+        result = await db.execute(
+            update(Document)
+            .where(
+                Document.status == EXTRACTING,
+                or_(Document.claimed_at.is_(None), Document.claimed_at < cutoff)
+            )
+            .values(status=PENDING_EXTRACTION, claimed_at=None)
+        )
+        await db.commit()
+        return result.rowcount
+
+    async def complete_pending_document(
+        self,
+        db: AsyncSession,
+        document_id: int,
+        document_in: DocumentCreate,
+        commit: bool = True
+    ) -> Document:
+        """
+        Fill in a pending document with the records created by its extraction.
+        With commit=False the changes are left for the caller's commit to write.
+        """
+        db_document = await db.get(Document, document_id)
+        if not db_document:
+            raise ValueError("Pending document not found.")
+        for key, value in document_in.dict(exclude_unset=True).items():
+            setattr(db_document, key, value)
+        db_document.status = PROCESSED
+        db_document.extracted_text = None
+        if commit:
+            await db.commit()
+        return db_document
+
     async def update_status(self, db: AsyncSession, document_id: int, status: str) -> None:
         """
         Update the status of a document.
@@ -0,0 +1,107 @@
+# app/crud/crud_document_telemetry.py
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func
+from typing import List, Optional
+from datetime import datetime
+from app.models.document_telemetry import DocumentTelemetry
+
+class CRUDDocumentTelemetry:
+    # Stage duration columns reported by the percentile summary
+    STAGE_COLUMNS = {
+        "read": DocumentTelemetry.read_ms,
+        "ocr": DocumentTelemetry.ocr_ms,
+        "classify": DocumentTelemetry.classify_ms,
+        "extract": DocumentTelemetry.extract_ms,
+        "map": DocumentTelemetry.map_ms,
+        "db": DocumentTelemetry.db_ms,
+        "total": DocumentTelemetry.total_ms,
+    }
+
+    async def add_telemetry(self, db: AsyncSession, telemetry: DocumentTelemetry) -> None:
+        db.add(telemetry)
+        await db.commit()
+
+    async def get_document_telemetry(self, db: AsyncSession, document_id: int, owner_id: int) -> List[DocumentTelemetry]:
+        result = await db.execute(
+            select(DocumentTelemetry)
+            .filter(DocumentTelemetry.document_id == document_id, DocumentTelemetry.owner_id == owner_id)
+            .order_by(DocumentTelemetry.id)
+        )
+        return result.scalars().all()
+
+    def _filters(self, query, owner_id: Optional[int], document_type: Optional[str], start: Optional[datetime], end: Optional[datetime]):
+        if owner_id is not None:
+            query = query.filter(DocumentTelemetry.owner_id == owner_id)
+        if document_type:
+            query = query.filter(func.lower(DocumentTelemetry.document_type) == document_type.lower())
+        if start:
+            query = query.filter(DocumentTelemetry.created_at >= start)
+        if end:
+            query = query.filter(DocumentTelemetry.created_at < end)
+        return query
+
+    async def summarize(
+        self,
+        db: AsyncSession,
+        owner_id: Optional[int],
+        document_type: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        outcome: Optional[str] = None
+    ) -> List[dict]:
+        """
+        p50/p95 of every stage per document type, computed in the database, with
+        outcome counts and average pages, retries and tokens. Pass owner_id=None
+        for all owners.
+        """
+        document_type_key = func.lower(DocumentTelemetry.document_type)
+        columns = [
+            document_type_key.label("document_type"),
+            func.count(DocumentTelemetry.id).label("documents"),
+            func.avg(DocumentTelemetry.pages).label("avg_pages"),
+            func.avg(DocumentTelemetry.ocr_pages).label("avg_ocr_pages"),
+            func.avg(DocumentTelemetry.llm_retries).label("avg_llm_retries"),
+            func.avg(DocumentTelemetry.prompt_tokens + DocumentTelemetry.completion_tokens).label("avg_tokens"),
+        ]
+        for stage, column in self.STAGE_COLUMNS.items():
+            columns.append(func.percentile_cont(0.5).within_group(column).label(f"{stage}_p50"))
+            columns.append(func.percentile_cont(0.95).within_group(column).label(f"{stage}_p95"))
+
+        query = self._filters(select(*columns), owner_id, document_type, start, end)
+        if outcome:
+            query = query.filter(DocumentTelemetry.outcome == outcome)
+        result = await db.execute(query.group_by(document_type_key).order_by(document_type_key))
+        rows = result.all()
+
+        outcome_query = self._filters(
+            select(document_type_key, DocumentTelemetry.outcome, func.count(DocumentTelemetry.id)),
+            owner_id, document_type, start, end
+        ).group_by(document_type_key, DocumentTelemetry.outcome)
+        outcomes = {}
+        for key, row_outcome, count in (await db.execute(outcome_query)).all():
+            outcomes.setdefault(key, {})[row_outcome] = count
+
+        def rounded(value):
+            return round(float(value), 1) if value is not None else None
+
+        summaries = []
+        for row in rows:
+            data = row._mapping
+            summaries.append({
+                "document_type": data["document_type"],
+                "documents": data["documents"],
+                "outcomes": outcomes.get(data["document_type"], {}),
+                "avg_pages": rounded(data["avg_pages"]) or 0.0,
+                "avg_ocr_pages": rounded(data["avg_ocr_pages"]) or 0.0,
+                "avg_llm_retries": round(float(data["avg_llm_retries"] or 0), 2),
+                "avg_tokens": rounded(data["avg_tokens"]) or 0.0,
+                "stages": {
+                    stage: {"p50_ms": rounded(data[f"{stage}_p50"]), "p95_ms": rounded(data[f"{stage}_p95"])}
+                    for stage in self.STAGE_COLUMNS
+                },
+            })
+        return summaries
+
+crud_document_telemetry = CRUDDocumentTelemetry()
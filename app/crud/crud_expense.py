@@ -7,34 +7,74 @@ from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 from app.models.expense import Expense
 from app.models.property import Property
-from app.schemas.expense import ExpenseCreate, ExpenseUpdate
+from app.schemas.expense import ExpenseCreate, ExpenseUpdate, ExpenseFilter
+from app.core.access import require_property
+from app.utils.field_selection import FieldSelection, query_options
+from app.utils.pagination import PageRequest, SortOrder, fetch_page, ordering
+from app.utils.related import attach_related
 
 class CRUDExpense:
-    async def get_expense(self, db: AsyncSession, expense_id: int, owner_id: int) -> Optional[Expense]:
+    @staticmethod
+    def _filtered(query, filters: Optional[ExpenseFilter]):
+        if filters is None:
+            return query
+        if filters.property_id is not None:
+            query = query.filter(Expense.property_id == filters.property_id)
+        if filters.vendor_id is not None:
+            query = query.filter(Expense.vendor_id == filters.vendor_id)
+        if filters.category is not None:
+            query = query.filter(Expense.category == filters.category)
+        if filters.date_from is not None:
+            query = query.filter(Expense.transaction_date >= filters.date_from)
+        if filters.date_to is not None:
+            query = query.filter(Expense.transaction_date <= filters.date_to)
+        return query
+
+    async def get_expense(
+        self,
+        db: AsyncSession,
+        expense_id: int,
+        owner_id: int,
+        selection: Optional[FieldSelection] = None
+    ) -> Optional[Expense]:
         result = await db.execute(
             select(Expense)
-            .options(
+            .options(*query_options(
+                selection,
                 selectinload(Expense.property),
                 selectinload(Expense.vendor)
-            )
+            ))
             .join(Property)
             .filter(Expense.id == expense_id)
             .filter(Property.owner_id == owner_id)
         )
         return result.scalars().first()
 
-    async def get_expenses(self, db: AsyncSession, owner_id: int, skip: int = 0, limit: int = 100) -> List[Expense]:
-        result = await db.execute(
+    async def get_expenses(
+        self,
+        db: AsyncSession,
+        owner_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        selection: Optional[FieldSelection] = None,
+        page: Optional[PageRequest] = None,
+        filters: Optional[ExpenseFilter] = None
+    ) -> List[Expense]:
+        query = self._filtered(
             select(Expense)
-            .options(
+            .options(*query_options(
+                selection,
                 selectinload(Expense.property),
                 selectinload(Expense.vendor)
-            )
+            ))
             .join(Property)
-            .filter(Property.owner_id == owner_id)
-            .offset(skip)
-            .limit(limit)
+            .filter(Property.owner_id == owner_id),
+            filters
         )
+        sort = SortOrder.parse(Expense, filters.sort if filters else None)
+        if page is not None:
+            return await fetch_page(db, query, Expense.id, page, sort)
+        result = await db.execute(query.order_by(*ordering(Expense.id, sort)).offset(skip).limit(limit))
         return result.scalars().all()
 
     async def get_expenses_by_property(
@@ -43,37 +83,47 @@ class CRUDExpense:
         property_id: int,
         owner_id: int,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        selection: Optional[FieldSelection] = None,
+        page: Optional[PageRequest] = None
     ) -> List[Expense]:
-        result = await db.execute(
+        query = (
             select(Expense)
-            .options(
+            .options(*query_options(
+                selection,
                 selectinload(Expense.property),
                 selectinload(Expense.vendor)
-            )
+            ))
             .join(Property, Expense.property_id == Property.id)
             .filter(Property.id == property_id)
             .filter(Property.owner_id == owner_id)
-            .offset(skip)
-            .limit(limit)
         )
+        if page is not None:
+            return await fetch_page(db, query, Expense.id, page)
+        result = await db.execute(query.offset(skip).limit(limit))
         return result.scalars().all()
 
-    async def create_expense(self, db: AsyncSession, expense_in: ExpenseCreate, owner_id: int) -> Expense:
+    async def create_expense(
+        self,
+        db: AsyncSession,
+        expense_in: ExpenseCreate,
+        owner_id: int,
+        commit: bool = True
+    ) -> Expense:
+        """
+        commit=False only flushes, leaving the commit to the caller.
+        """
         # Verify that the property exists and belongs to the owner
-        result = await db.execute(
-            select(Property)
-            .filter(Property.id == expense_in.property_id, Property.owner_id == owner_id)
-        )
-        property = result.scalars().first()
-        if not property:
-            raise ValueError("Property not found or you do not have permission to access this property.")
+        await require_property(db, owner_id, expense_in.property_id)
 
         db_expense = Expense(**expense_in.dict())
         db.add(db_expense)
         try:
-            await db.commit()
-            await db.refresh(db_expense, attribute_names=["property", "vendor"])  # Eagerly load relationships
+            if commit:
+                await db.commit()
+                await attach_related(db, db_expense, "property", "vendor")
+            else:
+                await db.flush()
         except IntegrityError as e:
             await db.rollback()
             raise ValueError("An error occurred while creating the expense: " + str(e))
@@ -85,7 +135,7 @@ class CRUDExpense:
             setattr(db_expense, key, value)
         try:
             await db.commit()
-            await db.refresh(db_expense, attribute_names=["property", "vendor"])  # Eagerly load relationships
+            await attach_related(db, db_expense, "property", "vendor")
         except IntegrityError as e:
             await db.rollback()
             raise ValueError("An error occurred while updating the expense: " + str(e))
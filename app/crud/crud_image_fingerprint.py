@@ -0,0 +1,60 @@
+# app/crud/crud_image_fingerprint.py
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from datetime import datetime
+from typing import List, Optional
+from app.models.image_fingerprint import ImageFingerprint
+
+class CRUDImageFingerprint:
+    async def get_fingerprints(
+        self,
+        db: AsyncSession,
+        owner_id: int,
+        created_since: Optional[datetime] = None
+    ) -> List[ImageFingerprint]:
+        """
+        Retrieve the owner's fingerprints, oldest first, optionally only those
+        created at or after `created_since`.
+        """
+        query = select(ImageFingerprint).filter(ImageFingerprint.owner_id == owner_id)
+        if created_since is not None:
+            query = query.filter(ImageFingerprint.created_at >= created_since)
+        result = await db.execute(query.order_by(ImageFingerprint.id))
+        return result.scalars().all()
+
+    async def get_fingerprints_by_ids(self, db: AsyncSession, owner_id: int, fingerprint_ids: List[int]) -> List[ImageFingerprint]:
+        if not fingerprint_ids:
+            return []
+        result = await db.execute(
+            select(ImageFingerprint)
+            .filter(ImageFingerprint.owner_id == owner_id, ImageFingerprint.id.in_(fingerprint_ids))
+        )
+        return result.scalars().all()
+
+    def add_fingerprint(
+        self,
+        db: AsyncSession,
+        owner_id: int,
+        dhash: str,
+        phash: str,
+        invoice_id: Optional[int] = None,
+        document_id: Optional[int] = None,
+        filename: Optional[str] = None
+    ) -> ImageFingerprint:
+        """
+        Adds a fingerprint to the session. The caller commits it together with
+        the records it points to.
+        """
+        fingerprint = ImageFingerprint(
+            owner_id=owner_id,
+            dhash=dhash,
+            phash=phash,
+            invoice_id=invoice_id,
+            document_id=document_id,
+            filename=filename
+        )
+        db.add(fingerprint)
+        return fingerprint
+
+crud_image_fingerprint = CRUDImageFingerprint()
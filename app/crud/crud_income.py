@@ -7,44 +7,75 @@ from sqlalchemy.orm import selectinload
 from typing import List, Optional
 from app.models.income import Income
 from app.models.property import Property
-from app.schemas.income import IncomeCreate, IncomeUpdate
+from app.schemas.income import IncomeCreate, IncomeUpdate, IncomeFilter
+from app.core.access import require_property
+from app.utils.field_selection import FieldSelection, query_options
+from app.utils.pagination import PageRequest, SortOrder, fetch_page, ordering
+from app.utils.related import attach_related
 
 class CRUDIncome:
-    async def get_income(self, db: AsyncSession, income_id: int, owner_id: int) -> Optional[Income]:
+    @staticmethod
+    def _filtered(query, filters: Optional[IncomeFilter]):
+        if filters is None:
+            return query
+        if filters.property_id is not None:
+            query = query.filter(Income.property_id == filters.property_id)
+        if filters.category is not None:
+            query = query.filter(Income.category == filters.category)
+        if filters.date_from is not None:
+            query = query.filter(Income.transaction_date >= filters.date_from)
+        if filters.date_to is not None:
+            query = query.filter(Income.transaction_date <= filters.date_to)
+        return query
+
+    async def get_income(
+        self,
+        db: AsyncSession,
+        income_id: int,
+        owner_id: int,
+        selection: Optional[FieldSelection] = None
+    ) -> Optional[Income]:
         result = await db.execute(
             select(Income)
-            .options(selectinload(Income.property))  
+            .options(*query_options(selection, selectinload(Income.property)))
             .join(Property)
             .filter(Income.id == income_id)
             .filter(Property.owner_id == owner_id)
         )
         return result.scalars().first()
 
-    async def get_incomes(self, db: AsyncSession, owner_id: int, skip: int = 0, limit: int = 100) -> List[Income]:
-        result = await db.execute(
+    async def get_incomes(
+        self,
+        db: AsyncSession,
+        owner_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        selection: Optional[FieldSelection] = None,
+        page: Optional[PageRequest] = None,
+        filters: Optional[IncomeFilter] = None
+    ) -> List[Income]:
+        query = self._filtered(
             select(Income)
-            .options(selectinload(Income.property))  # Add this line
+            .options(*query_options(selection, selectinload(Income.property)))
             .join(Property)
-            .filter(Property.owner_id == owner_id)
-            .offset(skip)
-            .limit(limit)
+            .filter(Property.owner_id == owner_id),
+            filters
         )
+        sort = SortOrder.parse(Income, filters.sort if filters else None)
+        if page is not None:
+            return await fetch_page(db, query, Income.id, page, sort)
+        result = await db.execute(query.order_by(*ordering(Income.id, sort)).offset(skip).limit(limit))
         return result.scalars().all()
 
     async def create_income(self, db: AsyncSession, income_in: IncomeCreate, owner_id: int) -> Income:
         # Verify that the property exists and belongs to the owner
-        result = await db.execute(
-            select(Property).filter(Property.id == income_in.property_id, Property.owner_id == owner_id)
-        )
-        property = result.scalars().first()
-        if not property:
-            raise ValueError("Property not found or you do not have permission to access this property.")
+        await require_property(db, owner_id, income_in.property_id)
 
         db_income = Income(**income_in.dict())
         db.add(db_income)
         try:
             await db.commit()
-            await db.refresh(db_income, attribute_names=["property"])  # Add property to attribute_names
+            await attach_related(db, db_income, "property")
         except IntegrityError as e:
             await db.rollback()
             raise ValueError("An error occurred while creating the income: " + str(e))
@@ -56,7 +87,7 @@ class CRUDIncome:
             setattr(db_income, key, value)
         try:
             await db.commit()
-            await db.refresh(db_income, attribute_names=["property"])  # Add property to attribute_names
+            await attach_related(db, db_income, "property")
         except IntegrityError as e:
             await db.rollback()
             raise ValueError("An error occurred while updating the income: " + str(e))
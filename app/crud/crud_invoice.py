@@ -4,39 +4,54 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import joinedload, selectinload
-from typing import List
+from typing import List, Optional
 from app.models.property import Property
 from app.models.vendor import Vendor
 from app.models.invoice.invoice import Invoice
 from app.models.invoice.invoice_item import InvoiceItem
-from app.schemas.invoice.invoice import InvoiceCreate, InvoiceUpdate
+from app.schemas.invoice.invoice import InvoiceCreate, InvoiceUpdate, InvoiceFilter
+from app.core.access import require_property
+from app.utils.field_selection import FieldSelection, query_options
+from app.utils.pagination import PageRequest, SortOrder, fetch_page, ordering
 
 class CRUDInvoice:
+    @staticmethod
+    def _filtered(query, filters: Optional[InvoiceFilter]):
+        if filters is None:
+            return query
+        if filters.property_id is not None:
+            query = query.filter(Invoice.property_id == filters.property_id)
+        if filters.vendor_id is not None:
+            query = query.filter(Invoice.vendor_id == filters.vendor_id)
+        if filters.status is not None:
+            query = query.filter(Invoice.status == filters.status)
+        if filters.date_from is not None:
+            query = query.filter(Invoice.invoice_date >= filters.date_from)
+        if filters.date_to is not None:
+            query = query.filter(Invoice.invoice_date <= filters.date_to)
+        if filters.due_from is not None:
+            query = query.filter(Invoice.due_date >= filters.due_from)
+        if filters.due_to is not None:
+            query = query.filter(Invoice.due_date <= filters.due_to)
+        return query
+
     async def create_invoice(
         self,
         db: AsyncSession,
         invoice_in: InvoiceCreate,
-        owner_id: int
+        owner_id: int,
+        commit: bool = True
     ) -> Invoice:
+        """
+        commit=False only flushes, leaving the commit to the caller.
+        """
         # Verify that the property exists and belongs to the owner
-        result = await db.execute(
-            select(Property)
-            .filter(Property.id == invoice_in.property_id)
-            .filter(Property.owner_id == owner_id)
-        )
-        property = result.scalars().first()
-        if not property:
-            raise ValueError("Property not found or you do not have permission to access this property.")
+        await require_property(db, owner_id, invoice_in.property_id)
 
         # Optionally verify that the vendor exists, if vendor_id is provided
-        if invoice_in.vendor_id:
-            result = await db.execute(
-                select(Vendor)
-                .filter(Vendor.id == invoice_in.vendor_id)
-            )
-            vendor = result.scalars().first()
-            if not vendor:
-                raise ValueError("Vendor not found.")
+        # (a vendor the caller just looked up or created is in the identity map)
+        if invoice_in.vendor_id and not await db.get(Vendor, invoice_in.vendor_id):
+            raise ValueError("Vendor not found.")
 
         # Create the invoice instance directly from invoice_in, excluding line_items
         invoice_data = invoice_in.dict(exclude={"line_items"})
@@ -45,17 +60,16 @@ class CRUDInvoice:
         # Calculate remaining_balance
         db_invoice.remaining_balance = round(db_invoice.amount - (db_invoice.paid_amount or 0.0), 2)
 
-        # Add line items if any
-        if invoice_in.line_items:
-            for item_in in invoice_in.line_items:
-                item_data = item_in.dict()
-                db_item = InvoiceItem(**item_data)
-                db_invoice.line_items.append(db_item)
+        # Add line items if any; assigning the list (even an empty one) leaves the
+        # collection loaded for the response after the commit
+        db_invoice.line_items = [InvoiceItem(**item_in.dict()) for item_in in invoice_in.line_items or []]
 
         db.add(db_invoice)
         try:
-            await db.commit()
-            await db.refresh(db_invoice)
+            if commit:
+                await db.commit()
+            else:
+                await db.flush()
         except IntegrityError as e:
             await db.rollback()
             raise ValueError("An error occurred while saving the invoice: " + str(e))
@@ -66,27 +80,34 @@ class CRUDInvoice:
         db: AsyncSession,
         owner_id: int,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        selection: Optional[FieldSelection] = None,
+        page: Optional[PageRequest] = None,
+        filters: Optional[InvoiceFilter] = None
     ) -> List[Invoice]:
-        result = await db.execute(
+        query = self._filtered(
             select(Invoice)
-            .options(selectinload(Invoice.line_items))
+            .options(*query_options(selection, selectinload(Invoice.line_items)))
             .join(Property)
-            .filter(Property.owner_id == owner_id)
-            .offset(skip)
-            .limit(limit)
+            .filter(Property.owner_id == owner_id),
+            filters
         )
+        sort = SortOrder.parse(Invoice, filters.sort if filters else None)
+        if page is not None:
+            return await fetch_page(db, query, Invoice.id, page, sort)
+        result = await db.execute(query.order_by(*ordering(Invoice.id, sort)).offset(skip).limit(limit))
         return result.unique().scalars().all()
 
     async def get_invoice(
         self,
         db: AsyncSession,
         invoice_id: int,
-        owner_id: int
+        owner_id: int,
+        selection: Optional[FieldSelection] = None
     ) -> Invoice:
         result = await db.execute(
             select(Invoice)
-            .options(selectinload(Invoice.line_items))
+            .options(*query_options(selection, selectinload(Invoice.line_items)))
             .join(Property)
             .filter(Invoice.id == invoice_id)
             .filter(Property.owner_id == owner_id)
@@ -106,7 +127,6 @@ class CRUDInvoice:
             invoice.remaining_balance = invoice.amount - (invoice.paid_amount or 0.0)
         try:
             await db.commit()
-            await db.refresh(invoice)
         except IntegrityError as e:
             await db.rollback()
             raise ValueError("An error occurred while updating the invoice: " + str(e))
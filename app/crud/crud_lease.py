@@ -8,28 +8,28 @@ from app.models.lease import Lease
 from app.models.property import Property
 from app.schemas.lease import LeaseCreate, LeaseUpdate
 from app.services.mapping_functions import map_lease_data
+from app.core.access import require_property
+from app.utils.field_selection import FieldSelection, query_options
+from app.utils.pagination import PageRequest, fetch_page
 
 async def create_lease(
     db: AsyncSession,
     lease_in: LeaseCreate,
-    owner_id: int
+    owner_id: int,
+    commit: bool = True
 ) -> Lease:
+    # commit=False only flushes (the caller commits)
     # Verify that the property exists and belongs to the owner
-    result = await db.execute(
-        select(Property)
-        .filter(Property.id == lease_in.property_id)
-        .filter(Property.owner_id == owner_id)
-    )
-    property = result.scalars().first()
-    if not property:
-        raise ValueError("Property not found or you do not have permission to access this property.")
+    await require_property(db, owner_id, lease_in.property_id)
 
     # Create the lease instance directly from lease_in
     db_lease = Lease(**lease_in.dict())
     db.add(db_lease)
     try:
-        await db.commit()
-        await db.refresh(db_lease)
+        if commit:
+            await db.commit()
+        else:
+            await db.flush()
     except IntegrityError as e:
         await db.rollback()
         raise ValueError("An error occurred while saving the lease: " + str(e))
@@ -40,25 +40,31 @@ async def get_leases(
     db: AsyncSession,
     owner_id: int,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    selection: Optional[FieldSelection] = None,
+    page: Optional[PageRequest] = None
 ) -> List[Lease]:
-    result = await db.execute(
+    query = (
         select(Lease)
+        .options(*query_options(selection))
         .join(Property)
         .filter(Property.owner_id == owner_id)
-        .offset(skip)
-        .limit(limit)
     )
+    if page is not None:
+        return await fetch_page(db, query, Lease.id, page)
+    result = await db.execute(query.offset(skip).limit(limit))
     return result.scalars().all()
 
 # Get a single lease by ID, ensuring ownership
 async def get_lease(
     db: AsyncSession,
     lease_id: int,
-    owner_id: int
+    owner_id: int,
+    selection: Optional[FieldSelection] = None
 ) -> Lease:
     result = await db.execute(
         select(Lease)
+        .options(*query_options(selection))
         .join(Property)
         .filter(Lease.id == lease_id)
         .filter(Property.owner_id == owner_id)
@@ -75,7 +81,6 @@ async def update_lease(
         setattr(lease, key, value)
     try:
         await db.commit()
-        await db.refresh(lease)
     except IntegrityError as e:
         await db.rollback()
         raise ValueError("An error occurred while updating the lease: " + str(e))
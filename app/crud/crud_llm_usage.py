@@ -0,0 +1,128 @@
+# app/crud/crud_llm_usage.py
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func, cast, String, update
+from typing import List, Optional
+from datetime import datetime
+from app.models.llm_usage import LLMUsage, LLMBudget
+
+class CRUDLLMUsage:
+    # Columns the usage summary can be grouped by
+    GROUP_COLUMNS = {
+        "stage": LLMUsage.stage,
+        "task": LLMUsage.task,
+        "model": LLMUsage.model,
+        "tier": LLMUsage.tier,
+        "document": cast(LLMUsage.document_id, String),
+        "day": cast(func.date(LLMUsage.created_at), String),
+    }
+
+    def add_usage(self, db: AsyncSession, owner_id: int, stage: str, records: list, document_id: Optional[int] = None) -> List[LLMUsage]:
+        """
+        Add usage records to the session. The caller commits them together with the
+        records they belong to.
+        """
+        rows = [
+            LLMUsage(
+                owner_id=owner_id,
+                document_id=document_id,
+                stage=stage,
+                task=record.task,
+                model=record.model,
+                tier=record.tier,
+                prompt_tokens=record.prompt_tokens,
+                completion_tokens=record.completion_tokens,
+                cached_tokens=record.cached_tokens,
+                cost=record.cost,
+                latency_ms=record.latency_ms,
+                success=record.success
+            )
+            for record in records
+        ]
+        db.add_all(rows)
+        return rows
+
+    async def link_document(self, db: AsyncSession, usage_ids: List[int], document_id: int) -> None:
+        """
+        Point already saved usage rows at the document they were spent on. Not
+        committed: the link is made in the transaction that creates the document.
+        """
+        if not usage_ids:
+            return
+        await db.execute(
+            update(LLMUsage)
+            .where(LLMUsage.id.in_(usage_ids))
+            .values(document_id=document_id)
+        )
+
+    async def get_document_usage(self, db: AsyncSession, document_id: int, owner_id: int) -> List[LLMUsage]:
+        result = await db.execute(
+            select(LLMUsage)
+            .filter(LLMUsage.document_id == document_id, LLMUsage.owner_id == owner_id)
+            .order_by(LLMUsage.id)
+        )
+        return result.scalars().all()
+
+    async def aggregate_usage(
+        self,
+        db: AsyncSession,
+        owner_id: int,
+        group_by: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[dict]:
+        """
+        Sum calls, tokens and cost of the owner's model calls, optionally grouped
+        by one of GROUP_COLUMNS, most expensive first.
+        """
+        if group_by is not None and group_by not in self.GROUP_COLUMNS:
+            raise ValueError(f"Cannot group usage by '{group_by}'.")
+        key = self.GROUP_COLUMNS[group_by] if group_by else None
+        columns = [
+            func.count(LLMUsage.id).label("calls"),
+            func.coalesce(func.sum(LLMUsage.prompt_tokens), 0).label("prompt_tokens"),
+            func.coalesce(func.sum(LLMUsage.completion_tokens), 0).label("completion_tokens"),
+            func.coalesce(func.sum(LLMUsage.cached_tokens), 0).label("cached_tokens"),
+            func.coalesce(func.sum(LLMUsage.cost), 0.0).label("cost"),
+            func.coalesce(func.avg(LLMUsage.latency_ms), 0.0).label("avg_latency_ms"),
+        ]
+        query = select(*([key.label("key")] if key is not None else []), *columns).filter(LLMUsage.owner_id == owner_id)
+        if start:
+            query = query.filter(LLMUsage.created_at >= start)
+        if end:
+            query = query.filter(LLMUsage.created_at < end)
+        if key is not None:
+            query = query.group_by(key).order_by(func.sum(LLMUsage.cost).desc())
+        result = await db.execute(query)
+        return [dict(row._mapping) for row in result.all()]
+
+    async def get_cost_since(self, db: AsyncSession, owner_id: int, since: datetime) -> float:
+        result = await db.execute(
+            select(func.coalesce(func.sum(LLMUsage.cost), 0.0))
+            .filter(LLMUsage.owner_id == owner_id, LLMUsage.created_at >= since)
+        )
+        return float(result.scalar() or 0.0)
+
+    async def get_budget(self, db: AsyncSession, owner_id: int) -> Optional[LLMBudget]:
+        result = await db.execute(select(LLMBudget).filter(LLMBudget.owner_id == owner_id))
+        return result.scalars().first()
+
+    async def set_budget(self, db: AsyncSession, owner_id: int, monthly_limit: float, hard_limit: bool = True) -> LLMBudget:
+        budget = await self.get_budget(db=db, owner_id=owner_id)
+        if budget is None:
+            budget = LLMBudget(owner_id=owner_id, monthly_limit=monthly_limit, hard_limit=hard_limit)
+            db.add(budget)
+        else:
+            budget.monthly_limit = monthly_limit
+            budget.hard_limit = hard_limit
+        await db.commit()
+        return budget
+
+    async def delete_budget(self, db: AsyncSession, owner_id: int) -> None:
+        budget = await self.get_budget(db=db, owner_id=owner_id)
+        if budget is not None:
+            await db.delete(budget)
+            await db.commit()
+
+crud_llm_usage = CRUDLLMUsage()
@@ -7,12 +7,43 @@ from typing import List, Optional
 from app.models.payment import Payment
 from app.models.lease import Lease
 from app.models.property import Property
-from app.schemas.payment import PaymentCreate, PaymentUpdate
+from app.schemas.payment import PaymentCreate, PaymentUpdate, PaymentFilter
+from app.core.access import property_access
+from app.utils.field_selection import FieldSelection, query_options
+from app.utils.pagination import PageRequest, SortOrder, fetch_page, ordering
+from app.utils.related import attach_related
 
 class CRUDPayment:
-    async def get_payment(self, db: AsyncSession, payment_id: int, owner_id: int) -> Optional[Payment]:
+    @staticmethod
+    def _filtered(query, filters: Optional[PaymentFilter]):
+        if filters is None:
+            return query
+        if filters.property_id is not None:
+            query = query.filter(Lease.property_id == filters.property_id)
+        if filters.lease_id is not None:
+            query = query.filter(Payment.lease_id == filters.lease_id)
+        if filters.status is not None:
+            query = query.filter(Payment.status == filters.status)
+        if filters.date_from is not None:
+            query = query.filter(Payment.payment_date >= filters.date_from)
+        if filters.date_to is not None:
+            query = query.filter(Payment.payment_date <= filters.date_to)
+        if filters.due_from is not None:
+            query = query.filter(Payment.due_date >= filters.due_from)
+        if filters.due_to is not None:
+            query = query.filter(Payment.due_date <= filters.due_to)
+        return query
+
+    async def get_payment(
+        self,
+        db: AsyncSession,
+        payment_id: int,
+        owner_id: int,
+        selection: Optional[FieldSelection] = None
+    ) -> Optional[Payment]:
         result = await db.execute(
             select(Payment)
+            .options(*query_options(selection))
             .join(Lease)
             .join(Property)
             .filter(Payment.id == payment_id)
@@ -20,15 +51,28 @@ class CRUDPayment:
         )
         return result.scalars().first()
 
-    async def get_payments(self, db: AsyncSession, owner_id: int, skip: int = 0, limit: int = 100) -> List[Payment]:
-        result = await db.execute(
+    async def get_payments(
+        self,
+        db: AsyncSession,
+        owner_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        selection: Optional[FieldSelection] = None,
+        page: Optional[PageRequest] = None,
+        filters: Optional[PaymentFilter] = None
+    ) -> List[Payment]:
+        query = self._filtered(
             select(Payment)
+            .options(*query_options(selection))
             .join(Lease)
             .join(Property)
-            .filter(Property.owner_id == owner_id)
-            .offset(skip)
-            .limit(limit)
+            .filter(Property.owner_id == owner_id),
+            filters
         )
+        sort = SortOrder.parse(Payment, filters.sort if filters else None)
+        if page is not None:
+            return await fetch_page(db, query, Payment.id, page, sort)
+        result = await db.execute(query.order_by(*ordering(Payment.id, sort)).offset(skip).limit(limit))
         return result.scalars().all()
 
     async def create_payment(self, db: AsyncSession, payment_in: PaymentCreate, owner_id: int) -> Payment:
@@ -42,12 +86,14 @@ class CRUDPayment:
         lease = result.scalars().first()
         if not lease:
             raise ValueError("Lease not found or you do not have permission to access this lease.")
+        # The join has just checked the lease's property too
+        property_access(db, owner_id).grant(lease.property_id)
 
         db_payment = Payment(**payment_in.dict())
         db.add(db_payment)
         try:
             await db.commit()
-            await db.refresh(db_payment)
+            await attach_related(db, db_payment, "lease")
         except IntegrityError as e:
             await db.rollback()
             raise ValueError("An error occurred while creating the payment: " + str(e))
@@ -59,7 +105,7 @@ class CRUDPayment:
             setattr(db_payment, key, value)
         try:
             await db.commit()
-            await db.refresh(db_payment)
+            await attach_related(db, db_payment, "lease")
         except IntegrityError as e:
             await db.rollback()
             raise ValueError("An error occurred while updating the payment: " + str(e))
@@ -2,49 +2,91 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import List, Optional
+from sqlalchemy.orm import selectinload
+from typing import List, Optional, Sequence
 from app.models.property import Property
 from app.schemas.property import PropertyCreate, PropertyUpdate
+from app.core.access import owns_property, property_access
+from app.utils.field_selection import FieldSelection, query_options
+from app.utils.pagination import PageRequest, fetch_page
 from sqlalchemy.exc import IntegrityError
 
-async def create_with_owner(db: AsyncSession, obj_in: PropertyCreate, owner_id: int) -> Property:
-    # Check if the property already exists for the same user (address + owner_id combination)
-    existing_property = await db.execute(
-        select(Property)
-        .filter(Property.address == obj_in.address)
-        .filter(Property.owner_id == owner_id)
-    )
-    existing_property = existing_property.scalars().first()
+# Collections the ORM deletes together with the property
+CASCADED_COLLECTIONS = ("leases", "expenses", "incomes", "invoices", "contracts", "documents", "tenants", "utilities")
 
-    if existing_property:
-        raise ValueError("Property with this address already exists for the current user")
+def expansion_options(expand: Sequence[str]) -> list:
+    return [selectinload(getattr(Property, name)) for name in expand]
+
+async def create_with_owner(
+    db: AsyncSession,
+    obj_in: PropertyCreate,
+    owner_id: int,
+    commit: bool = True,
+    verified: bool = False
+) -> Property:
+    # commit=False only flushes (the caller commits); verified=True skips the
+    # duplicate check the caller has already made
+    if not verified:
+        # Check if the property already exists for the same user (address + owner_id combination)
+        existing_property = await db.execute(
+            select(Property.id)
+            .filter(Property.address == obj_in.address)
+            .filter(Property.owner_id == owner_id)
+        )
+        if existing_property.scalars().first():
+            raise ValueError("Property with this address already exists for the current user")
 
     # Proceed to create the property if no duplicates exist
     db_obj = Property(**obj_in.dict(), owner_id=owner_id)
     db.add(db_obj)
     try:
-        await db.commit()
-        await db.refresh(db_obj)
+        if commit:
+            await db.commit()
+        else:
+            await db.flush()
     except IntegrityError as e:
         await db.rollback()
         raise ValueError("An error occurred while saving the property: " + str(e))
+    property_access(db, owner_id).grant(db_obj.id)
     return db_obj
 
 # Retrieve multiple properties by the owner's id
-async def get_properties_by_owner(db: AsyncSession, owner_id: int, skip: int = 0, limit: int = 100) -> List[Property]:
-    result = await db.execute(
-        select(Property).filter(Property.owner_id == owner_id).offset(skip).limit(limit)
+async def get_properties_by_owner(
+    db: AsyncSession,
+    owner_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    selection: Optional[FieldSelection] = None,
+    page: Optional[PageRequest] = None
+) -> List[Property]:
+    query = (
+        select(Property)
+        .filter(Property.owner_id == owner_id)
+        .options(*query_options(selection))
     )
+    if page is not None:
+        return await fetch_page(db, query, Property.id, page)
+    result = await db.execute(query.offset(skip).limit(limit))
     return result.scalars().all()
 
 # Get a single property by its id and owner_id
-async def get_property_by_owner(db: AsyncSession, property_id: int, owner_id: int) -> Optional[Property]:
+async def get_property_by_owner(
+    db: AsyncSession,
+    property_id: int,
+    owner_id: int,
+    selection: Optional[FieldSelection] = None
+) -> Optional[Property]:
     result = await db.execute(
         select(Property)
         .filter(Property.id == property_id)
         .filter(Property.owner_id == owner_id)
+        .options(*query_options(selection))
     )
-    return result.scalars().first()
+    property = result.scalars().first()
+    if property is not None:
+        # Later ownership checks in this request need no query
+        property_access(db, owner_id).grant(property.id)
+    return property
 
 async def get_property_by_address(
     db: AsyncSession,
@@ -59,15 +101,16 @@ async def get_property_by_address(
         .filter(Property.address.ilike(address))  
         .filter(Property.owner_id == owner_id)
     )
-    return result.scalars().first()
+    property = result.scalars().first()
+    if property is not None:
+        property_access(db, owner_id).grant(property.id)
+    return property
 
 async def get_property_by_id(db: AsyncSession, property_id: int, owner_id: int) -> Optional[Property]:
-    result = await db.execute(
-        select(Property)
-        .filter(Property.id == property_id)
-        .filter(Property.owner_id == owner_id)
-    )
-    return result.scalars().first()
+    # The ownership lookup loads the row, so the get is answered from the identity map
+    if not await owns_property(db, owner_id, property_id):
+        return None
+    return await db.get(Property, property_id)
 
 # Update a property
 async def update_property(db: AsyncSession, property: Property, property_in: PropertyUpdate) -> Property:
@@ -75,7 +118,6 @@ async def update_property(db: AsyncSession, property: Property, property_in: Pro
         setattr(property, key, value)
     try:
         await db.commit()
-        await db.refresh(property)
     except IntegrityError as e:
         await db.rollback()
         raise ValueError("An error occurred while updating the property: " + str(e))
@@ -83,10 +125,18 @@ async def update_property(db: AsyncSession, property: Property, property_in: Pro
 
 # Delete a property
 async def delete_property(db: AsyncSession, property: Property) -> Property:
+    # The delete cascades through the ORM, which needs the child rows loaded
+    await db.execute(
+        select(Property)
+        .filter(Property.id == property.id)
+        .options(*expansion_options(CASCADED_COLLECTIONS))
+        .execution_options(populate_existing=True)
+    )
     await db.delete(property)
     try:
         await db.commit()
     except IntegrityError as e:
         await db.rollback()
         raise ValueError("An error occurred while deleting the property: " + str(e))
+    property_access(db, property.owner_id).revoke(property.id)
     return property
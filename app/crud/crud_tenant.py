@@ -9,35 +9,52 @@ from typing import List, Optional
 from app.models.tenant import Tenant
 from app.models.property import Property
 from app.schemas.tenant import TenantResponse, TenantCreate, TenantUpdate
+from app.core.access import require_property
+from app.utils.field_selection import FieldSelection, query_options
+from app.utils.pagination import PageRequest, fetch_page
+from app.utils.related import attach_related
 
 class CRUDTenant:
     async def get_tenant(
-    self, db: AsyncSession, tenant_id: int, owner_id: int
+        self,
+        db: AsyncSession,
+        tenant_id: int,
+        owner_id: int,
+        selection: Optional[FieldSelection] = None
     ) -> Optional[Tenant]:
         result = await db.execute(
             select(Tenant)
-            .options(
+            .options(*query_options(
+                selection,
                 selectinload(Tenant.property),
                 selectinload(Tenant.lease),
-            )
+            ))
             .filter(Tenant.id == tenant_id)
             .filter(Tenant.owner_id == owner_id)
         )
         return result.scalars().first()
 
     async def get_tenants(
-        self, db: AsyncSession, owner_id: int, skip: int = 0, limit: int = 100
+        self,
+        db: AsyncSession,
+        owner_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        selection: Optional[FieldSelection] = None,
+        page: Optional[PageRequest] = None
     ) -> List[TenantResponse]:
-        result = await db.execute(
+        query = (
             select(Tenant)
-            .options(
+            .options(*query_options(
+                selection,
                 selectinload(Tenant.property),
                 selectinload(Tenant.lease),
-            )
+            ))
             .filter(Tenant.owner_id == owner_id)
-            .offset(skip)
-            .limit(limit)
         )
+        if page is not None:
+            return await fetch_page(db, query, Tenant.id, page)
+        result = await db.execute(query.offset(skip).limit(limit))
         tenants = result.scalars().all()
         return tenants
 
@@ -81,45 +98,39 @@ class CRUDTenant:
         return result.scalars().first()
     
     async def create_tenant(
-        self, db: AsyncSession, *, tenant_in: TenantCreate, owner_id: int
+        self, db: AsyncSession, *, tenant_in: TenantCreate, owner_id: int, commit: bool = True
     ) -> Tenant:
+        if tenant_in.property_id:
+            await require_property(db, owner_id, tenant_in.property_id)
         tenant_data = tenant_in.dict()
         tenant_data['owner_id'] = owner_id  # Set owner_id
         tenant = Tenant(**tenant_data)
         db.add(tenant)
         try:
-            await db.commit()
-            await db.refresh(tenant)
+            if commit:
+                await db.commit()
+                await attach_related(db, tenant, "lease", "property")
+            else:
+                # Part of the caller's transaction: the flush assigns the id
+                await db.flush()
         except IntegrityError as e:
             await db.rollback()
             raise ValueError("An error occurred while creating the tenant: " + str(e))
-
-        # Eagerly load relationships
-        await db.refresh(tenant)
         return tenant
 
     async def create_tenant_manual(
         self, db: AsyncSession, *, tenant_in: TenantCreate, owner_id: int
     ) -> TenantResponse:
+        if tenant_in.property_id:
+            await require_property(db, owner_id, tenant_in.property_id)
         tenant_data = tenant_in.dict()
         tenant_data['owner_id'] = owner_id  # Set owner_id
         tenant = Tenant(**tenant_data)
         db.add(tenant)
         await db.commit()
-        await db.refresh(tenant)
-
-        # Re-fetch the tenant with relationships eagerly loaded
-        result = await db.execute(
-            select(Tenant)
-            .options(
-                selectinload(Tenant.property),
-                selectinload(Tenant.lease),
-            )
-            .filter(Tenant.id == tenant.id)
-        )
-        tenant_with_relationships = result.scalars().first()
+        await attach_related(db, tenant, "lease", "property")
 
-        return TenantResponse.from_orm(tenant_with_relationships)
+        return TenantResponse.from_orm(tenant)
 
 
     async def update_tenant(
@@ -130,7 +141,7 @@ class CRUDTenant:
             setattr(db_tenant, key, value)
         try:
             await db.commit()
-            await db.refresh(db_tenant)
+            await attach_related(db, db_tenant, "lease", "property")
         except IntegrityError as e:
             await db.rollback()
             raise ValueError("An error occurred while updating the tenant: " + str(e))
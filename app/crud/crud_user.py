@@ -32,7 +32,6 @@ class CRUDUser:
         db.add(db_user)
         try:
             await db.commit()
-            await db.refresh(db_user)
         except IntegrityError as e:
             await db.rollback()
             raise ValueError("An error occurred while creating the user: " + str(e))
@@ -46,7 +45,6 @@ class CRUDUser:
             setattr(db_user, key, value)
         try:
             await db.commit()
-            await db.refresh(db_user)
         except IntegrityError as e:
             await db.rollback()
             raise ValueError("An error occurred while updating the user: " + str(e))
@@ -7,25 +7,44 @@ from typing import List, Optional
 from app.models.utility import Utility
 from app.models.property import Property
 from app.schemas.utility import UtilityCreate, UtilityUpdate
+from app.utils.field_selection import FieldSelection, query_options
+from app.utils.pagination import PageRequest, fetch_page
 
 class CRUDUtility:
-    async def get_utility(self, db: AsyncSession, utility_id: int, owner_id: int) -> Optional[Utility]:
+    async def get_utility(
+        self,
+        db: AsyncSession,
+        utility_id: int,
+        owner_id: int,
+        selection: Optional[FieldSelection] = None
+    ) -> Optional[Utility]:
         result = await db.execute(
-            select(Utility)            
+            select(Utility)
+            .options(*query_options(selection))
             .join(Property)
             .filter(Utility.id == utility_id)
             .filter(Property.owner_id == owner_id)
         )
         return result.scalars().first()
 
-    async def get_utilities(self, db: AsyncSession, owner_id: int, skip: int = 0, limit: int = 100) -> List[Utility]:
-        result = await db.execute(
-            select(Utility)            
+    async def get_utilities(
+        self,
+        db: AsyncSession,
+        owner_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        selection: Optional[FieldSelection] = None,
+        page: Optional[PageRequest] = None
+    ) -> List[Utility]:
+        query = (
+            select(Utility)
+            .options(*query_options(selection))
             .join(Property)
             .filter(Property.owner_id == owner_id)
-            .offset(skip)
-            .limit(limit)
         )
+        if page is not None:
+            return await fetch_page(db, query, Utility.id, page)
+        result = await db.execute(query.offset(skip).limit(limit))
         return result.scalars().all()
 
     # async def create_utility(self, db: AsyncSession, utility_in: UtilityCreate, owner_id: int) -> Utility:
@@ -56,7 +75,6 @@ class CRUDUtility:
             setattr(db_utility, key, value)
         try:
             await db.commit()
-            await db.refresh(db_utility)
         except IntegrityError as e:
             await db.rollback()
             raise ValueError("An error occurred while updating the utility: " + str(e))
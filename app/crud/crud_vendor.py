@@ -6,10 +6,18 @@ from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 from app.models.vendor import Vendor
 from app.schemas.vendor import VendorCreate, VendorUpdate
+from app.utils.field_selection import FieldSelection, query_options
+from app.utils.pagination import PageRequest, fetch_page
 
 class CRUDVendor:
-    async def get_vendor(self, db: AsyncSession, vendor_id: int, owner_id: Optional[int] = None) -> Optional[Vendor]:
-        query = select(Vendor).filter(Vendor.id == vendor_id)
+    async def get_vendor(
+        self,
+        db: AsyncSession,
+        vendor_id: int,
+        owner_id: Optional[int] = None,
+        selection: Optional[FieldSelection] = None
+    ) -> Optional[Vendor]:
+        query = select(Vendor).options(*query_options(selection)).filter(Vendor.id == vendor_id)
         if owner_id is not None:
             query = query.filter(Vendor.owner_id == owner_id)
         result = await db.execute(query)
@@ -21,18 +29,40 @@ class CRUDVendor:
         )
         return result.scalars().first()
 
-    async def get_vendors(self, db: AsyncSession, owner_id: int, skip: int = 0, limit: int = 100) -> List[Vendor]:
-        result = await db.execute(
-            select(Vendor).filter(Vendor.owner_id == owner_id).offset(skip).limit(limit)
+    async def get_vendors(
+        self,
+        db: AsyncSession,
+        owner_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        selection: Optional[FieldSelection] = None,
+        page: Optional[PageRequest] = None
+    ) -> List[Vendor]:
+        query = (
+            select(Vendor)
+            .options(*query_options(selection))
+            .filter(Vendor.owner_id == owner_id)
         )
+        if page is not None:
+            return await fetch_page(db, query, Vendor.id, page)
+        result = await db.execute(query.offset(skip).limit(limit))
         return result.scalars().all()
 
-    async def create_vendor(self, db: AsyncSession, vendor_in: VendorCreate, owner_id: int) -> Vendor:
+    async def create_vendor(
+        self,
+        db: AsyncSession,
+        vendor_in: VendorCreate,
+        owner_id: int,
+        commit: bool = True
+    ) -> Vendor:
         db_vendor = Vendor(**vendor_in.dict(), owner_id=owner_id)
         db.add(db_vendor)
         try:
-            await db.commit()
-            await db.refresh(db_vendor)
+            if commit:
+                await db.commit()
+            else:
+                # Part of the caller's transaction: the flush assigns the id
+                await db.flush()
         except IntegrityError as e:
             await db.rollback()
             raise ValueError("An error occurred while creating the vendor: " + str(e))
@@ -44,7 +74,6 @@ class CRUDVendor:
             setattr(db_vendor, key, value)
         try:
             await db.commit()
-            await db.refresh(db_vendor)
         except IntegrityError as e:
             await db.rollback()
             raise ValueError("An error occurred while updating the vendor: " + str(e))
@@ -0,0 +1,25 @@
+# app/db/base.py
+
+# Importing this module registers every model on Base.metadata, for the
+# application and for migrations (alembic/env.py)
+from app.db.database import Base
+from app.models import (
+    user as user_model,
+    property as property_model,
+    tenant as tenant_model,
+    lease as lease_model,
+    payment as payment_model,
+    expense as expense_model,
+    income as income_model,
+    vendor as vendor_model,
+    contract as contract_model,
+    document as document_model,
+    document_packet as document_packet_model,
+    document_page as document_page_model,
+    document_telemetry as document_telemetry_model,
+    image_fingerprint as image_fingerprint_model,
+    llm_usage as llm_usage_model,
+    utility as utility_model,
+)
+from app.models.invoice import invoice as invoice_model
+from app.models.invoice import invoice_item as invoice_item_model
@@ -1,23 +1,232 @@
+import random
+import time
+from math import ceil
+from typing import Dict, Optional
+from uuid import uuid4
+
+from fastapi import Request
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from starlette.datastructures import MutableHeaders
 from app.core.config import settings
+from app.utils.metrics import InstrumentedAsyncQueuePool
 
 # Set up the database URL from settings
 DATABASE_URL = settings.DATABASE_URL
 
-# Create the async engine and sessionmaker
-engine = create_async_engine(DATABASE_URL, echo=False)
+# Cookie telling any worker process to read from the primary until the given time
+PRIMARY_PIN_COOKIE = "primary_until"
+
+
+def connect_args(url: str = DATABASE_URL) -> dict:
+    """
+    asyncpg connection arguments. Behind PgBouncer in transaction mode each
+    transaction may run on another server connection, so prepared statements
+    are neither cached nor given reusable names.
+    """
+    if not url.startswith("postgresql+asyncpg"):
+        return {}
+    if settings.DB_PGBOUNCER:
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return {
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+
+
+def _create_engine(url: str):
+    return create_async_engine(
+        url,
+        echo=False,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args(url)
+    )
+
+
+# Create the async engines: the primary, and read replicas for routers that opt in
+engine = _create_engine(DATABASE_URL)
+replica_engines = [_create_engine(url) for url in settings.DATABASE_REPLICA_URLS]
+
+# Token subjects that wrote recently, with the time until which they read from the primary
+_primary_until: Dict[str, float] = {}
+
+
+def pin_to_primary(subject: str) -> float:
+    now = time.time()
+    if len(_primary_until) > 10000:
+        for key in [key for key, until in _primary_until.items() if until <= now]:
+            del _primary_until[key]
+    until = now + settings.DB_READ_YOUR_WRITES_SECONDS
+    _primary_until[subject] = until
+    return until
+
+
+def _pinned(session: Session) -> bool:
+    now = time.time()
+    if session.info.get("primary_until", 0.0) > now:
+        return True
+    until = _primary_until.get(session.info.get("subject"))
+    return until is not None and until > now
+
+
+def pinned_to_primary(db: AsyncSession) -> bool:
+    """
+    Whether reads of the session's request go to the primary because the
+    request's client or token subject wrote recently.
+    """
+    return _pinned(db)
+
+
+def share_request(source: AsyncSession, target: AsyncSession) -> None:
+    """
+    Opens `target` on behalf of the request that owns `source`: its reads follow
+    the request's primary pin, and its commits pin the token subject and set the
+    request's pin cookie as the request session's own commits would.
+    """
+    for key in ("subject", "request_state", "primary_until"):
+        if key in source.info:
+            target.info[key] = source.info[key]
+
+
+class RoutingSession(Session):
+    """
+    Sends a session's reads to its replica (info["replica"], set for reads from
+    routers using use_read_replica) and everything else to the primary: flushes,
+    reads after this session wrote, and reads by a subject that wrote in the last
+    DB_READ_YOUR_WRITES_SECONDS, since the replica may not have the write yet.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get("replica")
+        if replica is None or self._flushing or self.info.get("primary") or self.info.get("written") or _pinned(self):
+            return engine.sync_engine
+        return replica.sync_engine
+
+
+# Objects stay loaded after commit, so a session can end its transaction (and
+# return the connection) without the next attribute access needing the database
 SessionLocal = sessionmaker(
-    autocommit=False, autoflush=False, bind=engine, class_=AsyncSession
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False
 )
 
 # Base class for models
 Base = declarative_base()
 
-# Dependency to get the database session
-async def get_db():
-    async with SessionLocal() as session:
+
+@event.listens_for(Session, "after_flush")
+def _mark_written(session, flush_context):
+    session.info["written"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    if not session.info.pop("written", None) or not replica_engines:
+        return
+    # Read your writes: this session, and the subject's next requests, use the primary
+    session.info["primary"] = True
+    subject = session.info.get("subject")
+    until = pin_to_primary(subject) if subject is not None else time.time() + settings.DB_READ_YOUR_WRITES_SECONDS
+    request_state = session.info.get("request_state")
+    if request_state is not None:
+        request_state.primary_until = until
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("written", None)
+
+
+async def release_connection(db: AsyncSession) -> None:
+    """
+    Ends a read-only transaction so its connection goes back to the pool, e.g.
+    before OCR or a model call. The session checks out a connection again on its
+    next query. A transaction holding changes is left open to commit as a whole.
+    """
+    if not db.in_transaction():
+        return
+    if db.new or db.dirty or db.deleted or db.info.get("written"):
+        return
+    await db.commit()
+
+
+def read_session(subject: Optional[str] = None) -> AsyncSession:
+    """
+    A session for reads, served by a replica when any are configured (see
+    RoutingSession). `subject` is the token subject the reads are for.
+    """
+    session = SessionLocal()
+    if replica_engines:
+        session.info["replica"] = random.choice(replica_engines)
+    session.info["subject"] = subject
+    return session
+
+
+def use_read_replica(request: Request) -> None:
+    """
+    Router dependency (APIRouter(dependencies=[Depends(use_read_replica)])): the
+    router's GET endpoints read from a replica.
+    """
+    request.state.read_replica = True
+
+
+def _cookie_pin(request: Request) -> float:
+    try:
+        return float(request.cookies.get(PRIMARY_PIN_COOKIE, 0))
+    except ValueError:
+        return 0.0
+
+
+# Dependency to get the database session. The session only checks out a
+# connection when it first runs a query.
+async def get_db(request: Request):
+    reads = request.method in ("GET", "HEAD") and getattr(request.state, "read_replica", False)
+    async with (read_session() if reads else SessionLocal()) as session:
+        session.info["request_state"] = request.state
+        session.info["primary_until"] = _cookie_pin(request)
         try:
             yield session
         finally:
             await session.close()
+
+
+class ReadYourWritesMiddleware:
+    """
+    Sets the primary pin cookie on responses to requests that wrote, so the
+    client's next reads go to the primary whichever worker process serves them.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not replica_engines:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                until = scope.get("state", {}).get("primary_until")
+                if until is not None:
+                    MutableHeaders(scope=message).append(
+                        "set-cookie",
+                        f"{PRIMARY_PIN_COOKIE}={until:.3f}; Max-Age={ceil(settings.DB_READ_YOUR_WRITES_SECONDS)}; "
+                        "Path=/; HttpOnly; SameSite=Lax"
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
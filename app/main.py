@@ -1,4 +1,5 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException, Response
+from typing import Optional
 from app.api.endpoints import (
     user,
     property,
@@ -13,30 +14,21 @@ from app.api.endpoints import (
     document,
     utility,
     chat,
-    processor
+    processor,
+    usage
 )
 from app.api.endpoints.auth_routes import router as auth_router
-from app.db.database import engine, Base
+from app.db.database import engine, replica_engines, Base, ReadYourWritesMiddleware
+from app.utils.metrics import MetricsMiddleware, register_pool_collector, render_metrics
+from app.utils.tracing import configure_tracing, shutdown_tracing
 from app.core.config import settings
+from app.services.openai.prompts import compile_prompts
+from app.services.extraction_worker import start_extraction_worker, stop_extraction_worker
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
 # Import all models
-from app.models import (
-    user as user_model,
-    property as property_model,
-    tenant as tenant_model,
-    lease as lease_model,
-    payment as payment_model,
-    expense as expense_model,
-    income as income_model,
-    vendor as vendor_model,
-    contract as contract_model,
-    document as document_model,
-    utility as utility_model,
-)
-from app.models.invoice import invoice as invoice_model
-from app.models.invoice import invoice_item as invoice_item_model
+from app.db import base as models_base  # noqa: F401
 
 app = FastAPI(
     title="Spaceify",
@@ -62,20 +54,56 @@ app.include_router(document.router, prefix="/documents", tags=["documents"])
 app.include_router(utility.router, prefix="/utilities", tags=["utilities"])
 app.include_router(chat.router, prefix="/chat", tags=["chat"])
 app.include_router(processor.router, prefix="/processor", tags=["processor"])
+app.include_router(usage.router, prefix="/usage", tags=["usage"])
 
 # Database initialization
 @app.on_event("startup")
 async def startup():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Migrations own the schema; workers start without DDL round trips
+    if settings.DB_CREATE_ALL:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    # Build the static prompt prefixes once instead of on every request
+    compile_prompts()
+    # Extract documents stored while the model provider was unavailable
+    start_extraction_worker()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await stop_extraction_worker()
+    shutdown_tracing()
 
 # Middleware
 app.add_middleware(SessionMiddleware, secret_key=settings.SECRET_KEY)
 
+# Pins a client that wrote to the primary (no-op without read replicas)
+app.add_middleware(ReadYourWritesMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["https://www.spaceify.ai"], 
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-)
\ No newline at end of file
+)
+
+# Outermost, so request latency includes the other middleware
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    register_pool_collector(engine)
+    for index, replica in enumerate(replica_engines):
+        register_pool_collector(replica, f"replica-{index}")
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics(authorization: Optional[str] = Header(None)):
+        """
+        Prometheus metrics: request latency by route, DB pool wait and saturation,
+        ingest/OCR concurrency and model call latency, tokens and cost.
+        """
+        if settings.METRICS_BEARER_TOKEN and authorization != f"Bearer {settings.METRICS_BEARER_TOKEN}":
+            raise HTTPException(status_code=401, detail="Not authenticated")
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
+
+# Spans for routes and SQL statements; OCR, model calls and pipeline stages add their own
+configure_tracing(app, [engine, *replica_engines])
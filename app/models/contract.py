@@ -9,7 +9,7 @@ class Contract(Base):
     __tablename__ = 'contracts'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    property_id = Column(Integer, ForeignKey('properties.id', ondelete='CASCADE'), nullable=False)
+    property_id = Column(Integer, ForeignKey('properties.id', ondelete='CASCADE'), nullable=False, index=True)
     vendor_id = Column(Integer, ForeignKey('vendors.id', ondelete='SET NULL'), nullable=True)
     contract_type = Column(String(50), nullable=False)
     start_date = Column(Date, nullable=True)
@@ -9,19 +9,38 @@ class Document(Base):
     __tablename__ = 'documents'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    property_id = Column(Integer, ForeignKey('properties.id', ondelete='CASCADE'), nullable=True)    
+    property_id = Column(Integer, ForeignKey('properties.id', ondelete='CASCADE'), nullable=True, index=True)    
     lease_id = Column(Integer, ForeignKey('leases.id', ondelete='CASCADE'), nullable=True)
     tenant_id = Column(Integer, ForeignKey('tenants.id', ondelete='CASCADE'), nullable=True)
     expense_id = Column(Integer, ForeignKey('expenses.id', ondelete='CASCADE'), nullable=True)
     invoice_id = Column(Integer, ForeignKey('invoices.id', ondelete='CASCADE'), unique=True, nullable=True)
     contract_id = Column(Integer, ForeignKey('contracts.id', ondelete='CASCADE'), nullable=True)
+    packet_id = Column(Integer, ForeignKey('document_packets.id', ondelete='SET NULL'), nullable=True)
+    owner_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True)
     document_type = Column(String(50), nullable=False)    
     upload_date = Column(DateTime, default=datetime.utcnow)
     description = Column(Text, nullable=True)
+    prompt_version = Column(String(100), nullable=True)
+    # 'processed', or 'pending_extraction' / 'extracting' / 'extraction_failed' for
+    # uploads accepted while the model provider was unavailable
+    status = Column(String(30), nullable=False, default='processed', server_default='processed', index=True)
+    # OCR text kept until a pending extraction has run
+    extracted_text = Column(Text, nullable=True)
+    # W3C traceparent of the upload that deferred extraction, linked from the worker's trace
+    trace_parent = Column(String(55), nullable=True)
+    # When a worker claimed the pending extraction; stale claims are returned to the queue
+    claimed_at = Column(DateTime, nullable=True)
 
     # Relationships with cascade
     property = relationship('Property', back_populates='documents')    
     lease = relationship('Lease', uselist=False, back_populates='document')
     expense = relationship('Expense', back_populates='documents')
     invoice = relationship('Invoice', back_populates='document')
-    contract = relationship('Contract', uselist=False, back_populates='document')
\ No newline at end of file
+    contract = relationship('Contract', uselist=False, back_populates='document')
+    packet = relationship('DocumentPacket', back_populates='documents')
+    pages = relationship(
+        'DocumentPage',
+        back_populates='document',
+        cascade="all, delete-orphan",
+        order_by='DocumentPage.page_number'
+    )
\ No newline at end of file
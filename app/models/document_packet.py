@@ -0,0 +1,19 @@
+# app/models/document_packet.py
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.db.database import Base
+
+class DocumentPacket(Base):
+    __tablename__ = 'document_packets'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    owner_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    property_id = Column(Integer, ForeignKey('properties.id', ondelete='CASCADE'), nullable=True)
+    filename = Column(String(255), nullable=True)
+    page_count = Column(Integer, nullable=False, default=0)
+    upload_date = Column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    documents = relationship('Document', back_populates='packet')
@@ -0,0 +1,22 @@
+# app/models/document_page.py
+
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey
+from sqlalchemy.orm import relationship
+from app.db.database import Base
+
+class DocumentPage(Base):
+    __tablename__ = 'document_pages'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    document_id = Column(Integer, ForeignKey('documents.id', ondelete='CASCADE'), nullable=False, index=True)
+    page_number = Column(Integer, nullable=False)
+    text_hash = Column(String(64), nullable=False)
+    image_hash = Column(String(16), nullable=True)
+    # SHA-256 of the full-resolution render of a scanned page; the 64-bit image_hash
+    # only finds candidates, since pages differing in a few digits share it
+    pixel_hash = Column(String(64), nullable=True)
+    is_ocr = Column(Boolean, default=False)
+    text = Column(Text, nullable=True)
+
+    # Relationships
+    document = relationship('Document', back_populates='pages')
@@ -0,0 +1,46 @@
+# app/models/document_telemetry.py
+
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Index
+from datetime import datetime
+from app.db.database import Base
+
+class DocumentTelemetry(Base):
+    """
+    One row per document run through an ingest pipeline. Stage durations are
+    NULL for stages the run did not reach, so they stay out of the percentiles.
+    """
+    __tablename__ = 'document_telemetry'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    owner_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    document_id = Column(Integer, ForeignKey('documents.id', ondelete='SET NULL'), nullable=True, index=True)
+    packet_id = Column(Integer, ForeignKey('document_packets.id', ondelete='SET NULL'), nullable=True)
+    document_type = Column(String(50), nullable=False)
+    file_type = Column(String(10), nullable=True)
+    bytes = Column(Integer, nullable=False, default=0)
+    pages = Column(Integer, nullable=False, default=0)
+    ocr_pages = Column(Integer, nullable=False, default=0)
+    text_layer_pages = Column(Integer, nullable=False, default=0)
+    reused_pages = Column(Integer, nullable=False, default=0)
+    read_ms = Column(Float, nullable=True)
+    ocr_ms = Column(Float, nullable=True)
+    classify_ms = Column(Float, nullable=True)
+    extract_ms = Column(Float, nullable=True)
+    map_ms = Column(Float, nullable=True)
+    db_ms = Column(Float, nullable=True)
+    total_ms = Column(Float, nullable=False)
+    llm_calls = Column(Integer, nullable=False, default=0)
+    llm_retries = Column(Integer, nullable=False, default=0)
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    cached_tokens = Column(Integer, nullable=False, default=0)
+    # 'processed', 'pending_extraction', 'duplicate', 'budget_exceeded', 'llm_unavailable', 'rejected' or 'failed'
+    outcome = Column(String(30), nullable=False)
+    error = Column(String(500), nullable=True)
+    # Extraction resumed by the worker after the provider came back
+    resumed = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('ix_document_telemetry_owner_created', 'owner_id', 'created_at'),
+    )
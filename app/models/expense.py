@@ -1,6 +1,6 @@
 # app/models/expense.py
 
-from sqlalchemy import Column, Integer, Float, Date, String, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, Float, Date, String, Text, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
@@ -28,3 +28,9 @@ class Expense(Base):
     vendor = relationship('Vendor', back_populates='expenses')
     invoice = relationship('Invoice', back_populates='expense')
     documents = relationship('Document', back_populates='expense')
+
+    # List filters: per property or vendor over a date range
+    __table_args__ = (
+        Index('ix_expenses_property_date', 'property_id', 'transaction_date'),
+        Index('ix_expenses_vendor_date', 'vendor_id', 'transaction_date'),
+    )
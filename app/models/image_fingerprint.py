@@ -0,0 +1,17 @@
+# app/models/image_fingerprint.py
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from datetime import datetime
+from app.db.database import Base
+
+class ImageFingerprint(Base):
+    __tablename__ = 'image_fingerprints'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    owner_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    invoice_id = Column(Integer, ForeignKey('invoices.id', ondelete='CASCADE'), nullable=True)
+    document_id = Column(Integer, ForeignKey('documents.id', ondelete='SET NULL'), nullable=True)
+    dhash = Column(String(16), nullable=False)
+    phash = Column(String(16), nullable=False)
+    filename = Column(String(255), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,6 +1,6 @@
 # app/models/income.py
 
-from sqlalchemy import Column, Integer, Float, Date, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, Float, Date, String, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
@@ -19,3 +19,8 @@ class Income(Base):
 
     # Relationships
     property = relationship('Property', back_populates='incomes')
+
+    # List filters: per property over a date range
+    __table_args__ = (
+        Index('ix_incomes_property_date', 'property_id', 'transaction_date'),
+    )
@@ -1,6 +1,6 @@
 # app/models/invoice/invoice.py
 
-from sqlalchemy import Column, Integer, Float, Date, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, Float, Date, String, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
@@ -31,3 +31,9 @@ class Invoice(Base):
         cascade='all, delete-orphan',
         lazy='joined'  # Eagerly load line_items
     )
+
+    # List filters: per property by due date, and unpaid/overdue by due date
+    __table_args__ = (
+        Index('ix_invoices_property_due', 'property_id', 'due_date'),
+        Index('ix_invoices_status_due', 'status', 'due_date'),
+    )
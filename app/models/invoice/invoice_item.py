@@ -8,7 +8,7 @@ class InvoiceItem(Base):
     __tablename__ = 'invoice_items'
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    invoice_id = Column(Integer, ForeignKey('invoices.id'), nullable=False)
+    invoice_id = Column(Integer, ForeignKey('invoices.id'), nullable=False, index=True)
     description = Column(String(255), nullable=False)
     quantity = Column(Float, default=1)
     unit_price = Column(Float, nullable=False)
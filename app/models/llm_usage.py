@@ -0,0 +1,39 @@
+# app/models/llm_usage.py
+
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Index
+from datetime import datetime
+from app.db.database import Base
+
+class LLMUsage(Base):
+    __tablename__ = 'llm_usage'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    owner_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    document_id = Column(Integer, ForeignKey('documents.id', ondelete='SET NULL'), nullable=True, index=True)
+    # Pipeline stage: 'classification', 'extraction' or 'intent'
+    stage = Column(String(30), nullable=False)
+    # Routed task, e.g. 'lease', 'invoice', 'classification'
+    task = Column(String(50), nullable=False)
+    model = Column(String(100), nullable=False)
+    tier = Column(String(20), nullable=True)
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    cached_tokens = Column(Integer, nullable=False, default=0)
+    cost = Column(Float, nullable=False, default=0.0)
+    latency_ms = Column(Integer, nullable=False, default=0)
+    success = Column(Boolean, nullable=False, default=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('ix_llm_usage_owner_created', 'owner_id', 'created_at'),
+    )
+
+class LLMBudget(Base):
+    __tablename__ = 'llm_budgets'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    owner_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, unique=True)
+    monthly_limit = Column(Float, nullable=False)
+    # Soft budgets only log a warning when exceeded
+    hard_limit = Column(Boolean, nullable=False, default=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
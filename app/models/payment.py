@@ -1,6 +1,6 @@
 # app/models/payment.py
 
-from sqlalchemy import Column, Integer, Float, Date, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, Float, Date, String, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
@@ -18,3 +18,9 @@ class Payment(Base):
 
     # Relationships
     lease = relationship('Lease', back_populates='payments')
+
+    # List filters: per lease over a date range, and overdue/pending by due date
+    __table_args__ = (
+        Index('ix_payments_lease_date', 'lease_id', 'payment_date'),
+        Index('ix_payments_status_due', 'status', 'due_date'),
+    )
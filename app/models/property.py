@@ -8,7 +8,7 @@ class Property(Base):
     __tablename__ = 'properties'
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)  # Auto-incrementing primary key
-    owner_id = Column(Integer, ForeignKey('users.id'), nullable=False)  # Foreign key to User model
+    owner_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)  # Foreign key to User model
     
     address = Column(String(255), nullable=False)
     num_bedrooms = Column(Integer, nullable=True)
@@ -22,13 +22,14 @@ class Property(Base):
     purchase_date = Column(Date, nullable=True)
     property_type = Column(String(50), nullable=True)
     
-    # Relationships with lazy loading using 'selectin'
-    owner = relationship('User', back_populates='properties', lazy='selectin')
-    leases = relationship('Lease', back_populates='property', lazy='selectin', cascade="all, delete-orphan")
-    expenses = relationship('Expense', back_populates='property', lazy='selectin', cascade="all, delete-orphan")
-    incomes = relationship('Income', back_populates='property', lazy='selectin', cascade="all, delete-orphan")
-    invoices = relationship('Invoice', back_populates='property', lazy='selectin', cascade="all, delete-orphan")
-    contracts = relationship('Contract', back_populates='property', lazy='selectin', cascade="all, delete-orphan")
-    documents = relationship('Document', back_populates='property', lazy='selectin', cascade="all, delete-orphan")
-    tenants = relationship('Tenant', back_populates='property', lazy='selectin', cascade="all, delete-orphan")
-    utilities = relationship('Utility', back_populates='property', lazy='selectin', cascade="all, delete-orphan")
\ No newline at end of file
+    # Never loaded implicitly: callers ask for the collections they need (selectinload),
+    # so ownership checks and lists only fetch the property row
+    owner = relationship('User', back_populates='properties', lazy='raise_on_sql')
+    leases = relationship('Lease', back_populates='property', lazy='raise_on_sql', cascade="all, delete-orphan")
+    expenses = relationship('Expense', back_populates='property', lazy='raise_on_sql', cascade="all, delete-orphan")
+    incomes = relationship('Income', back_populates='property', lazy='raise_on_sql', cascade="all, delete-orphan")
+    invoices = relationship('Invoice', back_populates='property', lazy='raise_on_sql', cascade="all, delete-orphan")
+    contracts = relationship('Contract', back_populates='property', lazy='raise_on_sql', cascade="all, delete-orphan")
+    documents = relationship('Document', back_populates='property', lazy='raise_on_sql', cascade="all, delete-orphan")
+    tenants = relationship('Tenant', back_populates='property', lazy='raise_on_sql', cascade="all, delete-orphan")
+    utilities = relationship('Utility', back_populates='property', lazy='raise_on_sql', cascade="all, delete-orphan")
@@ -8,7 +8,7 @@ class Tenant(Base):
     __tablename__ = 'tenants'
 
     id = Column(Integer, primary_key=True, index=True)
-    owner_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    owner_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
     property_id = Column(Integer, ForeignKey('properties.id', ondelete='CASCADE'), nullable=True)
     lease_id = Column(Integer, ForeignKey('leases.id', ondelete='CASCADE'), nullable=True)
     first_name = Column(String, nullable=False)
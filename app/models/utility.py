@@ -17,7 +17,7 @@ class Utility(Base):
     website = Column(String(255), nullable=True)
 
     # Foreign key linking directly to Property
-    property_id = Column(Integer, ForeignKey('properties.id'), nullable=False)
+    property_id = Column(Integer, ForeignKey('properties.id'), nullable=False, index=True)
 
     # Relationships
     property = relationship('Property', back_populates='utilities')
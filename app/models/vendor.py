@@ -8,7 +8,7 @@ class Vendor(Base):
     __tablename__ = 'vendors'
 
     id = Column(Integer, primary_key=True, index=True)
-    owner_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    owner_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
     name = Column(String(100), nullable=False)
     contact_person = Column(String(100), nullable=True)
     phone_number = Column(String(20), nullable=True)
@@ -1,19 +1,23 @@
 # app/schemas/__init__.py
 
 from .user import User, UserCreate, UserUpdate, UserMe
-from .property import Property, PropertyCreate, PropertyUpdate
+from .property import Property, PropertyCreate, PropertyUpdate, PropertyListItem
 from .utility import Utility, UtilityCreate, UtilityUpdate
 from .tenant import TenantCreate, TenantUpdate, TenantResponse
 from .lease import Lease, LeaseCreate, LeaseUpdate
-from .payment import Payment, PaymentCreate, PaymentUpdate
-from .expense import Expense, ExpenseCreate, ExpenseUpdate
-from .income import Income, IncomeCreate, IncomeUpdate
-from .invoice.invoice import Invoice, InvoiceCreate, InvoiceUpdate
+from .payment import Payment, PaymentCreate, PaymentUpdate, PaymentFilter
+from .expense import Expense, ExpenseCreate, ExpenseUpdate, ExpenseFilter
+from .income import Income, IncomeCreate, IncomeUpdate, IncomeFilter
+from .invoice.invoice import Invoice, InvoiceCreate, InvoiceUpdate, InvoiceFilter
 from .invoice.invoice_item import InvoiceItem, InvoiceItemCreate, InvoiceItemUpdate
 from .vendor import Vendor, VendorCreate, VendorUpdate
 from .contract import Contract, ContractCreate, ContractUpdate
-from .document import Document, DocumentCreate, DocumentUpdate, DocumentDeleteResponse
+from .document import Document, DocumentCreate, DocumentUpdate, DocumentDeleteResponse, DocumentRevision
+from .document_packet import DocumentPacket, PacketSegment
+from .llm_usage import LLMUsage, LLMUsageAggregate, LLMBudget, LLMBudgetUpdate
+from .document_telemetry import DocumentTelemetry, DocumentTelemetrySummary, StagePercentiles
 from .chat import ChatMessage, ChatResponse
+from .page import Page
 from .token import Token
 
 __all__ = [
@@ -24,6 +28,7 @@ __all__ = [
     "Property",
     "PropertyCreate",
     "PropertyUpdate",
+    "PropertyListItem",
     "Utility",
     "UtilityCreate",
     "UtilityUpdate",
@@ -36,15 +41,19 @@ __all__ = [
     "Payment",
     "PaymentCreate",
     "PaymentUpdate",
+    "PaymentFilter",
     "Expense",
     "ExpenseCreate",
     "ExpenseUpdate",
+    "ExpenseFilter",
     "Income",
     "IncomeCreate",
     "IncomeUpdate",
+    "IncomeFilter",
     "Invoice",
     "InvoiceCreate",
     "InvoiceUpdate",
+    "InvoiceFilter",
     "InvoiceItem",
     "InvoiceItemCreate",
     "InvoiceItemUpdate",
@@ -58,7 +67,18 @@ __all__ = [
     "DocumentCreate",
     "DocumentUpdate",
     "DocumentDeleteResponse",
+    "DocumentRevision",
+    "DocumentPacket",
+    "PacketSegment",
+    "LLMUsage",
+    "LLMUsageAggregate",
+    "LLMBudget",
+    "LLMBudgetUpdate",
+    "DocumentTelemetry",
+    "DocumentTelemetrySummary",
+    "StagePercentiles",
     "Token",
     "ChatMessage", 
-    "ChatResponse"
+    "ChatResponse",
+    "Page"
 ]
\ No newline at end of file
@@ -1,7 +1,7 @@
 # app/schemas/document.py
 
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 from app.schemas.property_summary import PropertySummary
 from app.schemas.lease_summary import LeaseSummary
@@ -16,8 +16,10 @@ class DocumentBase(BaseModel):
     expense_id: Optional[int] = None
     invoice_id: Optional[int] = None
     contract_id: Optional[int] = None
+    packet_id: Optional[int] = None
     document_type: str    
     description: Optional[str] = None
+    prompt_version: Optional[str] = None
 
 class DocumentCreate(DocumentBase):
     pass
@@ -35,6 +37,7 @@ class DocumentUpdate(BaseModel):
 class DocumentInDBBase(DocumentBase):
     id: int
     upload_date: datetime
+    status: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -49,4 +52,13 @@ class Document(DocumentInDBBase):
 
 class DocumentDeleteResponse(BaseModel):
     id: int
-    message: str
\ No newline at end of file
+    message: str
+
+class DocumentRevision(BaseModel):
+    document_id: int
+    page_count: int
+    reused_ocr_pages: int = 0
+    changed_pages: List[int] = []
+    removed_pages: List[int] = []
+    updated_fields: List[str] = []
+    diff: str = ""
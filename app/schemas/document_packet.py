@@ -0,0 +1,24 @@
+# app/schemas/document_packet.py
+
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, List
+from datetime import datetime
+
+class PacketSegment(BaseModel):
+    document_type: str
+    start_page: int
+    end_page: int
+    record_id: Optional[int] = None
+    # Set when the segment was stored for extraction once the model provider recovers
+    pending_document_id: Optional[int] = None
+    error: Optional[str] = None
+
+class DocumentPacket(BaseModel):
+    id: int
+    property_id: Optional[int] = None
+    filename: Optional[str] = None
+    page_count: int
+    upload_date: datetime
+    segments: List[PacketSegment] = []
+
+    model_config = ConfigDict(from_attributes=True)
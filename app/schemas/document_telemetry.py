@@ -0,0 +1,49 @@
+# app/schemas/document_telemetry.py
+
+from pydantic import BaseModel, ConfigDict
+from typing import Dict, Optional
+from datetime import datetime
+
+class DocumentTelemetry(BaseModel):
+    id: int
+    document_id: Optional[int] = None
+    packet_id: Optional[int] = None
+    document_type: str
+    file_type: Optional[str] = None
+    bytes: int
+    pages: int
+    ocr_pages: int
+    text_layer_pages: int
+    reused_pages: int
+    read_ms: Optional[float] = None
+    ocr_ms: Optional[float] = None
+    classify_ms: Optional[float] = None
+    extract_ms: Optional[float] = None
+    map_ms: Optional[float] = None
+    db_ms: Optional[float] = None
+    total_ms: float
+    llm_calls: int
+    llm_retries: int
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    outcome: str
+    error: Optional[str] = None
+    resumed: bool
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class StagePercentiles(BaseModel):
+    p50_ms: Optional[float] = None
+    p95_ms: Optional[float] = None
+
+class DocumentTelemetrySummary(BaseModel):
+    document_type: str
+    documents: int
+    outcomes: Dict[str, int]
+    avg_pages: float
+    avg_ocr_pages: float
+    avg_llm_retries: float
+    avg_tokens: float
+    stages: Dict[str, StagePercentiles]
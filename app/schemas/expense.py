@@ -1,7 +1,7 @@
 # app/schemas/expense.py
 
 from pydantic import BaseModel, ConfigDict
-from typing import Optional, List
+from typing import Optional, List, Literal
 from datetime import date
 from app.schemas.property_summary import PropertySummary
 from app.schemas.vendor_summary import VendorSummary
@@ -47,3 +47,15 @@ class Expense(ExpenseInDBBase):
     vendor: Optional[VendorSummary] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+class ExpenseFilter(BaseModel):
+    """
+    ?-parameters of the expense list. Dates are inclusive; sort takes a leading
+    "-" for descending order.
+    """
+    property_id: Optional[int] = None
+    vendor_id: Optional[int] = None
+    category: Optional[str] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    sort: Optional[Literal["transaction_date", "-transaction_date", "amount", "-amount"]] = None
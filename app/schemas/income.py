@@ -1,7 +1,7 @@
 # app/schemas/income.py
 
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import Optional, Literal
 from datetime import date
 from app.schemas.property_summary import PropertySummary
 
@@ -37,3 +37,14 @@ class Income(IncomeInDBBase):
     property: PropertySummary
 
     model_config = ConfigDict(from_attributes=True)
+
+class IncomeFilter(BaseModel):
+    """
+    ?-parameters of the income list. Dates are inclusive; sort takes a leading
+    "-" for descending order.
+    """
+    property_id: Optional[int] = None
+    category: Optional[str] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    sort: Optional[Literal["transaction_date", "-transaction_date", "amount", "-amount"]] = None
@@ -1,7 +1,7 @@
 # app/schemas/invoice/invoice.py
 
 from pydantic import BaseModel, ConfigDict
-from typing import Optional, List
+from typing import Optional, List, Literal
 from datetime import date
 from app.schemas.invoice.invoice_item import InvoiceItem, InvoiceItemCreate
 
@@ -47,3 +47,20 @@ class Invoice(InvoiceInDBBase):
     line_items: Optional[List[InvoiceItem]] = []  
 
     model_config = ConfigDict(from_attributes=True)
+
+class InvoiceFilter(BaseModel):
+    """
+    ?-parameters of the invoice list. Dates (invoice_date, due_date) are
+    inclusive; sort takes a leading "-" for descending order.
+    """
+    property_id: Optional[int] = None
+    vendor_id: Optional[int] = None
+    status: Optional[str] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    due_from: Optional[date] = None
+    due_to: Optional[date] = None
+    sort: Optional[Literal[
+        "invoice_date", "-invoice_date", "due_date", "-due_date",
+        "amount", "-amount", "remaining_balance", "-remaining_balance"
+    ]] = None
@@ -0,0 +1,40 @@
+# app/schemas/llm_usage.py
+
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from datetime import datetime
+
+class LLMUsage(BaseModel):
+    id: int
+    document_id: Optional[int] = None
+    stage: str
+    task: str
+    model: str
+    tier: Optional[str] = None
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    cost: float
+    latency_ms: int
+    success: bool
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class LLMUsageAggregate(BaseModel):
+    key: Optional[str] = None
+    calls: int
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    cost: float
+    avg_latency_ms: float
+
+class LLMBudgetUpdate(BaseModel):
+    monthly_limit: float
+    hard_limit: bool = True
+
+class LLMBudget(BaseModel):
+    monthly_limit: Optional[float] = None
+    hard_limit: bool = True
+    month_to_date_cost: float = 0.0
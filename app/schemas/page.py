@@ -0,0 +1,18 @@
+# app/schemas/page.py
+
+from pydantic import BaseModel, ConfigDict
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+class Page(BaseModel, Generic[T]):
+    """
+    A page of a cursor-paginated list. Pass `next_cursor` as ?cursor= to get the
+    next page; it is null on the last page.
+    """
+    items: List[T]
+    next_cursor: Optional[str] = None
+    # The planner's row estimate for the whole list, with ?include_total=true
+    total_estimate: Optional[int] = None
+
+    model_config = ConfigDict(from_attributes=True)
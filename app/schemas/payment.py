@@ -1,7 +1,7 @@
 # app/schemas/payment.py
 
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import Optional, Literal
 from datetime import date
 from app.schemas.lease_summary import LeaseSummary
 
@@ -34,3 +34,17 @@ class Payment(PaymentInDBBase):
     lease: LeaseSummary
 
     model_config = ConfigDict(from_attributes=True)
+
+class PaymentFilter(BaseModel):
+    """
+    ?-parameters of the payment list. Dates (payment_date, due_date) are
+    inclusive; sort takes a leading "-" for descending order.
+    """
+    property_id: Optional[int] = None
+    lease_id: Optional[int] = None
+    status: Optional[str] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    due_from: Optional[date] = None
+    due_to: Optional[date] = None
+    sort: Optional[Literal["payment_date", "-payment_date", "due_date", "-due_date", "amount", "-amount"]] = None
@@ -46,6 +46,20 @@ class PropertyInDBBase(PropertyBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+class PropertyListItem(PropertyInDBBase):
+    """
+    A property's own fields. Child collections are only filled (and serialized)
+    when requested with ?expand=.
+    """
+    owner: Optional[UserSummary] = None
+    leases: Optional[List[LeaseSummary]] = None
+    expenses: Optional[List[ExpenseSummary]] = None
+    incomes: Optional[List[IncomeSummary]] = None
+    invoices: Optional[List[InvoiceSummary]] = None
+    contracts: Optional[List[ContractSummary]] = None
+    documents: Optional[List[DocumentSummary]] = None
+    utilities: Optional[List[UtilitySummary]] = None
+
 class Property(PropertyInDBBase):
     owner: UserSummary    
     leases: Optional[List[LeaseSummary]] = []
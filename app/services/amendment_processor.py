@@ -0,0 +1,201 @@
+# app/services/amendment_processor.py
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+from typing import List
+from app import schemas, crud
+from app.services.document_processor import PAGE_BREAK, ExtractedPage, extract_page_records_from_file
+from app.services.field_retrieval import is_missing
+from app.services.openai.openai_document import OpenAIService
+from app.services.mapping_functions import parse_json, map_lease_data, map_contract_data
+from app.db.database import release_connection
+from app.services.usage_accounting import enforce_budget, save_usage
+from app.utils.timing import log_timing
+from io import BytesIO
+import difflib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+LEASE_MERGE_FIELDS = [
+    "lease_type",
+    "description",
+    "rent_amount_total",
+    "rent_amount_monthly",
+    "security_deposit_amount",
+    "security_deposit_held_by",
+    "start_date",
+    "end_date",
+    "payment_frequency",
+]
+
+CONTRACT_MERGE_FIELDS = [
+    "contract_type",
+    "description",
+    "start_date",
+    "end_date",
+    "parties_involved",
+]
+
+def page_key(page) -> str:
+    """
+    Identifies a page by its text layer, or by its exact rendered pixels for scanned
+    pages (which all share the hash of an empty text layer). Pages stored before
+    pixel hashes were kept have none and always count as changed.
+    """
+    return page.pixel_hash if page.is_ocr else page.text_hash
+
+def has_value(value) -> bool:
+    return not is_missing(value) and value != 0.0
+
+def merge_json(existing: dict, updates: dict) -> dict:
+    """
+    Recursively merges extracted values into existing JSON, ignoring missing values.
+    """
+    merged = dict(existing or {})
+    for key, value in (updates or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_json(merged[key], value)
+        elif has_value(value):
+            merged[key] = value
+    return merged
+
+def build_diff(old_pages: list, new_pages: List[ExtractedPage]) -> str:
+    old_lines = []
+    for page in old_pages:
+        old_lines.extend(f"[page {page.page_number}] {line}" for line in (page.text or "").splitlines())
+    new_lines = []
+    for page in new_pages:
+        new_lines.extend(f"[page {page.page_number}] {line}" for line in (page.text or "").splitlines())
+    return "\n".join(difflib.unified_diff(
+        old_lines,
+        new_lines,
+        fromfile="previous",
+        tofile="amended",
+        lineterm=""
+    ))
+
+def merge_lease(lease, mapped_data: dict) -> List[str]:
+    updated = []
+    for field in LEASE_MERGE_FIELDS:
+        value = mapped_data.get(field)
+        if has_value(value) and getattr(lease, field) != value:
+            setattr(lease, field, value)
+            updated.append(field)
+    for field in ("tenant_info", "special_lease_terms"):
+        # Dates inside the JSON columns are stored as strings
+        updates = json.loads(json.dumps(mapped_data.get(field) or {}, default=str))
+        merged = merge_json(getattr(lease, field), updates)
+        if merged != (getattr(lease, field) or {}):
+            setattr(lease, field, merged)
+            updated.append(field)
+    return updated
+
+def merge_contract(contract, mapped_data: dict) -> List[str]:
+    updated = []
+    for field in CONTRACT_MERGE_FIELDS:
+        value = mapped_data.get(field)
+        if has_value(value) and getattr(contract, field) != value:
+            setattr(contract, field, value)
+            updated.append(field)
+    merged_terms = merge_json(contract.terms, mapped_data.get("terms"))
+    if merged_terms != (contract.terms or {}):
+        contract.terms = merged_terms
+        updated.append("terms")
+    return updated
+
+@log_timing("Amended Document Processing")
+async def process_document_reupload(
+    file_content: bytes,
+    filename: str,
+    document_id: int,
+    db: AsyncSession,
+    owner_id: int,
+    diff_only: bool = False
+) -> schemas.DocumentRevision:
+    """
+    Compares a re-uploaded PDF with the stored page fingerprints of a document.
+    OCR text of unchanged scanned pages is reused, only changed pages are sent for
+    extraction, and the extracted values are merged into the existing lease or contract.
+
+    Args:
+        file_content (bytes): The amended file.
+        filename (str): Name of the amended file.
+        document_id (int): The document being amended.
+        db (AsyncSession): The database session.
+        owner_id (int): The owner of the document.
+        diff_only (bool): Only compute the diff; do not re-extract or update records.
+
+    Returns:
+        DocumentRevision: The page-level changes, updated fields and a text diff.
+    """
+    document = await crud.crud_document.get_document_with_pages(
+        db=db,
+        document_id=document_id,
+        owner_id=owner_id
+    )
+    if not document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found or you do not have access to this document."
+        )
+    if not document.pages:
+        raise ValueError("This document has no stored pages to compare against.")
+
+    known_ocr_pages = {}
+    for page in document.pages:
+        if page.is_ocr and page.image_hash and page.pixel_hash:
+            known_ocr_pages.setdefault(page.image_hash, {})[page.pixel_hash] = page.text
+    new_pages = extract_page_records_from_file(BytesIO(file_content), filename, known_ocr_pages=known_ocr_pages)
+    if not new_pages:
+        raise ValueError("Could not extract pages from the document. Only PDF files can be compared.")
+
+    old_keys = {page_key(page) for page in document.pages}
+    new_keys = {page_key(page) for page in new_pages}
+    changed_pages = [page for page in new_pages if page_key(page) not in old_keys]
+    removed_pages = [page.page_number for page in document.pages if page_key(page) not in new_keys]
+
+    revision = schemas.DocumentRevision(
+        document_id=document.id,
+        page_count=len(new_pages),
+        reused_ocr_pages=sum(1 for page in new_pages if page.reused),
+        changed_pages=[page.page_number for page in changed_pages],
+        removed_pages=removed_pages,
+        diff=build_diff(document.pages, new_pages)
+    )
+    logger.info(
+        f"Document {document.id} re-upload: {len(changed_pages)} changed, "
+        f"{len(removed_pages)} removed, {revision.reused_ocr_pages} OCR pages reused"
+    )
+    if diff_only:
+        return revision
+
+    changed_text = PAGE_BREAK.join(page.text for page in changed_pages).strip()
+    if changed_text:
+        if document.lease is not None:
+            document_type, target, mapper, merger = "lease", document.lease, map_lease_data, merge_lease
+        elif document.contract is not None:
+            document_type, target, mapper, merger = "contract", document.contract, map_contract_data, merge_contract
+        else:
+            raise ValueError("Only lease and contract documents can be re-extracted.")
+
+        await enforce_budget(db, owner_id)
+        # Don't hold a pooled connection through the model call
+        await release_connection(db)
+        openai_service = OpenAIService()
+        try:
+            extracted_data = await openai_service.extract_information(changed_text, document_type)
+        finally:
+            # Kept even if the re-upload's transaction is rolled back
+            await save_usage(owner_id, "extraction", openai_service.usage, document_id=document.id)
+        if not extracted_data:
+            raise ValueError("Could not extract information from the changed pages.")
+
+        parsed_data = parse_json(json.dumps(extracted_data))
+        revision.updated_fields = merger(target, mapper(parsed_data))
+        document.prompt_version = openai_service.last_prompt_version
+
+    crud.crud_document.replace_pages(document, new_pages)
+    await db.commit()
+    return revision
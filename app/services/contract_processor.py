@@ -2,41 +2,87 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
+from typing import Optional
 from app import schemas, crud
-from app.services.document_processor import extract_text_from_file
+from app.services.document_processor import extract_text_and_pages
 from app.services.openai.openai_document import OpenAIService
+from app.services.openai.circuit_breaker import LLMUnavailableError
+from app.services.pending_extraction import ExtractionPendingError, defer_extraction
+from app.services.pipeline_telemetry import track_document
+from app.core.access import owns_property
+from app.db.database import release_connection
+from app.services.usage_accounting import BudgetExceededError, enforce_budget, link_usage, save_usage
+from app.utils.related import attach_related
+from app.utils.timing import begin_stage, label_stage_timer
 from app.services.mapping_functions import parse_json, map_contract_data
-from io import BytesIO
 import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+@track_document
 async def process_contract_upload(
     file_content: bytes,
     filename: str,
     property_id: int,
     document_type: str,
     db: AsyncSession,
-    owner_id: int
+    owner_id: int,
+    text: Optional[str] = None,
+    packet_id: Optional[int] = None,
+    document_id: Optional[int] = None
 ):
     try:
-        # Extract text from the file
-        file_like = BytesIO(file_content)
-        text = extract_text_from_file(file_like, filename)
+        # Extract text from the file unless it was already extracted (e.g. a packet segment)
+        pages = None
+        if text is None:
+            text, pages = extract_text_and_pages(file_content, filename)
         if not text:
             raise ValueError("Could not extract text from the document.")
 
+        await enforce_budget(db, owner_id)
+        # Don't hold a pooled connection through the model call
+        await release_connection(db)
+
         # Initialize OpenAIService
         openai_service = OpenAIService()
-        extracted_data = await openai_service.extract_information(text, document_type)
+        try:
+            extracted_data = await openai_service.extract_information(text, document_type)
+        except LLMUnavailableError:
+            # Resumed extractions go back to the queue; new uploads are kept as pending documents
+            if document_id is not None:
+                await save_usage(owner_id, "extraction", openai_service.usage, document_id=document_id)
+                raise
+            raise await defer_extraction(
+                db=db,
+                owner_id=owner_id,
+                property_id=property_id,
+                document_type=document_type,
+                text=text,
+                pages=pages,
+                packet_id=packet_id,
+                usage=openai_service.usage
+            )
 
+        # Paid for whether or not the transaction below commits
+        usage_ids = await save_usage(owner_id, "extraction", openai_service.usage, document_id=document_id)
         if not extracted_data:
             raise ValueError("Could not extract information from the document.")
 
         # Parse and map data
+        begin_stage("map")
         parsed_data = parse_json(json.dumps(extracted_data))
         mapped_data = map_contract_data(parsed_data)
+        begin_stage("db")
+
+        # Everything below is one transaction: the CRUD calls only flush, and a failure
+        # before the commit leaves no partial rows (the session's rollback drops them).
+        # Ownership resolved here is remembered for the session, so the CRUD calls' checks are free.
+        if not await owns_property(db, owner_id, property_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Property not found or you do not have permission to access this property."
+            )
 
         # Extract vendor_info if present
         vendor_info = mapped_data.get('vendor_info', None)
@@ -59,7 +105,8 @@ async def process_contract_upload(
                 vendor = await crud.crud_vendor.create_vendor(
                     db=db,
                     vendor_in=vendor_in,
-                    owner_id=owner_id
+                    owner_id=owner_id,
+                    commit=False
                 )
                 vendor_id = vendor.id
 
@@ -85,7 +132,8 @@ async def process_contract_upload(
             contract = await crud.crud_contract.create_contract(
                 db=db,
                 contract_in=contract_in,
-                owner_id=owner_id
+                owner_id=owner_id,
+                commit=False
             )
             contract_id = contract.id
             logger.info("Created contract with ID: %s", contract_id)
@@ -101,28 +149,34 @@ async def process_contract_upload(
             property_id=property_id,
             contract_id=contract_id,
             document_type=document_type,
-            description=mapped_data.get('description', None)
+            description=mapped_data.get('description', None),
+            packet_id=packet_id,
+            prompt_version=openai_service.last_prompt_version
         )
 
-        document = await crud.crud_document.create_document(
-            db=db,
-            document_in=document_in,
-            owner_id=owner_id
-        )
+        if document_id is not None:
+            document = await crud.crud_document.complete_pending_document(
+                db=db,
+                document_id=document_id,
+                document_in=document_in,
+                commit=False
+            )
+        else:
+            document = await crud.crud_document.create_document(
+                db=db,
+                document_in=document_in,
+                owner_id=owner_id,
+                commit=False
+            )
         logger.info("Created document with ID: %s", document.id)
+        if pages:
+            crud.crud_document.add_pages(db=db, document_id=document.id, pages=pages)
+        await link_usage(db, usage_ids, document.id)
+        label_stage_timer("document_id", document.id)
+        await db.commit()
 
-        # Re-fetch the contract with relationships eagerly loaded
-        contract = await crud.crud_contract.get_contract(
-            db=db,
-            contract_id=contract_id,
-            owner_id=owner_id
-        )
-
-        if not contract:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Contract not found or you do not have access to this contract."
-            )
+        # The property and vendor were loaded above, so this reads the identity map
+        await attach_related(db, contract, "property", "vendor")
 
         # Map to Pydantic schema before returning
         try:
@@ -135,6 +189,8 @@ async def process_contract_upload(
                 detail="An error occurred while serializing the contract data."
             )
 
+    except (ExtractionPendingError, LLMUnavailableError, BudgetExceededError):
+        raise
     except Exception as e:
         logger.error(f"Unexpected error during contract upload: {e}")
         raise HTTPException(
@@ -1,11 +1,17 @@
 # app/services/document_processor.py
 
 import logging
-from typing import Optional, Union
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
 from io import BytesIO
 from abc import ABC, abstractmethod
+from functools import lru_cache
 import os
-from app.utils.timing import log_timing
+from app.utils.timing import log_timing, count_stage
+from app.utils.metrics import OCR_DURATION, OCR_IN_PROGRESS
+from app.utils.perceptual_hash import dhash, hash_to_hex
+from app.utils.tracing import span
 
 # Import necessary modules
 from PIL import Image, UnidentifiedImageError
@@ -20,8 +26,15 @@ import numpy as np
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
-# Initialize EasyOCR reader once to avoid overhead
-EASYOCR_READER = easyocr.Reader(['en'], gpu=False)  # Set gpu=True if you have a GPU
+# Separates the pages of multi-page text, so passage splitting (field_retrieval)
+# can break on page boundaries
+PAGE_BREAK = "\f"
+
+# Initialize EasyOCR reader once to avoid overhead. Created on first use: it loads
+# (and on a fresh machine downloads) its models, which importing the app must not do
+@lru_cache(maxsize=1)
+def get_easyocr_reader() -> easyocr.Reader:
+    return easyocr.Reader(['en'], gpu=False)  # Set gpu=True if you have a GPU
 
 class BaseDocumentProcessor(ABC):
     def __init__(self, file: Union[BytesIO, 'File'], filename: str):
@@ -32,11 +45,24 @@ class BaseDocumentProcessor(ABC):
     def extract_text(self) -> Optional[str]:
         pass
 
+    def load_image(self) -> Optional[Image.Image]:
+        """
+        Returns an image of the document (the first page for scanned PDFs) for
+        fingerprinting, or None for file types without one.
+        """
+        return None
+
 class ImageProcessor(BaseDocumentProcessor):
+    def load_image(self) -> Optional[Image.Image]:
+        return Image.open(self.file).convert('RGB')
+
     def extract_text(self) -> Optional[str]:
         try:
-            image = Image.open(self.file).convert('RGB')
-            text = pytesseract.image_to_string(image)
+            image = self.load_image()
+            count_stage("pages")
+            count_stage("ocr_pages")
+            with span("ocr.image"), OCR_IN_PROGRESS.track_inprogress(), OCR_DURATION.time():
+                text = pytesseract.image_to_string(image)
             return text.strip() or None
         except UnidentifiedImageError as e:
             logger.error(f"Unable to open image file: {self.filename}. Error: {e}")
@@ -45,68 +71,172 @@ class ImageProcessor(BaseDocumentProcessor):
         return None
 
 class HEICProcessor(BaseDocumentProcessor):
+    def load_image(self) -> Optional[Image.Image]:
+        heif_file = pyheif.read(self.file.read())
+        return Image.frombytes(
+            heif_file.mode,
+            heif_file.size,
+            heif_file.data,
+            "raw",
+            heif_file.mode,
+            heif_file.stride,
+        ).convert('RGB')
+
     def extract_text(self) -> Optional[str]:
         try:
-            heif_file = pyheif.read(self.file.read())
-            image = Image.frombytes(
-                heif_file.mode,
-                heif_file.size,
-                heif_file.data,
-                "raw",
-                heif_file.mode,
-                heif_file.stride,
-            ).convert('RGB')
-            text = pytesseract.image_to_string(image)
+            image = self.load_image()
+            count_stage("pages")
+            count_stage("ocr_pages")
+            with span("ocr.image"), OCR_IN_PROGRESS.track_inprogress(), OCR_DURATION.time():
+                text = pytesseract.image_to_string(image)
             return text.strip() or None
         except Exception as e:
             logger.error(f"Unable to process HEIC file: {self.filename}. Error: {e}")
         return None
 
+@dataclass
+class ExtractedPage:
+    page_number: int
+    text: str
+    is_ocr: bool = False
+    text_hash: Optional[str] = None
+    image_hash: Optional[str] = None
+    # Exact hash of the full-resolution render of a scanned page
+    pixel_hash: Optional[str] = None
+    reused: bool = False
+
 class PDFProcessor(BaseDocumentProcessor):
+    def load_image(self) -> Optional[Image.Image]:
+        with fitz.open(stream=self.file.read(), filetype="pdf") as doc:
+            if doc.page_count == 0:
+                return None
+            # Generated PDFs share their template's layout; only scans are fingerprinted
+            if doc[0].get_text().strip():
+                return None
+            # Half resolution is plenty for a 32x32 hash thumbnail
+            pix = doc[0].get_pixmap(matrix=fitz.Matrix(0.5, 0.5))
+            return Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+
     def extract_text(self) -> Optional[str]:
-        text = ""
+        pages = self.extract_pages()
+        if pages is None:
+            return None
+        return PAGE_BREAK.join(pages).strip() or None
+
+    def extract_pages(self) -> Optional[List[str]]:
+        """
+        Extracts the text of every page, falling back to OCR for pages without a text layer.
+        Pages that could not be read are returned as empty strings so page numbers stay aligned.
+        """
+        records = self.extract_page_records()
+        if records is None:
+            return None
+        return [record.text for record in records]
+
+    def extract_page_records(
+        self,
+        fingerprint: bool = False,
+        known_ocr_pages: Optional[Dict[str, Dict[str, str]]] = None
+    ) -> Optional[List[ExtractedPage]]:
+        """
+        Extracts every page as an ExtractedPage.
+
+        Args:
+            fingerprint (bool): Compute a hash of the text layer and a perceptual hash
+                of the rendered page for each page, and an exact pixel hash for scanned pages.
+            known_ocr_pages (Dict[str, Dict[str, str]], optional): OCR text of previously
+                seen pages keyed by perceptual hash, then by pixel hash. Scanned pages
+                matching both reuse this text instead of being OCRed again.
+
+        Returns:
+            Optional[List[ExtractedPage]]: The pages, or None if the PDF could not be read.
+        """
+        records = []
         try:            
             with fitz.open(stream=self.file.read(), filetype="pdf") as doc:                
                 for page_number, page in enumerate(doc, start=1):
-                    # Try normal text extraction first
-                    page_text = page.get_text()
-                    
-                    if not page_text.strip():
-                        # If no text found, try EasyOCR first
-                        pix = page.get_pixmap()
-                        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)                        
-                        
-                        try:
-                            page_text = pytesseract.image_to_string(img)
-                        except Exception as e:
-                            logger.error(f"Tesseract OCR failed for page {page_number}, trying EasyOCR: {e}")
-                            try:
-                                # Convert to numpy array for EasyOCR
-                                img_array = np.array(img)
-                                ocr_text = EASYOCR_READER.readtext(
-                                    img_array,
-                                    detail=0,
-                                    paragraph=True,
-                                    width_ths=0.7
-                                )
-                                page_text = "\n".join(ocr_text) if ocr_text else "" 
-                            except Exception as e:
-                                logger.error(f"EasyOCR failed for page {page_number}. Error: {e}")
-                                continue
-
-                    text += page_text + "\n"
-                    
-            return text.strip() or None
+                    records.append(
+                        self._extract_page(page, page_number, fingerprint, known_ocr_pages or {})
+                    )
+            return records
             
         except Exception as e:
             logger.error(f"Error processing PDF file: {self.filename}. Error: {e}")
             return None
 
+    def _extract_page(
+        self,
+        page,
+        page_number: int,
+        fingerprint: bool,
+        known_ocr_pages: Dict[str, Dict[str, str]]
+    ) -> ExtractedPage:
+        # Try normal text extraction first
+        page_text = page.get_text()
+        record = ExtractedPage(page_number=page_number, text=page_text)
+        if fingerprint:
+            record.text_hash = hashlib.sha256(page_text.encode("utf-8")).hexdigest()
+        
+        count_stage("pages")
+        if page_text.strip():
+            count_stage("text_layer_pages")
+            if fingerprint:
+                # A low-resolution render is enough for the perceptual hash
+                pix = page.get_pixmap(matrix=fitz.Matrix(0.25, 0.25))
+                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+                record.image_hash = hash_to_hex(dhash(img))
+            return record
+
+        # If no text found, render the page for OCR
+        pix = page.get_pixmap()
+        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)                        
+        record.is_ocr = True
+        if fingerprint or known_ocr_pages:
+            record.image_hash = hash_to_hex(dhash(img))
+            # The perceptual hash only finds candidates: a 9x8 thumbnail does not see
+            # an edited figure, so the text is reused only for an identical render
+            record.pixel_hash = hashlib.sha256(pix.samples).hexdigest()
+            known_text = known_ocr_pages.get(record.image_hash, {}).get(record.pixel_hash)
+            if known_text is not None:
+                record.text = known_text
+                record.reused = True
+                count_stage("reused_pages")
+                return record
+        count_stage("ocr_pages")
+        record.text = self._ocr_image(img, page_number)
+        return record
+
+    def _ocr_image(self, img: Image.Image, page_number: int) -> str:
+        with span("ocr.page", {"ocr.page_number": page_number}), \
+                OCR_IN_PROGRESS.track_inprogress(), OCR_DURATION.time():
+            return self._run_ocr(img, page_number)
+
+    def _run_ocr(self, img: Image.Image, page_number: int) -> str:
+        try:
+            return pytesseract.image_to_string(img)
+        except Exception as e:
+            logger.error(f"Tesseract OCR failed for page {page_number}, trying EasyOCR: {e}")
+            try:
+                # Convert to numpy array for EasyOCR
+                img_array = np.array(img)
+                ocr_text = get_easyocr_reader().readtext(
+                    img_array,
+                    detail=0,
+                    paragraph=True,
+                    width_ths=0.7
+                )
+                return "\n".join(ocr_text) if ocr_text else "" 
+            except Exception as e:
+                logger.error(f"EasyOCR failed for page {page_number}. Error: {e}")
+                return ""
+
 class DOCXProcessor(BaseDocumentProcessor):
     def extract_text(self) -> Optional[str]:
         text = ""
         try:
             doc = Document(self.file)
+            count_stage("pages")
+            count_stage("text_layer_pages")
             for paragraph in doc.paragraphs:
                 text += paragraph.text + "\n"
             return text.strip() or None
@@ -133,7 +263,7 @@ def get_processor(file: Union[BytesIO, 'File'], filename: str) -> Optional[BaseD
         logger.warning(f"Unsupported file type: {file_extension}")
         return None
 
-@log_timing("OCR Text Extraction")
+@log_timing("OCR Text Extraction", stage="ocr")
 def extract_text_from_file(file: Union[BytesIO, 'File'], filename: str) -> Optional[str]:
     processor = get_processor(file, filename)
     if not processor:
@@ -146,3 +276,70 @@ def extract_text_from_file(file: Union[BytesIO, 'File'], filename: str) -> Optio
         return None
 
     return text
+
+@log_timing("OCR Page Extraction", stage="ocr")
+def extract_pages_from_file(file: Union[BytesIO, 'File'], filename: str) -> Optional[List[str]]:
+    """
+    Extracts text page by page. Non-PDF files are returned as a single page.
+    """
+    processor = get_processor(file, filename)
+    if not processor:
+        logger.error(f"No processor available for file: {filename}")
+        return None
+
+    if isinstance(processor, PDFProcessor):
+        pages = processor.extract_pages()
+    else:
+        text = processor.extract_text()
+        pages = [text] if text else None
+
+    if not pages or not any(page.strip() for page in pages):
+        logger.warning(f"No text extracted from file: {filename}")
+        return None
+
+    return pages
+
+@log_timing("OCR Page Fingerprinting", stage="ocr")
+def extract_page_records_from_file(
+    file: Union[BytesIO, 'File'],
+    filename: str,
+    known_ocr_pages: Optional[Dict[str, Dict[str, str]]] = None
+) -> Optional[List[ExtractedPage]]:
+    """
+    Extracts fingerprinted pages from a PDF. Returns None for other file types.
+    """
+    processor = get_processor(file, filename)
+    if not isinstance(processor, PDFProcessor):
+        return None
+    return processor.extract_page_records(fingerprint=True, known_ocr_pages=known_ocr_pages)
+
+def extract_text_and_pages(file_content: bytes, filename: str) -> Tuple[Optional[str], Optional[List[ExtractedPage]]]:
+    """
+    Extracts the text of an upload. PDFs are also fingerprinted page by page so that
+    a later re-upload of an amended version can reuse unchanged pages.
+
+    Returns:
+        Tuple[Optional[str], Optional[List[ExtractedPage]]]: The text and, for PDFs, the pages.
+    """
+    if os.path.splitext(filename)[1].lower() != ".pdf":
+        return extract_text_from_file(BytesIO(file_content), filename), None
+
+    pages = extract_page_records_from_file(BytesIO(file_content), filename)
+    if not pages:
+        return None, None
+    text = PAGE_BREAK.join(page.text for page in pages).strip()
+    return text or None, pages
+
+def load_image_from_file(file: Union[BytesIO, 'File'], filename: str) -> Optional[Image.Image]:
+    """
+    Loads an image of an upload without running OCR. Returns None if the file
+    type has no image or the file could not be read.
+    """
+    processor = get_processor(file, filename)
+    if not processor:
+        return None
+    try:
+        return processor.load_image()
+    except Exception as e:
+        logger.error(f"Unable to load image from file: {filename}. Error: {e}")
+        return None
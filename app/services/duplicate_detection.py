@@ -0,0 +1,186 @@
+# app/services/duplicate_detection.py
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from io import BytesIO
+from typing import Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.config import settings
+from app.services.document_processor import load_image_from_file
+from app.utils.perceptual_hash import BKTree, dhash, phash, hash_to_hex, hamming_distance
+
+logger = logging.getLogger(__name__)
+
+
+class DuplicateDocumentError(ValueError):
+    """
+    Raised when an upload is a near-duplicate of an image the owner already uploaded.
+    """
+
+    def __init__(self, fingerprint_id: int, invoice_id: Optional[int], document_id: Optional[int], distance: int):
+        self.fingerprint_id = fingerprint_id
+        self.invoice_id = invoice_id
+        self.document_id = document_id
+        self.distance = distance
+        target = f"invoice {invoice_id}" if invoice_id else f"document {document_id}"
+        super().__init__(
+            f"This file looks like a duplicate of {target}. "
+            "Submit it again with allow_duplicate set to process it anyway."
+        )
+
+
+@dataclass
+class ImageHashes:
+    dhash: int
+    phash: int
+
+
+def compute_image_hashes(file_content: bytes, filename: str) -> Optional[ImageHashes]:
+    """
+    Computes the perceptual hashes of a photo, or of the first page of a scanned PDF.
+    PDFs with a text layer are not fingerprinted: invoices generated from the same
+    template render nearly identically, so their hashes would collide.
+
+    Returns:
+        Optional[ImageHashes]: The hashes, or None if the file is not fingerprinted.
+    """
+    image = load_image_from_file(BytesIO(file_content), filename)
+    if image is None:
+        return None
+    return ImageHashes(dhash=dhash(image), phash=phash(image))
+
+
+class OwnerFingerprintIndex:
+    """
+    An in-memory BK-tree over one owner's dHashes. New rows are pulled from the
+    database before each lookup, so fingerprints stored by other workers are seen.
+
+    Ids are assigned at insert but become visible at commit, so a row can appear
+    after one with a higher id. Refreshes therefore look back by creation time
+    rather than id, and skip the rows already in the tree.
+    """
+
+    def __init__(self):
+        self.tree = BKTree()
+        self.phashes: Dict[int, int] = {}
+        self.refreshed_at: Optional[datetime] = None
+        self.lock = asyncio.Lock()
+
+    async def refresh(self, db: AsyncSession, owner_id: int) -> None:
+        created_since = None
+        if self.refreshed_at is not None:
+            created_since = self.refreshed_at - timedelta(seconds=settings.DUPLICATE_REFRESH_LOOKBACK_SECONDS)
+        started_at = datetime.utcnow()
+        rows = await crud.crud_image_fingerprint.get_fingerprints(db=db, owner_id=owner_id, created_since=created_since)
+        for row in rows:
+            if row.id in self.phashes:
+                continue
+            self.tree.add(int(row.dhash, 16), row.id)
+            self.phashes[row.id] = int(row.phash, 16)
+        self.refreshed_at = started_at
+
+    def candidates(self, hashes: ImageHashes) -> list:
+        """
+        Returns (distance, fingerprint_id) pairs whose dHash is within range and
+        whose pHash confirms the match, closest first.
+        """
+        matches = []
+        for distance, fingerprint_id in self.tree.search(hashes.dhash, settings.DUPLICATE_DHASH_MAX_DISTANCE):
+            phash_distance = hamming_distance(hashes.phash, self.phashes[fingerprint_id])
+            if phash_distance <= settings.DUPLICATE_PHASH_MAX_DISTANCE:
+                matches.append((max(distance, phash_distance), fingerprint_id))
+        return sorted(matches)
+
+
+_indexes: Dict[int, OwnerFingerprintIndex] = {}
+
+
+async def find_duplicate(db: AsyncSession, owner_id: int, hashes: ImageHashes):
+    """
+    Looks up the closest stored fingerprint of the owner that matches the hashes.
+
+    Returns:
+        Optional[Tuple[ImageFingerprint, int]]: The matching row and its distance, or None.
+    """
+    index = _indexes.setdefault(owner_id, OwnerFingerprintIndex())
+    async with index.lock:
+        await index.refresh(db, owner_id)
+        candidates = index.candidates(hashes)
+    if not candidates:
+        return None
+
+    # Rows are removed with their invoice; the tree keeps stale ids until restart
+    rows = await crud.crud_image_fingerprint.get_fingerprints_by_ids(
+        db=db,
+        owner_id=owner_id,
+        fingerprint_ids=[fingerprint_id for _, fingerprint_id in candidates]
+    )
+    rows_by_id = {row.id: row for row in rows}
+    for distance, fingerprint_id in candidates:
+        if fingerprint_id in rows_by_id:
+            return rows_by_id[fingerprint_id], distance
+    return None
+
+
+async def check_duplicate_upload(
+    file_content: bytes,
+    filename: str,
+    db: AsyncSession,
+    owner_id: int,
+    allow_duplicate: bool = False
+) -> Optional[ImageHashes]:
+    """
+    Fingerprints an upload and raises DuplicateDocumentError if the owner already
+    uploaded a near-identical image. Runs before OCR so duplicates cost nothing.
+    With `allow_duplicate` the lookup is skipped but the hashes are still returned.
+
+    Returns:
+        Optional[ImageHashes]: The hashes to store once the upload is processed,
+        or None if detection is disabled or the file has no image.
+    """
+    if not settings.DUPLICATE_DETECTION_ENABLED:
+        return None
+    hashes = compute_image_hashes(file_content, filename)
+    if hashes is None:
+        return None
+    if allow_duplicate:
+        return hashes
+
+    match = await find_duplicate(db, owner_id, hashes)
+    if match:
+        fingerprint, distance = match
+        logger.info(
+            f"Upload {filename} matches fingerprint {fingerprint.id} "
+            f"(invoice {fingerprint.invoice_id}) at distance {distance}"
+        )
+        raise DuplicateDocumentError(
+            fingerprint_id=fingerprint.id,
+            invoice_id=fingerprint.invoice_id,
+            document_id=fingerprint.document_id,
+            distance=distance
+        )
+    return hashes
+
+
+def store_image_hashes(
+    db: AsyncSession,
+    owner_id: int,
+    hashes: ImageHashes,
+    filename: str,
+    invoice_id: Optional[int] = None,
+    document_id: Optional[int] = None
+) -> None:
+    crud.crud_image_fingerprint.add_fingerprint(
+        db=db,
+        owner_id=owner_id,
+        dhash=hash_to_hex(hashes.dhash),
+        phash=hash_to_hex(hashes.phash),
+        invoice_id=invoice_id,
+        document_id=document_id,
+        filename=filename
+    )
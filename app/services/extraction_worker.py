@@ -0,0 +1,121 @@
+# app/services/extraction_worker.py
+
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Optional
+
+from app import crud
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.services.contract_processor import process_contract_upload
+from app.services.invoice_processor import process_invoice_upload
+from app.services.lease_processor import process_lease_upload
+from app.services.openai.circuit_breaker import LLMUnavailableError, llm_breaker
+from app.utils.tracing import links_to, span
+
+logger = logging.getLogger(__name__)
+
+PROCESSORS = {
+    "lease": process_lease_upload,
+    "invoice": process_invoice_upload,
+    "contract": process_contract_upload,
+}
+
+_worker_task: Optional[asyncio.Task] = None
+
+
+async def resume_pending_extractions() -> int:
+    """
+    Runs extraction for documents stored while the model provider was unavailable.
+    Stops at the first provider failure and returns the unprocessed documents to the queue.
+
+    Returns:
+        int: The number of documents extracted.
+    """
+    if not llm_breaker.allows_request():
+        return 0
+
+    async with SessionLocal() as db:
+        requeued = await crud.crud_document.requeue_stale_claims(
+            db=db, older_than=timedelta(seconds=settings.LLM_CLAIM_TIMEOUT_SECONDS)
+        )
+        if requeued:
+            logger.warning(f"Requeued {requeued} pending extractions abandoned by an earlier worker.")
+        documents = await crud.crud_document.claim_pending_documents(db=db, limit=settings.LLM_RESUME_BATCH_SIZE)
+    if not documents:
+        return 0
+    logger.info(f"Resuming extraction for {len(documents)} pending documents.")
+
+    resumed = 0
+    for position, document in enumerate(documents):
+        processor = PROCESSORS.get((document.document_type or "").lower())
+        attributes = {"document.id": document.id, "document.type": document.document_type}
+        with span("extraction_worker.resume", attributes, links_to(document.trace_parent)):
+            async with SessionLocal() as db:
+                if processor is None or not document.extracted_text:
+                    logger.error(f"Pending document {document.id} cannot be resumed (type {document.document_type}).")
+                    await crud.crud_document.update_status(db=db, document_id=document.id, status=crud.EXTRACTION_FAILED)
+                    continue
+                try:
+                    await processor(
+                        file_content=b"",
+                        filename="",
+                        property_id=document.property_id,
+                        document_type=document.document_type,
+                        db=db,
+                        owner_id=document.owner_id,
+                        text=document.extracted_text,
+                        packet_id=document.packet_id,
+                        document_id=document.id
+                    )
+                    resumed += 1
+                except LLMUnavailableError:
+                    await db.rollback()
+                    for pending in documents[position:]:
+                        await crud.crud_document.update_status(db=db, document_id=pending.id, status=crud.PENDING_EXTRACTION)
+                    logger.warning("Model provider still unavailable; pending extractions requeued.")
+                    break
+                except asyncio.CancelledError:
+                    # Shutting down: hand the rest of the batch back instead of leaving it claimed
+                    await asyncio.shield(_requeue(documents[position:]))
+                    raise
+                except Exception as e:
+                    logger.error(f"Resumed extraction of document {document.id} failed: {getattr(e, 'detail', None) or e}")
+                    await db.rollback()
+                    await crud.crud_document.update_status(db=db, document_id=document.id, status=crud.EXTRACTION_FAILED)
+    return resumed
+
+
+async def _requeue(documents) -> None:
+    async with SessionLocal() as db:
+        for pending in documents:
+            await crud.crud_document.update_status(db=db, document_id=pending.id, status=crud.PENDING_EXTRACTION)
+
+
+async def run_extraction_worker() -> None:
+    while True:
+        try:
+            await resume_pending_extractions()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Pending extraction worker iteration failed.")
+        await asyncio.sleep(settings.LLM_RESUME_INTERVAL_SECONDS)
+
+
+def start_extraction_worker() -> None:
+    global _worker_task
+    if _worker_task is None or _worker_task.done():
+        _worker_task = asyncio.create_task(run_extraction_worker())
+
+
+async def stop_extraction_worker() -> None:
+    global _worker_task
+    if _worker_task is not None:
+        _worker_task.cancel()
+        try:
+            await _worker_task
+        except asyncio.CancelledError:
+            pass
+        _worker_task = None
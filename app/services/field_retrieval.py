@@ -0,0 +1,236 @@
+# app/services/field_retrieval.py
+
+import logging
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+
+# Initialize logger for this module
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9$%]+")
+DATE_PATTERN = r"\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|(jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.? \d{1,2},? \d{4})\b"
+MONEY_PATTERN = r"\$\s?\d[\d,]*(\.\d{2})?"
+
+
+@dataclass
+class FieldGroup:
+    """
+    A group of related fields in an extraction prompt, together with the signals
+    used to find the passages that are likely to contain them.
+    """
+    name: str
+    keywords: List[str]
+    patterns: List[str] = field(default_factory=list)
+    # Paths into the extracted JSON that must not come back 'Not Found'
+    required_fields: List[List[str]] = field(default_factory=list)
+
+
+FIELD_GROUPS: Dict[str, List[FieldGroup]] = {
+    "lease": [
+        FieldGroup(
+            name="rent",
+            keywords=["rent", "monthly", "installment", "payable", "total", "payment", "due"],
+            patterns=[MONEY_PATTERN, r"\bper month\b", r"\bmonthly rent\b"],
+            required_fields=[["Rent Amount", "Monthly Installment"]],
+        ),
+        FieldGroup(
+            name="deposit",
+            keywords=["security", "deposit", "held", "refund", "escrow"],
+            patterns=[r"\bsecurity deposit\b", MONEY_PATTERN],
+        ),
+        FieldGroup(
+            name="dates",
+            keywords=["term", "commence", "commencement", "start", "end", "expire", "expiration", "effective", "date"],
+            patterns=[DATE_PATTERN, r"\b(lease|contract) term\b"],
+            required_fields=[["Start Date"]],
+        ),
+        # No required field: a commercial tenant is a company, with no first name
+        FieldGroup(
+            name="parties",
+            keywords=["tenant", "resident", "landlord", "lessor", "lessee", "owner", "between", "name", "email", "phone", "premises", "address"],
+            patterns=[r"\bby and between\b", r"[\w.+-]+@[\w-]+\.[\w.]+", r"\(?\d{3}\)?[\s.-]\d{3}[\s.-]\d{4}"],
+        ),
+        FieldGroup(
+            name="fees",
+            keywords=["fee", "late", "charge", "penalty", "violation", "lockout", "holdover", "garbage", "animal", "daily"],
+            patterns=[r"\blate (fee|charge)\b", r"\bper day\b", MONEY_PATTERN],
+        ),
+    ],
+    "contract": [
+        FieldGroup(
+            name="payment",
+            keywords=["payment", "fee", "compensation", "invoice", "price", "amount", "payable", "rate"],
+            patterns=[MONEY_PATTERN, r"\bpayment terms\b"],
+        ),
+        FieldGroup(
+            name="dates",
+            keywords=["term", "effective", "commence", "start", "end", "expire", "expiration", "renewal", "date"],
+            patterns=[DATE_PATTERN],
+            required_fields=[["Start Date"]],
+        ),
+        FieldGroup(
+            name="parties",
+            keywords=["party", "parties", "provider", "client", "contractor", "vendor", "between", "contact", "email", "phone", "address"],
+            patterns=[r"\bby and between\b", r"[\w.+-]+@[\w-]+\.[\w.]+", r"\(?\d{3}\)?[\s.-]\d{3}[\s.-]\d{4}"],
+            required_fields=[["Parties Involved"], ["Vendor Information", "Name"]],
+        ),
+        FieldGroup(
+            name="clauses",
+            keywords=["terminate", "termination", "confidential", "liability", "indemnify", "dispute", "arbitration", "governing"],
+            patterns=[r"\btermination\b", r"\bconfidential", r"\bliabilit"],
+        ),
+    ],
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def split_passages(text: str, max_chars: int) -> List[str]:
+    """
+    Splits document text into passages of at most `max_chars` characters.
+    Breaks on page boundaries and blank lines where possible so that clauses
+    are not cut in half.
+    """
+    passages = []
+    current = ""
+    # document_processor.PAGE_BREAK; single-page text has none
+    for page in text.split("\f"):
+        for paragraph in re.split(r"\n\s*\n", page):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            # Very long paragraphs (common in OCR output) are split by lines
+            pieces = [paragraph] if len(paragraph) <= max_chars else paragraph.splitlines()
+            for piece in pieces:
+                if current and len(current) + len(piece) + 1 > max_chars:
+                    passages.append(current)
+                    current = ""
+                current = f"{current}\n{piece}" if current else piece
+        if current:
+            passages.append(current)
+            current = ""
+    return passages
+
+
+class PassageIndex:
+    """
+    A small in-memory TF-IDF vector index over the passages of one document.
+    """
+
+    def __init__(self, passages: List[str]):
+        self.passages = passages
+        self.tokens = [tokenize(passage) for passage in passages]
+        document_frequency = Counter()
+        for tokens in self.tokens:
+            document_frequency.update(set(tokens))
+        total = len(passages)
+        self.idf = {
+            token: math.log((1 + total) / (1 + count)) + 1.0
+            for token, count in document_frequency.items()
+        }
+        self.vectors = [self._vectorize(tokens) for tokens in self.tokens]
+
+    def _vectorize(self, tokens: List[str]) -> Dict[str, float]:
+        counts = Counter(tokens)
+        vector = {token: count * self.idf.get(token, 1.0) for token, count in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+        return {token: weight / norm for token, weight in vector.items()}
+
+    def similarity(self, query_tokens: List[str]) -> List[float]:
+        query = self._vectorize(query_tokens)
+        return [
+            sum(weight * vector.get(token, 0.0) for token, weight in query.items())
+            for vector in self.vectors
+        ]
+
+
+def score_passages(index: PassageIndex, group: FieldGroup) -> List[float]:
+    """
+    Scores every passage in the index for a field group by combining keyword
+    hits, regex matches and vector similarity.
+    """
+    keywords = set(group.keywords)
+    similarities = index.similarity(group.keywords)
+    compiled = [re.compile(pattern, re.IGNORECASE) for pattern in group.patterns]
+    scores = []
+    for passage, tokens, similarity in zip(index.passages, index.tokens, similarities):
+        keyword_hits = sum(1 for token in tokens if token in keywords)
+        keyword_score = keyword_hits / math.sqrt(len(tokens) or 1)
+        pattern_score = sum(min(len(pattern.findall(passage)), 3) for pattern in compiled) / 3
+        scores.append(keyword_score + pattern_score + 2.0 * similarity)
+    return scores
+
+
+def select_passages(text: str, document_type: str) -> Optional[str]:
+    """
+    Builds a reduced version of `text` containing only the top-ranked passages
+    for each field group of the document type.
+
+    Args:
+        text (str): The full text extracted from the document.
+        document_type (str): The type of the document (e.g., 'lease', 'contract').
+
+    Returns:
+        Optional[str]: The reduced text, or None if the document is short, the
+        type has no field groups, or retrieval would not shrink the prompt.
+    """
+    groups = FIELD_GROUPS.get(document_type.lower())
+    if not settings.FIELD_RETRIEVAL_ENABLED or not groups:
+        return None
+    if len(text) < settings.FIELD_RETRIEVAL_MIN_CHARS:
+        return None
+
+    passages = split_passages(text, settings.FIELD_RETRIEVAL_PASSAGE_CHARS)
+    if len(passages) <= settings.FIELD_RETRIEVAL_TOP_K:
+        return None
+
+    index = PassageIndex(passages)
+    # The opening passage names the parties and the premises in nearly every agreement
+    selected = {0}
+    for group in groups:
+        scores = score_passages(index, group)
+        ranked = sorted(range(len(passages)), key=lambda i: scores[i], reverse=True)
+        selected.update(ranked[:settings.FIELD_RETRIEVAL_TOP_K])
+
+    reduced = "\n\n".join(passages[i] for i in sorted(selected))
+    if len(reduced) >= len(text) * 0.8:
+        return None
+
+    logger.info(
+        f"Field retrieval kept {len(selected)} of {len(passages)} passages "
+        f"({len(reduced)} of {len(text)} characters)"
+    )
+    return reduced
+
+
+def is_missing(value) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return value.strip().lower() in {"", "not found"}
+    if isinstance(value, (list, dict)):
+        return len(value) == 0
+    return False
+
+
+def missing_required_fields(extracted_data: dict, document_type: str) -> List[str]:
+    """
+    Returns the required fields that came back empty or 'Not Found' from an
+    extraction over retrieved passages.
+    """
+    missing = []
+    for group in FIELD_GROUPS.get(document_type.lower(), []):
+        for path in group.required_fields:
+            value = extracted_data
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            if is_missing(value):
+                missing.append(" > ".join(path))
+    return missing
@@ -2,9 +2,18 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
+from typing import Optional
 from app import schemas, crud
 from app.services.document_processor import extract_text_from_file
+from app.services.duplicate_detection import check_duplicate_upload, store_image_hashes
 from app.services.openai.openai_document import OpenAIService
+from app.services.openai.circuit_breaker import LLMUnavailableError
+from app.services.pending_extraction import defer_extraction
+from app.services.pipeline_telemetry import track_document
+from app.core.access import require_property
+from app.db.database import release_connection
+from app.services.usage_accounting import enforce_budget, link_usage, save_usage
+from app.utils.timing import begin_stage, label_stage_timer
 from app.services.mapping_functions import parse_json, map_invoice_data
 from io import BytesIO
 import json
@@ -13,30 +22,77 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+@track_document
 async def process_invoice_upload(
     file_content: bytes,
     filename: str,
     property_id: int,
     document_type: str,
     db: AsyncSession,
-    owner_id: int
+    owner_id: int,
+    text: Optional[str] = None,
+    packet_id: Optional[int] = None,
+    allow_duplicate: bool = False,
+    document_id: Optional[int] = None
 ):
-    # Extract text from the file
-    file_like = BytesIO(file_content)
-    text = extract_text_from_file(file_like, filename)
+    # Re-uploads of the same receipt are rejected before any OCR or model call
+    image_hashes = None
+    if text is None:
+        image_hashes = await check_duplicate_upload(
+            file_content=file_content,
+            filename=filename,
+            db=db,
+            owner_id=owner_id,
+            allow_duplicate=allow_duplicate
+        )
+
+    # Extract text from the file unless it was already extracted (e.g. a packet segment)
+    if text is None:
+        file_like = BytesIO(file_content)
+        text = extract_text_from_file(file_like, filename)
     if not text:
         raise ValueError("Could not extract text from the document.")
 
+    await enforce_budget(db, owner_id)
+    # Don't hold a pooled connection through the model call
+    await release_connection(db)
+
     # Initialize OpenAIService
     openai_service = OpenAIService()
-    extracted_data = await openai_service.extract_information(text, document_type)
+    try:
+        extracted_data = await openai_service.extract_information(text, document_type)
+    except LLMUnavailableError:
+        # Resumed extractions go back to the queue; new uploads are kept as pending documents
+        if document_id is not None:
+            await save_usage(owner_id, "extraction", openai_service.usage, document_id=document_id)
+            raise
+        raise await defer_extraction(
+            db=db,
+            owner_id=owner_id,
+            property_id=property_id,
+            document_type=document_type,
+            text=text,
+            packet_id=packet_id,
+            image_hashes=image_hashes,
+            filename=filename,
+            usage=openai_service.usage
+        )
 
+    # Paid for whether or not the transaction below commits
+    usage_ids = await save_usage(owner_id, "extraction", openai_service.usage, document_id=document_id)
     if not extracted_data:
         raise ValueError("Could not extract information from the document.")
 
     # Parse and map data
+    begin_stage("map")
     parsed_data = parse_json(json.dumps(extracted_data))
     mapped_data = map_invoice_data(parsed_data)
+    begin_stage("db")
+
+    # Everything below is one transaction: the CRUD calls only flush, and a failure
+    # before the commit leaves no partial rows (the session's rollback drops them).
+    # Ownership resolved here is remembered for the session, so the CRUD calls' checks are free.
+    await require_property(db, owner_id, property_id)
 
     # Include property_id in mapped_data
     mapped_data['property_id'] = property_id
@@ -61,7 +117,8 @@ async def process_invoice_upload(
             new_vendor = await crud.crud_vendor.create_vendor(
                 db=db,
                 vendor_in=vendor_in,
-                owner_id=owner_id
+                owner_id=owner_id,
+                commit=False
             )
             vendor_id = new_vendor.id
 
@@ -76,7 +133,8 @@ async def process_invoice_upload(
     invoice = await crud.crud_invoice.create_invoice(
         db=db,
         invoice_in=invoice_in,
-        owner_id=owner_id
+        owner_id=owner_id,
+        commit=False
     )
 
     # Capture the invoice ID immediately
@@ -87,13 +145,24 @@ async def process_invoice_upload(
         property_id=property_id,
         invoice_id=invoice_id,
         document_type=document_type,
-        description=invoice_in.description
-    )
-    document = await crud.crud_document.create_document(
-        db=db,
-        document_in=document_in,
-        owner_id=owner_id
+        description=invoice_in.description,
+        packet_id=packet_id,
+        prompt_version=openai_service.last_prompt_version
     )
+    if document_id is not None:
+        document = await crud.crud_document.complete_pending_document(
+            db=db,
+            document_id=document_id,
+            document_in=document_in,
+            commit=False
+        )
+    else:
+        document = await crud.crud_document.create_document(
+            db=db,
+            document_in=document_in,
+            owner_id=owner_id,
+            commit=False
+        )
 
     # Optionally create an expense entry
     expense_in = schemas.ExpenseCreate(
@@ -105,22 +174,27 @@ async def process_invoice_upload(
         transaction_date=invoice_in.invoice_date or datetime.utcnow().date(),
         description=invoice_in.description
     )
-    expense = await crud.crud_expense.create_expense(
+    # The document and expense are linked to the invoice through their invoice_id
+    await crud.crud_expense.create_expense(
         db=db,
         expense_in=expense_in,
-        owner_id=owner_id
+        owner_id=owner_id,
+        commit=False
     )
 
-    # Link the invoice to the document and expense
-    invoice.document = document
-    invoice.expense = expense
+    if image_hashes:
+        store_image_hashes(
+            db=db,
+            owner_id=owner_id,
+            hashes=image_hashes,
+            filename=filename,
+            invoice_id=invoice_id,
+            document_id=document.id
+        )
+    await link_usage(db, usage_ids, document.id)
+    label_stage_timer("document_id", document.id)
     await db.commit()
 
-    # Re-fetch the invoice to ensure relationships are loaded
-    invoice = await crud.crud_invoice.get_invoice(invoice_id=invoice_id, owner_id=owner_id, db=db)
-    if not invoice:
-        raise ValueError("Failed to load invoice after creation.")
-
     try:
             invoice_schema = schemas.Invoice.model_validate(invoice, from_attributes=True)
             return invoice_schema
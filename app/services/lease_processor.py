@@ -4,17 +4,23 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from typing import Optional
 from app import schemas, crud
-from app.services.document_processor import extract_text_from_file
+from app.services.document_processor import extract_text_and_pages
 from app.services.openai.openai_document import OpenAIService
+from app.services.openai.circuit_breaker import LLMUnavailableError
+from app.services.pending_extraction import defer_extraction
+from app.services.pipeline_telemetry import track_document
+from app.core.access import owns_property
+from app.db.database import release_connection
+from app.services.usage_accounting import enforce_budget, link_usage, save_usage
 from app.services.mapping_functions import parse_json, map_lease_data
-from io import BytesIO
 import json
 import logging
 from datetime import datetime
-from app.utils.timing import log_timing
+from app.utils.timing import log_timing, begin_stage, label_stage_timer
 
 logger = logging.getLogger(__name__)
 
+@track_document
 @log_timing("Lease Processing")
 async def process_lease_upload(
     file_content: bytes,
@@ -22,28 +28,66 @@ async def process_lease_upload(
     property_id: Optional[int],
     document_type: str,
     db: AsyncSession,
-    owner_id: int
+    owner_id: int,
+    text: Optional[str] = None,
+    packet_id: Optional[int] = None,
+    document_id: Optional[int] = None
 ):
-    # Extract text from the file
-    file_like = BytesIO(file_content)
-    text = extract_text_from_file(file_like, filename)
+    # Extract text from the file unless it was already extracted (e.g. a packet segment)
+    pages = None
+    if text is None:
+        text, pages = extract_text_and_pages(file_content, filename)
     if not text:
         raise ValueError("Could not extract text from the document.")
 
+    await enforce_budget(db, owner_id)
+    # Don't hold a pooled connection through the model call
+    await release_connection(db)
+
     # Initialize OpenAIService
     openai_service = OpenAIService()
-    extracted_data = await openai_service.extract_information(text, document_type)
+    try:
+        extracted_data = await openai_service.extract_information(text, document_type)
+    except LLMUnavailableError:
+        # Resumed extractions go back to the queue; new uploads are kept as pending documents
+        if document_id is not None:
+            await save_usage(owner_id, "extraction", openai_service.usage, document_id=document_id)
+            raise
+        raise await defer_extraction(
+            db=db,
+            owner_id=owner_id,
+            property_id=property_id,
+            document_type=document_type,
+            text=text,
+            pages=pages,
+            packet_id=packet_id,
+            usage=openai_service.usage
+        )
 
+    # Paid for whether or not the transaction below commits
+    usage_ids = await save_usage(owner_id, "extraction", openai_service.usage, document_id=document_id)
     if not extracted_data:
         raise ValueError("Could not extract information from the document.")
 
     # Parse and map data
+    begin_stage("map")
     parsed_data = parse_json(json.dumps(extracted_data))
     mapped_data = map_lease_data(parsed_data)    
+    begin_stage("db")
 
-    # Handle property creation/retrieval
+    # Everything below is one transaction: the CRUD calls only flush, and a failure
+    # before the commit leaves no partial rows (the session's rollback drops them).
+    # Ownership resolved here is remembered for the session, so the CRUD calls' checks are free.
     final_property_id = property_id
-    if not final_property_id:
+    if final_property_id:
+        # If we have a property_id, still remove property_info if it exists
+        _ = mapped_data.pop('property_info', None)
+        if not await owns_property(db, owner_id, final_property_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Property not found or you do not have access to this property."
+            )
+    else:
         # Extract property info
         property_info = mapped_data.pop('property_info', {})
         if not property_info.get('address'):
@@ -65,22 +109,19 @@ async def process_lease_upload(
                 new_property = await crud.crud_property.create_with_owner(
                     db=db,
                     obj_in=property_in,
-                    owner_id=owner_id
+                    owner_id=owner_id,
+                    commit=False,
+                    verified=True
                 )
                 final_property_id = new_property.id
             except Exception as e:
                 raise ValueError(f"Error creating property: {str(e)}")
-    else:
-            # If we have a property_id, still remove property_info if it exists
-            _ = mapped_data.pop('property_info', None)
 
-            
     # Update mapped_data with final property_id
     mapped_data['property_id'] = final_property_id
 
-
     # Extract tenant_info if present
-    tenant_info = mapped_data.get('tenant_info', None)   
+    tenant_info = mapped_data.get('tenant_info', None)
     if tenant_info:
         tenant_info['property_id'] = final_property_id
 
@@ -96,24 +137,20 @@ async def process_lease_upload(
             landlord=tenant_info.get('landlord'),
             owner_id=owner_id
         )
-        if tenant:
-            tenant_id = tenant.id
-        else:
+        if not tenant:
             # Create a tenant
             tenant_in = schemas.TenantCreate(**tenant_info)
             tenant = await crud.crud_tenant.create_tenant(
                 db=db,
                 tenant_in=tenant_in,
-                owner_id=owner_id
+                owner_id=owner_id,
+                commit=False
             )
-            tenant_id = tenant.id
-
-    # Include property_id and tenant_id in mapped_data
-    mapped_data['property_id'] = final_property_id 
+        tenant_id = tenant.id
 
     # Create LeaseCreate schema
-    try:        
-        lease_in = schemas.LeaseCreate(**mapped_data)        
+    try:
+        lease_in = schemas.LeaseCreate(**mapped_data)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -121,67 +158,60 @@ async def process_lease_upload(
         )
 
     # Create the lease in the database
-    lease_id = None
-    try:     
+    try:
         lease = await crud.crud_lease.create_lease(
             db=db,
             lease_in=lease_in,
-            owner_id=owner_id
+            owner_id=owner_id,
+            commit=False
         )
-        lease_id = lease.id
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
-        )    
+        )
 
     # Extract lease_type, description if present
-    lease_type = mapped_data.get('lease_type', None)  
-    description = mapped_data.get('description', None)  
+    lease_type = mapped_data.get('lease_type', None)
+    description = mapped_data.get('description', None)
 
     # Handle document creation or retrieval
-    document_id = None    
     document_in = schemas.DocumentCreate(
         property_id=final_property_id,
-        lease_id=lease_id,
+        lease_id=lease.id,
         tenant_id=tenant_id,
         document_type=lease_type,
-        description=description
-    )    
-
-    logger.info(document_in)
-    document = await crud.crud_document.create_document(
-        db=db,
-        document_in=document_in,
-        owner_id=owner_id
+        description=description,
+        packet_id=packet_id,
+        prompt_version=openai_service.last_prompt_version
     )
 
-
-    property = await crud.crud_property.get_property_by_id(
-        db=db,
-        property_id=final_property_id,
-        owner_id=owner_id
-    )
-    if not property:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Property not found or you do not have access to this property."
+    logger.info(document_in)
+    if document_id is not None:
+        document = await crud.crud_document.complete_pending_document(
+            db=db,
+            document_id=document_id,
+            document_in=document_in,
+            commit=False
         )
+    else:
+        document = await crud.crud_document.create_document(
+            db=db,
+            document_in=document_in,
+            owner_id=owner_id,
+            commit=False
+        )
+    if pages:
+        crud.crud_document.add_pages(db=db, document_id=document.id, pages=pages)
+    await link_usage(db, usage_ids, document.id)
+    label_stage_timer("document_id", document.id)
 
-    # Link the lease to the document, tenant, and property
-    lease.property = property
-    lease.document = document    
-    tenant.lease = lease
-    tenant.property = property
-    document.lease = lease
-    document.property = property    
-
-    db.add(tenant)
-
-    await db.commit()    
+    # Link the tenant to the lease; the lease and document already carry their keys
+    if tenant is not None:
+        tenant.lease_id = lease.id
+        tenant.property_id = final_property_id
 
-    # Refresh the lease to ensure all relationships are loaded
-    await db.refresh(lease)
+    await db.commit()
 
     # Map to Pydantic schema before returning
     try:
@@ -0,0 +1,80 @@
+# app/services/openai/circuit_breaker.py
+
+import logging
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMUnavailableError(Exception):
+    """
+    Raised when the model provider is failing or the circuit breaker is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Stops calls to the model provider after repeated failures.
+
+    closed: calls go through; consecutive failures are counted.
+    open: calls fail immediately with LLMUnavailableError until the reset timeout passes.
+    half_open: a single trial call is let through; success closes the circuit,
+    failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+
+    def allows_request(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            self.trial_in_flight = False
+        return self.state == "half_open" and not self.trial_in_flight
+
+    def before_call(self) -> None:
+        if not self.allows_request():
+            raise LLMUnavailableError(f"The {self.name} service is temporarily unavailable.")
+        if self.state == "half_open":
+            self.trial_in_flight = True
+
+    def record_success(self) -> None:
+        if self.state != "closed":
+            logger.info(f"Circuit '{self.name}' closed; provider recovered.")
+        self.state = "closed"
+        self.failures = 0
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning(f"Circuit '{self.name}' opened after {self.failures} failures.")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    @property
+    def retry_after(self) -> int:
+        """
+        Seconds until the next trial call is allowed.
+        """
+        if self.state != "open":
+            return 0
+        return max(0, int(self.reset_timeout - (time.monotonic() - self.opened_at)) + 1)
+
+
+llm_breaker = CircuitBreaker(
+    name="llm",
+    failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=settings.LLM_BREAKER_RESET_SECONDS,
+)
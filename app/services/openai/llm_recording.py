@@ -0,0 +1,164 @@
+# app/services/openai/llm_recording.py
+
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+import os
+import random
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import httpx
+from openai import APITimeoutError, RateLimitError
+
+from app.core.config import settings
+from app.services.openai.llm_client import ModelClient, ModelResponse, OpenAIModelClient
+
+logger = logging.getLogger(__name__)
+
+# Used to build the exceptions the OpenAI client raises, so injected failures take the same paths
+_REPLAY_REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+class RecordingNotFoundError(LookupError):
+    """
+    Raised in replay mode when no recording matches a request.
+    """
+
+
+def request_key(messages: list) -> str:
+    """
+    Identifies a request by its messages only, so recordings still match after a
+    routing change sends the request to a different model.
+    """
+    canonical = json.dumps(messages, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def recording_path(directory: str, task: str, key: str) -> str:
+    return os.path.join(directory, task, f"{key}.json")
+
+
+def _write_recording(path: str, recording: dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(recording, f, indent=2, ensure_ascii=False)
+    os.replace(temporary, path)
+
+
+class RecordingModelClient(ModelClient):
+    """
+    Calls the live API and writes every request/response pair to LLM_RECORDINGS_DIR.
+    Recordings contain the document text that was sent, so treat them like uploads.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or settings.LLM_RECORDINGS_DIR
+        self.live = OpenAIModelClient()
+
+    async def complete(self, messages: list, model: str, timeout: float, task: str) -> ModelResponse:
+        started = time.perf_counter()
+        response = await self.live.complete(messages, model=model, timeout=timeout, task=task)
+        key = request_key(messages)
+        recording = {
+            "key": key,
+            "task": task,
+            "model": model,
+            "messages": messages,
+            "response": {
+                "content": response.content,
+                "model": response.model,
+                "prompt_tokens": response.prompt_tokens,
+                "completion_tokens": response.completion_tokens,
+                "cached_tokens": response.cached_tokens,
+            },
+            "latency_ms": int((time.perf_counter() - started) * 1000),
+            "recorded_at": datetime.utcnow().isoformat(),
+        }
+        await asyncio.to_thread(_write_recording, recording_path(self.directory, task, key), recording)
+        return response
+
+
+class ReplayIndex:
+    def __init__(self, directory: str):
+        self.by_key: Dict[str, dict] = {}
+        self.by_task: Dict[str, List[dict]] = {}
+        for root, _, files in os.walk(directory):
+            for name in sorted(files):
+                if not name.endswith(".json"):
+                    continue
+                with open(os.path.join(root, name), encoding="utf-8") as f:
+                    recording = json.load(f)
+                self.by_key[recording["key"]] = recording
+                self.by_task.setdefault(recording["task"], []).append(recording)
+        # Round-robin over a task's recordings for requests that were never recorded
+        self.cycles = {task: itertools.cycle(recordings) for task, recordings in self.by_task.items()}
+        logger.info(f"Loaded {len(self.by_key)} LLM recordings from {directory}")
+
+
+@lru_cache(maxsize=None)
+def load_replay_index(directory: str) -> ReplayIndex:
+    return ReplayIndex(directory)
+
+
+class ReplayModelClient(ModelClient):
+    """
+    Serves recorded responses without network access, with synthetic latency and
+    injected failures (429s, timeouts and malformed JSON) at configurable rates.
+    """
+
+    def __init__(self, directory: Optional[str] = None, seed: Optional[int] = None):
+        self.index = load_replay_index(directory or settings.LLM_RECORDINGS_DIR)
+        self.random = random.Random(settings.LLM_REPLAY_SEED if seed is None else seed)
+
+    def find(self, messages: list, task: str) -> dict:
+        recording = self.index.by_key.get(request_key(messages))
+        if recording is not None:
+            return recording
+        if settings.LLM_REPLAY_FALLBACK_TO_TASK and task in self.index.cycles:
+            return next(self.index.cycles[task])
+        raise RecordingNotFoundError(f"No recording for this {task} request.")
+
+    def latency(self, recording: dict) -> float:
+        latency_ms = recording.get("latency_ms", 0) * settings.LLM_REPLAY_LATENCY_SCALE
+        latency_ms += settings.LLM_REPLAY_EXTRA_LATENCY_MS
+        if settings.LLM_REPLAY_JITTER_MS:
+            latency_ms += self.random.uniform(-settings.LLM_REPLAY_JITTER_MS, settings.LLM_REPLAY_JITTER_MS)
+        return max(latency_ms, 0) / 1000
+
+    async def complete(self, messages: list, model: str, timeout: float, task: str) -> ModelResponse:
+        recording = self.find(messages, task)
+        roll = self.random.random()
+
+        if roll < settings.LLM_REPLAY_RATE_LIMIT_RATE:
+            raise RateLimitError(
+                "Injected rate limit",
+                response=httpx.Response(429, request=_REPLAY_REQUEST),
+                body=None,
+            )
+        roll -= settings.LLM_REPLAY_RATE_LIMIT_RATE
+
+        if roll < settings.LLM_REPLAY_TIMEOUT_RATE:
+            await asyncio.sleep(timeout)
+            raise APITimeoutError(request=_REPLAY_REQUEST)
+        roll -= settings.LLM_REPLAY_TIMEOUT_RATE
+
+        await asyncio.sleep(self.latency(recording))
+        recorded = recording["response"]
+        content = recorded["content"]
+        if roll < settings.LLM_REPLAY_MALFORMED_RATE:
+            # Cut the JSON short, like a response that hit the token limit
+            content = content[: max(1, len(content) // 2)]
+
+        return ModelResponse(
+            content=content,
+            model=model,
+            prompt_tokens=recorded.get("prompt_tokens", 0),
+            completion_tokens=recorded.get("completion_tokens", 0),
+            cached_tokens=recorded.get("cached_tokens", 0),
+        )
@@ -0,0 +1,271 @@
+# app/services/openai/model_router.py
+
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional
+
+from app.core.config import settings
+from app.services.openai.circuit_breaker import LLMUnavailableError, llm_breaker
+from app.services.openai.llm_client import ModelClient, is_provider_error, parse_json_content
+from app.utils.metrics import observe_llm_call
+from app.utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# USD per million tokens (input, output)
+MODEL_PRICES: Dict[str, tuple] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+}
+
+# Cached prompt tokens are billed at this fraction of the input price
+CACHED_INPUT_DISCOUNT = 0.5
+
+TIER_ORDER = ["fast", "strong"]
+
+# Tasks whose complexity grows with document length
+LONG_FORM_TASKS = {"lease", "contract"}
+
+
+@dataclass
+class ModelTier:
+    name: str
+    model: str
+    timeout: float
+
+
+@dataclass
+class UsageRecord:
+    """
+    One model call, kept by the caller so it can be stored against a document and owner.
+    """
+    task: str
+    model: str
+    tier: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    cost: float = 0.0
+    latency_ms: int = 0
+    success: bool = True
+
+
+@dataclass
+class TierStats:
+    calls: int = 0
+    failures: int = 0
+    escalations: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    cost: float = 0.0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=500))
+
+    def summary(self) -> dict:
+        latencies = sorted(self.latencies)
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 3)
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "escalations": self.escalations,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cost_usd": round(self.cost, 6),
+            "latency_p50": percentile(0.5),
+            "latency_p95": percentile(0.95),
+        }
+
+
+# Keyed by (task, tier name)
+_stats: Dict[tuple, TierStats] = {}
+
+
+def get_tier(name: str, task: str) -> ModelTier:
+    if name == "strong":
+        model, timeout = settings.LLM_STRONG_MODEL, settings.LLM_STRONG_TIMEOUT
+    else:
+        model, timeout = settings.LLM_FAST_MODEL, settings.LLM_FAST_TIMEOUT
+    if settings.LLM_PROVIDER == "stub":
+        model = "stub"
+    return ModelTier(name=name, model=model, timeout=settings.LLM_TASK_TIMEOUTS.get(task, timeout))
+
+
+def route(task: str, text_length: int = 0) -> List[ModelTier]:
+    """
+    Picks the starting tier for a task and returns it followed by the stronger
+    tiers to escalate to. Short documents, invoices, classification and chat
+    intents start on the fast tier; long leases and contracts start on the strong tier.
+
+    Args:
+        task (str): The task, e.g. 'lease', 'invoice', 'classification' or 'intent'.
+        text_length (int): Length of the variable input in characters.
+
+    Returns:
+        List[ModelTier]: The tiers to try, in order.
+    """
+    start = settings.LLM_TASK_TIERS.get(task)
+    if start not in TIER_ORDER:
+        long_form = task in LONG_FORM_TASKS and text_length >= settings.LLM_STRONG_MIN_CHARS
+        start = "strong" if long_form else "fast"
+    return [get_tier(name, task) for name in TIER_ORDER[TIER_ORDER.index(start):]]
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> float:
+    input_price, output_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    uncached = prompt_tokens - cached_tokens
+    return (
+        uncached * input_price
+        + cached_tokens * input_price * CACHED_INPUT_DISCOUNT
+        + completion_tokens * output_price
+    ) / 1_000_000
+
+
+def record_call(
+    task: str,
+    tier: ModelTier,
+    latency: float,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    cached_tokens: int = 0,
+    failed: bool = False,
+    usage: Optional[List[UsageRecord]] = None
+) -> None:
+    cost = estimate_cost(tier.model, prompt_tokens, completion_tokens, cached_tokens)
+    stats = _stats.setdefault((task, tier.name), TierStats())
+    stats.calls += 1
+    stats.failures += int(failed)
+    stats.prompt_tokens += prompt_tokens
+    stats.completion_tokens += completion_tokens
+    stats.cached_tokens += cached_tokens
+    stats.cost += cost
+    stats.latencies.append(latency)
+    observe_llm_call(task, tier.model, tier.name, latency, prompt_tokens, completion_tokens, cached_tokens, cost, failed)
+    if usage is not None:
+        usage.append(UsageRecord(
+            task=task,
+            model=tier.model,
+            tier=tier.name,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached_tokens=cached_tokens,
+            cost=cost,
+            latency_ms=int(latency * 1000),
+            success=not failed,
+        ))
+
+
+def routing_stats() -> Dict[str, Dict[str, dict]]:
+    """
+    Returns call counts, token usage, cost and latency percentiles per task and tier.
+    """
+    summary: Dict[str, Dict[str, dict]] = {}
+    for (task, tier_name), stats in sorted(_stats.items()):
+        summary.setdefault(task, {})[tier_name] = stats.summary()
+    return summary
+
+
+async def complete_json(
+    client: ModelClient,
+    task: str,
+    messages: list,
+    text_length: int = 0,
+    validate: Optional[Callable[[dict], bool]] = None,
+    escalate: bool = True,
+    usage: Optional[List[UsageRecord]] = None,
+) -> dict:
+    """
+    Sends the prompt to the routed model tier and parses the JSON response.
+    Escalates to the next tier when the request fails, the response is not valid
+    JSON, or `validate` rejects it.
+
+    Args:
+        client (ModelClient): The client used to call the model.
+        task (str): The task being routed.
+        messages (list): The chat messages.
+        text_length (int): Length of the variable input in characters.
+        validate (Callable[[dict], bool], optional): Checks the parsed response.
+        escalate (bool): Try stronger tiers if the first one fails.
+        usage (List[UsageRecord], optional): Receives a record of every call made.
+
+    Returns:
+        dict: The parsed response of the first tier that passed validation, or the
+        last parsed response (empty dict if none parsed).
+
+    Raises:
+        LLMUnavailableError: The circuit breaker is open, or the provider failed
+        on every tier without returning a response.
+    """
+    tiers = route(task, text_length)
+    if not escalate:
+        tiers = tiers[:1]
+
+    result: dict = {}
+    provider_down = False
+    for position, tier in enumerate(tiers):
+        if position > 0:
+            _stats.setdefault((task, tiers[position - 1].name), TierStats()).escalations += 1
+            logger.info(f"Escalating {task} from {tiers[position - 1].model} to {tier.model}")
+
+        try:
+            llm_breaker.before_call()
+        except LLMUnavailableError:
+            provider_down = True
+            break
+
+        started = time.perf_counter()
+        try:
+            attributes = {"llm.task": task, "llm.tier": tier.name, "llm.model": tier.model}
+            with span("llm.complete", attributes) as call_span:
+                response = await client.complete(messages, model=tier.model, timeout=tier.timeout, task=task)
+                call_span.set_attributes({
+                    "llm.prompt_tokens": response.prompt_tokens,
+                    "llm.completion_tokens": response.completion_tokens,
+                    "llm.cached_tokens": response.cached_tokens,
+                })
+        except Exception as e:
+            record_call(task, tier, time.perf_counter() - started, failed=True, usage=usage)
+            logger.error(f"An error occurred while calling {tier.model} for {task}: {e}")
+            if is_provider_error(e):
+                llm_breaker.record_failure()
+                provider_down = True
+            else:
+                llm_breaker.record_success()
+            continue
+
+        llm_breaker.record_success()
+        provider_down = False
+        latency = time.perf_counter() - started
+        try:
+            parsed = parse_json_content(response.content)
+            valid = isinstance(parsed, dict) and (validate is None or validate(parsed))
+        except json.JSONDecodeError:
+            logger.error(f"Error decoding JSON from {tier.model} response.")
+            parsed, valid = {}, False
+
+        record_call(
+            task,
+            tier,
+            latency,
+            prompt_tokens=response.prompt_tokens,
+            completion_tokens=response.completion_tokens,
+            cached_tokens=response.cached_tokens,
+            failed=not valid,
+            usage=usage
+        )
+        if isinstance(parsed, dict) and parsed:
+            result = parsed
+        if valid:
+            return parsed
+
+    if provider_down and not result:
+        raise LLMUnavailableError(f"The model provider is unavailable for {task}.")
+    return result
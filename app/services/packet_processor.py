@@ -0,0 +1,320 @@
+# app/services/packet_processor.py
+
+import asyncio
+import logging
+import re
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import schemas
+from app.core.access import share_access
+from app.core.config import settings
+from app.db.database import SessionLocal, release_connection, share_request
+from app.models.document_packet import DocumentPacket
+from app.services.contract_processor import process_contract_upload
+from app.services.document_processor import PAGE_BREAK, extract_pages_from_file
+from app.services.invoice_processor import process_invoice_upload
+from app.services.lease_processor import process_lease_upload
+from app.services.openai.openai_document import OpenAIService
+from app.services.pending_extraction import ExtractionPendingError
+from app.services.usage_accounting import record_usage
+from app.utils.metrics import PACKET_SEGMENTS_WAITING
+from app.utils.timing import log_timing
+
+logger = logging.getLogger(__name__)
+
+# Title phrases found in the first lines of a page, checked in order
+HEADER_TITLES: List[Tuple[str, re.Pattern]] = [
+    ("addendum", re.compile(r"\b(addendum|addenda|rider|exhibit [a-z0-9]+)\b", re.IGNORECASE)),
+    # A bare "Lease" only as the whole line: body lines such as "Lease term: 12 months" are not titles
+    ("lease", re.compile(r"\b(lease agreement|residential lease|rental agreement|housing contract)\b|^lease$", re.IGNORECASE)),
+    ("invoice", re.compile(r"\b(invoice|receipt|billing statement|bill to)\b", re.IGNORECASE)),
+    ("contract", re.compile(r"\b(service agreement|services agreement|maintenance contract|agreement|contract)\b", re.IGNORECASE)),
+]
+
+# Page markers such as "Page 3 of 12", "Page 3", "3 of 12" or "- 3 -"
+PAGE_NUMBER_PATTERN = re.compile(
+    r"^\s*(?:page\s+(\d+)(?:\s*(?:of|/)\s*\d+)?|(\d+)\s+of\s+\d+|-\s*(\d+)\s*-)\s*$",
+    re.IGNORECASE,
+)
+
+INVOICE_NUMBER_PATTERN = re.compile(r"\binvoice\s*(?:#|no\b\.?|number:?)\s*([a-z0-9-]+)", re.IGNORECASE)
+
+# Discriminative vocabulary for the local page classifier
+CLASSIFIER_VOCABULARY: Dict[str, List[str]] = {
+    "lease": [
+        "tenant", "landlord", "lessee", "lessor", "rent", "premises", "occupancy", "occupant",
+        "resident", "security deposit", "lease term", "move-in", "sublet", "pets",
+    ],
+    "invoice": [
+        "invoice", "amount due", "due date", "qty", "quantity", "subtotal", "total", "bill to",
+        "unit price", "balance", "remit", "paid", "tax",
+    ],
+    "contract": [
+        "agreement", "services", "provider", "client", "contractor", "scope of work",
+        "deliverables", "indemnify", "obligations", "warranty", "compensation",
+    ],
+}
+
+PROCESSORS = {
+    "lease": process_lease_upload,
+    "invoice": process_invoice_upload,
+    "contract": process_contract_upload,
+}
+
+
+@dataclass
+class PageSignals:
+    header: Optional[str]
+    page_number: Optional[int]
+    label: Optional[str]
+    confidence: float
+    invoice_number: Optional[str]
+
+
+@dataclass
+class Segment:
+    document_type: Optional[str]
+    start_page: int
+    end_page: int
+    pages: List[str] = field(default_factory=list)
+    invoice_number: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        return PAGE_BREAK.join(self.pages).strip()
+
+
+def classify_page(text: str) -> Tuple[Optional[str], float]:
+    """
+    Scores a page against the vocabulary of each document type.
+
+    Returns:
+        Tuple[Optional[str], float]: The best label (None if nothing matched) and
+        its share of all keyword hits.
+    """
+    lowered = text.lower()
+    scores = {
+        label: sum(lowered.count(term) for term in terms)
+        for label, terms in CLASSIFIER_VOCABULARY.items()
+    }
+    total = sum(scores.values())
+    if total == 0:
+        return None, 0.0
+    label = max(scores, key=scores.get)
+    return label, scores[label] / total
+
+
+def detect_header(text: str) -> Optional[str]:
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    for line in lines[:settings.PACKET_HEADER_LINES]:
+        # Titles are short; long lines are body text that happens to mention a keyword
+        if len(line) > 80:
+            continue
+        for label, pattern in HEADER_TITLES:
+            match = pattern.search(line)
+            # Titles are either set in capitals or start the line ("Invoice #1042")
+            if match and (line.isupper() or match.start() <= 3):
+                return label
+    return None
+
+
+def detect_page_number(text: str) -> Optional[int]:
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    for line in lines[:3] + lines[-3:]:
+        match = PAGE_NUMBER_PATTERN.match(line)
+        if match:
+            return int(next(group for group in match.groups() if group))
+    return None
+
+
+def detect_invoice_number(text: str) -> Optional[str]:
+    match = INVOICE_NUMBER_PATTERN.search(text)
+    return match.group(1).lower() if match else None
+
+
+def page_signals(text: str) -> PageSignals:
+    label, confidence = classify_page(text)
+    return PageSignals(
+        header=detect_header(text),
+        page_number=detect_page_number(text),
+        label=label,
+        confidence=confidence,
+        invoice_number=detect_invoice_number(text),
+    )
+
+
+def segment_pages(pages: List[str]) -> List[Segment]:
+    """
+    Splits a packet into documents. A new segment starts when a page carries a
+    title header, when page numbering restarts at 1, when the invoice number
+    changes, or when the local classifier confidently switches to a different
+    document type. Addenda stay attached to the lease or contract they follow.
+    """
+    segments: List[Segment] = []
+    current: Optional[Segment] = None
+    previous_number: Optional[int] = None
+    threshold = settings.PACKET_CLASSIFIER_CONFIDENCE
+
+    for index, text in enumerate(pages, start=1):
+        signals = page_signals(text)
+        starts_new = current is None
+
+        if current is not None:
+            if signals.header == "addendum":
+                # Addenda continue the agreement they amend
+                starts_new = current.document_type not in {"lease", "contract"}
+            elif signals.header and signals.header != current.document_type:
+                starts_new = True
+            elif signals.page_number == 1 and previous_number not in (None, 0):
+                starts_new = True
+            elif (
+                signals.invoice_number
+                and current.invoice_number
+                and signals.invoice_number != current.invoice_number
+            ):
+                starts_new = True
+            elif (
+                signals.label
+                and signals.confidence >= threshold
+                and current.document_type
+                and signals.label != current.document_type
+            ):
+                starts_new = True
+
+        if starts_new:
+            document_type = signals.header if signals.header != "addendum" else None
+            if document_type is None and signals.confidence >= threshold:
+                document_type = signals.label
+            current = Segment(document_type=document_type, start_page=index, end_page=index)
+            segments.append(current)
+        elif current.document_type is None and signals.confidence >= threshold:
+            current.document_type = signals.label
+
+        current.pages.append(text)
+        current.end_page = index
+        current.invoice_number = current.invoice_number or signals.invoice_number
+        previous_number = signals.page_number
+
+    # Blank pages between documents do not make segments of their own
+    return [segment for segment in segments if segment.text]
+
+
+async def _process_segment(
+    segment: Segment,
+    filename: str,
+    property_id: int,
+    owner_id: int,
+    packet_id: int,
+    semaphore: asyncio.Semaphore,
+    request_db: AsyncSession,
+) -> schemas.PacketSegment:
+    """
+    Runs one segment through its processor in its own session so segments can
+    be processed concurrently. The session reuses the ownership checks and the
+    primary pin of the request's session (`request_db`, which it does not query).
+    """
+    with PACKET_SEGMENTS_WAITING.track_inprogress():
+        await semaphore.acquire()
+    try:
+        document_type = segment.document_type
+        try:
+            async with SessionLocal() as session:
+                share_access(request_db, session)
+                share_request(request_db, session)
+                if document_type is None:
+                    # The local classifier was unsure; ask the model
+                    openai_service = OpenAIService()
+                    try:
+                        classified = await openai_service.determine_document_type(segment.text)
+                    finally:
+                        record_usage(session, owner_id, "classification", openai_service.usage)
+                        await session.commit()
+                    document_type = classified.lower() if classified else None
+                processor = PROCESSORS.get(document_type)
+                if processor is None:
+                    raise ValueError("Could not determine document type.")
+
+                record = await processor(
+                    file_content=b"",
+                    filename=filename,
+                    property_id=property_id,
+                    document_type=document_type.capitalize(),
+                    db=session,
+                    owner_id=owner_id,
+                    text=segment.text,
+                    packet_id=packet_id,
+                )
+            return schemas.PacketSegment(
+                document_type=document_type,
+                start_page=segment.start_page,
+                end_page=segment.end_page,
+                record_id=record.id,
+            )
+        except ExtractionPendingError as e:
+            return schemas.PacketSegment(
+                document_type=document_type,
+                start_page=segment.start_page,
+                end_page=segment.end_page,
+                pending_document_id=e.document_id,
+            )
+        except Exception as e:
+            logger.error(
+                f"Failed to process pages {segment.start_page}-{segment.end_page} "
+                f"of packet {packet_id}: {e}"
+            )
+            return schemas.PacketSegment(
+                document_type=document_type or "unknown",
+                start_page=segment.start_page,
+                end_page=segment.end_page,
+                error=getattr(e, "detail", None) or str(e),
+            )
+    finally:
+        semaphore.release()
+
+
+@log_timing("Packet Processing")
+async def process_packet_upload(
+    file_content: bytes,
+    filename: str,
+    property_id: int,
+    db: AsyncSession,
+    owner_id: int
+) -> schemas.DocumentPacket:
+    """
+    Splits a multi-document upload into its documents and processes each one
+    with the matching processor. All resulting documents are linked to one packet.
+    """
+    pages = extract_pages_from_file(BytesIO(file_content), filename)
+    if not pages:
+        raise ValueError("Could not extract text from the document.")
+
+    segments = segment_pages(pages)
+    logger.info(
+        f"Split {filename} into {len(segments)} segments: "
+        + ", ".join(f"{s.document_type or 'unknown'} p{s.start_page}-{s.end_page}" for s in segments)
+    )
+
+    packet = DocumentPacket(
+        owner_id=owner_id,
+        property_id=property_id,
+        filename=filename,
+        page_count=len(pages),
+    )
+    db.add(packet)
+    await db.commit()
+    # Segments run in their own sessions; this one waits without a connection
+    await release_connection(db)
+
+    semaphore = asyncio.Semaphore(settings.PACKET_MAX_CONCURRENCY)
+    results = await asyncio.gather(*[
+        _process_segment(segment, filename, property_id, owner_id, packet.id, semaphore, db)
+        for segment in segments
+    ])
+
+    packet_schema = schemas.DocumentPacket.model_validate(packet, from_attributes=True)
+    packet_schema.segments = list(results)
+    return packet_schema
@@ -0,0 +1,111 @@
+# app/services/pending_extraction.py
+
+import logging
+from typing import List, Optional
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import schemas, crud
+from app.services.document_processor import ExtractedPage
+from app.services.duplicate_detection import ImageHashes, store_image_hashes
+from app.services.openai.circuit_breaker import LLMUnavailableError, llm_breaker
+from app.services.openai.model_router import UsageRecord
+from app.services.usage_accounting import record_usage
+from app.utils.tracing import current_trace_context
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionPendingError(Exception):
+    """
+    Raised by a processor after it stored an upload for later extraction because
+    the model provider was unavailable.
+    """
+
+    def __init__(self, document_id: int):
+        self.document_id = document_id
+        super().__init__(
+            "The document was saved, but information extraction is temporarily unavailable. "
+            "It will be processed automatically."
+        )
+
+
+async def defer_extraction(
+    db: AsyncSession,
+    owner_id: int,
+    property_id: Optional[int],
+    document_type: str,
+    text: str,
+    pages: Optional[List[ExtractedPage]] = None,
+    packet_id: Optional[int] = None,
+    image_hashes: Optional[ImageHashes] = None,
+    filename: Optional[str] = None,
+    usage: Optional[List[UsageRecord]] = None
+) -> ExtractionPendingError:
+    """
+    Stores an upload as a pending document so the OCR work is kept, and returns
+    the error for the processor to raise.
+
+    Args:
+        db (AsyncSession): The database session.
+        owner_id (int): The owner of the upload.
+        property_id (Optional[int]): The property the upload belongs to, if known.
+        document_type (str): The confirmed document type.
+        text (str): The OCR text.
+        pages (List[ExtractedPage], optional): Page fingerprints of PDF uploads.
+        packet_id (int, optional): The packet the upload was split from.
+        image_hashes (ImageHashes, optional): Perceptual hashes of invoice images.
+        filename (str, optional): Name of the uploaded file.
+        usage (List[UsageRecord], optional): Model calls made before the provider failed.
+
+    Returns:
+        ExtractionPendingError: The error carrying the pending document's id.
+    """
+    # The failed request may have left the session mid-transaction
+    await db.rollback()
+    document_in = schemas.DocumentCreate(
+        property_id=property_id,
+        document_type=document_type,
+        packet_id=packet_id
+    )
+    document = await crud.crud_document.create_pending_document(
+        db=db,
+        document_in=document_in,
+        owner_id=owner_id,
+        extracted_text=text,
+        pages=pages,
+        trace_parent=current_trace_context()
+    )
+    if image_hashes:
+        store_image_hashes(
+            db=db,
+            owner_id=owner_id,
+            hashes=image_hashes,
+            filename=filename,
+            document_id=document.id
+        )
+    record_usage(db, owner_id, "extraction", usage or [], document_id=document.id)
+    await db.commit()
+    logger.warning(f"Model provider unavailable; stored document {document.id} for later extraction.")
+    return ExtractionPendingError(document.id)
+
+
+def pending_extraction_response(error: ExtractionPendingError) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "document_id": error.document_id,
+            "status": crud.PENDING_EXTRACTION,
+            "detail": str(error),
+        },
+    )
+
+
+def llm_unavailable_exception(error: LLMUnavailableError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(error),
+        headers={"Retry-After": str(llm_breaker.retry_after or int(llm_breaker.reset_timeout))},
+    )
@@ -0,0 +1,140 @@
+# app/services/pipeline_telemetry.py
+
+import asyncio
+import inspect
+import logging
+import os
+from functools import wraps
+from typing import Optional
+
+from fastapi import HTTPException
+
+from app import crud
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.document_telemetry import DocumentTelemetry
+from app.services.duplicate_detection import DuplicateDocumentError
+from app.services.openai.circuit_breaker import LLMUnavailableError
+from app.services.pending_extraction import ExtractionPendingError
+from app.services.usage_accounting import BudgetExceededError
+from app.utils.metrics import INGEST_IN_PROGRESS
+from app.utils.timing import StageTimer, current_stage_timer, stage_timer
+
+logger = logging.getLogger(__name__)
+
+PROCESSED = "processed"
+METRIC_DOCUMENT_TYPES = {"lease", "invoice", "contract"}
+
+
+def classify_outcome(error: Optional[Exception]) -> str:
+    if error is None:
+        return PROCESSED
+    if isinstance(error, ExtractionPendingError):
+        return "pending_extraction"
+    if isinstance(error, DuplicateDocumentError):
+        return "duplicate"
+    if isinstance(error, BudgetExceededError):
+        return "budget_exceeded"
+    if isinstance(error, LLMUnavailableError):
+        return "llm_unavailable"
+    if isinstance(error, ValueError) or (isinstance(error, HTTPException) and error.status_code < 500):
+        return "rejected"
+    return "failed"
+
+
+def _milliseconds(timer: StageTimer, stage: str) -> Optional[float]:
+    seconds = timer.durations.get(stage)
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+def build_telemetry(timer: StageTimer, arguments: dict, error: Optional[Exception]) -> DocumentTelemetry:
+    counters = timer.counters
+    llm_calls = counters.get("llm_calls", 0)
+    document_id = timer.labels.get("document_id")
+    if isinstance(error, ExtractionPendingError):
+        document_id = error.document_id
+    filename = arguments.get("filename") or ""
+    return DocumentTelemetry(
+        owner_id=arguments["owner_id"],
+        document_id=document_id,
+        packet_id=arguments.get("packet_id"),
+        document_type=str(arguments.get("document_type") or "unknown")[:50],
+        file_type=os.path.splitext(filename)[1].lower().lstrip(".")[:10] or None,
+        bytes=len(arguments.get("file_content") or b""),
+        pages=counters.get("pages", 0),
+        ocr_pages=counters.get("ocr_pages", 0),
+        text_layer_pages=counters.get("text_layer_pages", 0),
+        reused_pages=counters.get("reused_pages", 0),
+        read_ms=_milliseconds(timer, "read"),
+        ocr_ms=_milliseconds(timer, "ocr"),
+        classify_ms=_milliseconds(timer, "classify"),
+        extract_ms=_milliseconds(timer, "extract"),
+        map_ms=_milliseconds(timer, "map"),
+        db_ms=_milliseconds(timer, "db"),
+        total_ms=round(timer.elapsed * 1000, 1),
+        llm_calls=llm_calls,
+        llm_retries=max(0, llm_calls - 1),
+        prompt_tokens=counters.get("prompt_tokens", 0),
+        completion_tokens=counters.get("completion_tokens", 0),
+        cached_tokens=counters.get("cached_tokens", 0),
+        outcome=classify_outcome(error),
+        error=str(error)[:500] if error is not None else None,
+        resumed=arguments.get("document_id") is not None,
+    )
+
+
+async def save_telemetry(telemetry: DocumentTelemetry) -> None:
+    """
+    Writes the record in its own session, so it is kept even when the pipeline's
+    transaction was rolled back. Telemetry never fails an upload.
+    """
+    try:
+        async with SessionLocal() as session:
+            await crud.crud_document_telemetry.add_telemetry(db=session, telemetry=telemetry)
+    except Exception as e:
+        logger.error(f"Could not save document telemetry: {e}")
+
+
+def track_document(func):
+    """
+    Records a DocumentTelemetry row for every call of a process_*_upload function:
+    sizes, page counts, stage durations, tokens and the outcome.
+
+    Stages are reported to the active StageTimer by the pipeline itself
+    (log_timing(stage=...), begin_stage, count_stage). If the endpoint already
+    started a timer (e.g. to time reading the upload), this call takes it over.
+    """
+    signature = inspect.signature(func)
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        arguments = signature.bind_partial(*args, **kwargs).arguments
+        document_type = str(arguments.get("document_type") or "").lower()
+        # The form value is free text; keep the metric's label set fixed
+        label = document_type if document_type in METRIC_DOCUMENT_TYPES else "other"
+        with INGEST_IN_PROGRESS.labels(label).track_inprogress():
+            if not settings.DOCUMENT_TELEMETRY_ENABLED:
+                return await func(*args, **kwargs)
+            return await _run_tracked(func, args, kwargs, arguments)
+
+    return wrapper
+
+
+async def _run_tracked(func, args: tuple, kwargs: dict, arguments: dict):
+    timer = current_stage_timer()
+    if timer is None or timer.claimed:
+        timer = StageTimer()
+    timer.claimed = True
+
+    with stage_timer(timer):
+        try:
+            result = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            timer.finish()
+            await save_telemetry(build_telemetry(timer, arguments, e))
+            raise
+        timer.finish()
+        await save_telemetry(build_telemetry(timer, arguments, None))
+        return result
@@ -0,0 +1,126 @@
+# app/services/usage_accounting.py
+
+import logging
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.services.openai.model_router import UsageRecord
+from app.utils.timing import count_stage
+
+logger = logging.getLogger(__name__)
+
+
+class BudgetExceededError(ValueError):
+    """
+    Raised when an owner's model spend this month has reached their hard budget.
+    """
+
+
+def month_start(now: Optional[datetime] = None) -> datetime:
+    now = now or datetime.utcnow()
+    return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+async def get_owner_budget(db: AsyncSession, owner_id: int) -> Tuple[Optional[float], bool]:
+    """
+    Returns the owner's monthly limit (falling back to LLM_DEFAULT_MONTHLY_BUDGET)
+    and whether it is a hard limit.
+    """
+    budget = await crud.crud_llm_usage.get_budget(db=db, owner_id=owner_id)
+    if budget is not None:
+        return budget.monthly_limit, budget.hard_limit
+    return settings.LLM_DEFAULT_MONTHLY_BUDGET, True
+
+
+async def enforce_budget(db: AsyncSession, owner_id: int) -> None:
+    """
+    Raises BudgetExceededError before a model call if the owner's month-to-date
+    spend has reached a hard budget. Soft budgets only log a warning.
+    """
+    limit, hard_limit = await get_owner_budget(db, owner_id)
+    if limit is None:
+        return
+    spent = await crud.crud_llm_usage.get_cost_since(db=db, owner_id=owner_id, since=month_start())
+    if spent < limit:
+        return
+    if hard_limit:
+        raise BudgetExceededError(
+            f"The monthly document processing budget of ${limit:.2f} has been reached."
+        )
+    logger.warning(f"Owner {owner_id} is over their soft budget: ${spent:.4f} of ${limit:.2f}")
+
+
+def record_usage(
+    db: AsyncSession,
+    owner_id: int,
+    stage: str,
+    records: List[UsageRecord],
+    document_id: Optional[int] = None
+) -> None:
+    """
+    Adds the model calls collected by a service to the session and clears the list,
+    so a service instance used for several documents never records a call twice.
+    Written on the caller's next commit.
+    """
+    if not records:
+        return
+    crud.crud_llm_usage.add_usage(db=db, owner_id=owner_id, stage=stage, records=list(records), document_id=document_id)
+    _report_usage(owner_id, stage, records, document_id)
+    records.clear()
+
+
+async def save_usage(
+    owner_id: int,
+    stage: str,
+    records: List[UsageRecord],
+    document_id: Optional[int] = None
+) -> List[int]:
+    """
+    Writes the model calls in their own session and clears the list, so calls that
+    were paid for are kept even when the pipeline's transaction is rolled back.
+    Pass the returned ids to link_usage once the document exists.
+
+    Returns:
+        List[int]: The ids of the usage rows written.
+    """
+    if not records:
+        return []
+    batch = list(records)
+    records.clear()
+    _report_usage(owner_id, stage, batch, document_id)
+    try:
+        async with SessionLocal() as session:
+            rows = crud.crud_llm_usage.add_usage(
+                db=session, owner_id=owner_id, stage=stage, records=batch, document_id=document_id
+            )
+            await session.commit()
+            return [row.id for row in rows]
+    except Exception as e:
+        logger.error(f"Could not save model usage for owner {owner_id}: {e}")
+        return []
+
+
+async def link_usage(db: AsyncSession, usage_ids: List[int], document_id: int) -> None:
+    """
+    Links usage saved by save_usage to the document, in the caller's transaction.
+    """
+    await crud.crud_llm_usage.link_document(db=db, usage_ids=usage_ids, document_id=document_id)
+
+
+def _report_usage(owner_id: int, stage: str, records: List[UsageRecord], document_id: Optional[int]) -> None:
+    # Also counted towards the telemetry of the document being processed
+    count_stage("llm_calls", len(records))
+    count_stage("prompt_tokens", sum(r.prompt_tokens for r in records))
+    count_stage("completion_tokens", sum(r.completion_tokens for r in records))
+    count_stage("cached_tokens", sum(r.cached_tokens for r in records))
+    total = sum(record.cost for record in records)
+    logger.info(
+        f"{stage} for owner {owner_id} (document {document_id}): {len(records)} calls, "
+        f"{sum(r.prompt_tokens for r in records)} prompt / {sum(r.completion_tokens for r in records)} completion tokens, "
+        f"{sum(r.cached_tokens for r in records)} cached, ${total:.5f}"
+    )
@@ -0,0 +1,173 @@
+# app/utils/field_selection.py
+
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Query, status
+from fastapi.responses import JSONResponse
+from pydantic import create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, raiseload, selectinload
+
+FIELDS_DESCRIPTION = "Comma-separated fields to return. Relationship names may be listed here too."
+EXPAND_DESCRIPTION = "Comma-separated relationships to include. Empty for none."
+
+
+def _split(value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    if value is None:
+        return None
+    return tuple(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+
+
+@lru_cache(maxsize=None)
+def partial_schema(schema):
+    """
+    The response schema with every field optional, so a response restricted with
+    ?fields= validates and serializes only the selected fields.
+    """
+    fields = {name: (Optional[field.annotation], None) for name, field in schema.model_fields.items()}
+    return create_model(f"Partial{schema.__name__}", __base__=schema, **fields)
+
+
+@dataclass(frozen=True)
+class FieldSelection:
+    """
+    The fields of `schema` a response contains: fields backed by columns of `model`,
+    relationships, and any other schema fields (model properties or defaults).
+    """
+    schema: type
+    model: type
+    columns: Tuple[str, ...]
+    others: Tuple[str, ...]
+    relationships: Tuple[str, ...]
+    # Every schema field is selected, so the ORM object can go to the response model as-is
+    complete: bool
+
+    def load_options(self) -> list:
+        """
+        Query options fetching the selected columns and relationships only: other
+        columns are deferred and other relationships are never loaded.
+        """
+        mapper = inspect(self.model)
+        options = []
+        # Fields that are not plain columns may read any column, so keep them all
+        if not self.others:
+            keys = set(self.columns) | {mapper.get_property_by_column(column).key for column in mapper.primary_key}
+            for name in self.relationships:
+                # The selectin loader needs the foreign key (or primary key) on this side
+                local_columns = mapper.relationships[name].local_columns
+                keys.update(mapper.get_property_by_column(column).key for column in local_columns)
+            options.append(load_only(*(getattr(self.model, key) for key in keys)))
+        options.extend(selectinload(getattr(self.model, name)) for name in self.relationships)
+        options.append(raiseload("*"))
+        return options
+
+    def render(self, obj) -> dict:
+        names = self.columns + self.others + self.relationships
+        # Fields the model does not have keep the schema default, as with from_attributes
+        data = {name: getattr(obj, name) for name in names if hasattr(obj, name)}
+        return partial_schema(self.schema).model_validate(data).model_dump(mode="json", exclude_unset=True)
+
+    def respond(self, result):
+        """
+        Returns the query result for the endpoint: unchanged when the full schema is
+        selected, otherwise a JSON response holding the selected fields only.
+        """
+        if self.complete:
+            return result
+        if isinstance(result, (list, tuple)):
+            return JSONResponse(content=[self.render(obj) for obj in result])
+        return JSONResponse(content=self.render(result))
+
+
+class FieldSelector:
+    """
+    A dependency reading ?fields= and ?expand= for a response schema.
+
+    Without ?fields=, every scalar field is returned. Without ?expand=, the
+    relationships in `default_expand` are (all of the schema's relationships if
+    not given). Unknown names are rejected with 400.
+    """
+
+    def __init__(self, schema, model, default_expand: Optional[Sequence[str]] = None):
+        self.schema = schema
+        self.model = model
+        self._default_expand = tuple(default_expand) if default_expand is not None else None
+
+    # Resolved on first use: routers are imported before every model is, and
+    # inspecting relationships configures all mappers
+    @cached_property
+    def relationship_names(self) -> Tuple[str, ...]:
+        mapper = inspect(self.model)
+        return tuple(name for name in self.schema.model_fields if name in mapper.relationships)
+
+    @cached_property
+    def column_names(self) -> Tuple[str, ...]:
+        mapper = inspect(self.model)
+        return tuple(name for name in self.schema.model_fields if name in mapper.column_attrs)
+
+    @cached_property
+    def other_names(self) -> Tuple[str, ...]:
+        return tuple(
+            name for name in self.schema.model_fields
+            if name not in self.relationship_names and name not in self.column_names
+        )
+
+    @property
+    def default_expand(self) -> Tuple[str, ...]:
+        return self._default_expand if self._default_expand is not None else self.relationship_names
+
+    def __call__(
+        self,
+        fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+        expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION)
+    ) -> FieldSelection:
+        return self.select(_split(fields), _split(expand))
+
+    def default(self) -> FieldSelection:
+        return self.select(None, None)
+
+    def select(self, fields: Optional[Tuple[str, ...]], expand: Optional[Tuple[str, ...]]) -> FieldSelection:
+        known = set(self.schema.model_fields)
+        unknown = [name for name in (fields or ()) if name not in known]
+        unknown += [name for name in (expand or ()) if name not in self.relationship_names]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"Unknown field(s): {', '.join(unknown)}. Fields: {', '.join(self.schema.model_fields)}. "
+                    f"Expandable: {', '.join(self.relationship_names) or 'none'}"
+                )
+            )
+
+        if fields is None:
+            columns, others = self.column_names, self.other_names
+            expanded = set(expand if expand is not None else self.default_expand)
+        else:
+            columns = tuple(name for name in self.column_names if name in fields)
+            others = tuple(name for name in self.other_names if name in fields)
+            expanded = set(expand or ()) | {name for name in fields if name in self.relationship_names}
+        relationships = tuple(name for name in self.relationship_names if name in expanded)
+
+        complete = (
+            len(columns) == len(self.column_names)
+            and len(others) == len(self.other_names)
+            and len(relationships) == len(self.relationship_names)
+        )
+        return FieldSelection(
+            schema=self.schema,
+            model=self.model,
+            columns=columns,
+            others=others,
+            relationships=relationships,
+            complete=complete
+        )
+
+
+def query_options(selection: Optional[FieldSelection], *default) -> list:
+    """
+    The loader options for a CRUD read: the selection's, or the function's defaults
+    for callers that did not ask for specific fields.
+    """
+    return selection.load_options() if selection is not None else list(default)
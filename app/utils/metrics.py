@@ -0,0 +1,216 @@
+# app/utils/metrics.py
+
+import os
+import time
+import logging
+from typing import Any, Dict, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+logger = logging.getLogger(__name__)
+
+# Request latencies range from cached reads to multi-minute lease uploads
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+LLM_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 90, 120)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status code.", ["method", "route", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ["method", "route"],
+    buckets=LATENCY_BUCKETS
+)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests being served.", multiprocess_mode="livesum")
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a connection from the pool.",
+    buckets=POOL_WAIT_BUCKETS
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter("db_pool_checkout_timeouts_total", "Pool checkouts that timed out.")
+DB_POOL_CONNECTION_HELD = Histogram(
+    "db_pool_connection_held_seconds", "Time a connection stays checked out of the pool.",
+    buckets=LATENCY_BUCKETS
+)
+
+INGEST_IN_PROGRESS = Gauge(
+    "ingest_documents_in_progress", "Documents in an ingest pipeline, including those waiting for OCR.",
+    ["document_type"], multiprocess_mode="livesum"
+)
+OCR_IN_PROGRESS = Gauge("ocr_pages_in_progress", "Pages or images being OCRed.", multiprocess_mode="livesum")
+OCR_DURATION = Histogram("ocr_page_duration_seconds", "OCR time per page or image.", buckets=LATENCY_BUCKETS)
+PACKET_SEGMENTS_WAITING = Gauge(
+    "packet_segments_waiting", "Packet segments waiting for a processing slot.", multiprocess_mode="livesum"
+)
+
+LLM_LATENCY = Histogram(
+    "llm_call_duration_seconds", "Model call latency.", ["task", "model", "tier", "outcome"], buckets=LLM_BUCKETS
+)
+LLM_TOKENS = Counter("llm_tokens_total", "Model tokens by kind (prompt, completion, cached).", ["task", "model", "kind"])
+LLM_COST = Counter("llm_cost_usd_total", "Estimated model spend in USD.", ["task", "model"])
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    The default async pool, timing how long each checkout waits for a connection.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+class PoolCollector:
+    """
+    Reads each registered pool's size, checked-out and overflow connections at
+    scrape time, labelled by engine ('primary', 'replica-0', ...).
+    """
+
+    def __init__(self):
+        self.engines: Dict[str, Any] = {}
+
+    def collect(self):
+        size = GaugeMetricFamily("db_pool_size", "Configured pool size.", labels=["engine"])
+        checked_out = GaugeMetricFamily("db_pool_checked_out", "Connections checked out of the pool.", labels=["engine"])
+        overflow = GaugeMetricFamily("db_pool_overflow", "Connections open beyond the pool size.", labels=["engine"])
+        saturation = GaugeMetricFamily(
+            "db_pool_saturation", "Checked-out connections as a fraction of pool size plus overflow.",
+            labels=["engine"]
+        )
+        for name, engine in self.engines.items():
+            pool = engine.sync_engine.pool
+            if not isinstance(pool, AsyncAdaptedQueuePool):
+                continue
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            in_use = pool.checkedout()
+            size.add_metric([name], pool.size())
+            checked_out.add_metric([name], in_use)
+            overflow.add_metric([name], max(pool.overflow(), 0))
+            saturation.add_metric([name], in_use / capacity if capacity else 0.0)
+        yield size
+        yield checked_out
+        yield overflow
+        yield saturation
+
+
+_pool_collector: Optional[PoolCollector] = None
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    connection_record.info["checked_out_at"] = time.perf_counter()
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    started = connection_record.info.pop("checked_out_at", None)
+    if started is not None:
+        DB_POOL_CONNECTION_HELD.observe(time.perf_counter() - started)
+
+
+def register_pool_collector(engine, name: str = "primary") -> None:
+    global _pool_collector
+    pool = engine.sync_engine.pool
+    if not event.contains(pool, "checkout", _on_checkout):
+        event.listen(pool, "checkout", _on_checkout)
+        event.listen(pool, "checkin", _on_checkin)
+    if _pool_collector is None:
+        _pool_collector = PoolCollector()
+        try:
+            REGISTRY.register(_pool_collector)
+        except ValueError:
+            # Already registered (e.g. the app module was reloaded)
+            pass
+    _pool_collector.engines[name] = engine
+
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    # Unmatched paths share one label so scanners cannot blow up the series count
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request count, latency and in-flight requests,
+    labelled with the route template (/properties/{property_id}) rather than the path.
+    """
+
+    def __init__(self, app, excluded_paths: Optional[set] = None):
+        self.app = app
+        self.excluded_paths = excluded_paths or {"/metrics"}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            method = scope["method"]
+            route = _route_template(scope)
+            HTTP_LATENCY.labels(method, route).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+
+
+def render_metrics() -> tuple:
+    """
+    Returns the exposition body and content type. With several worker processes,
+    set PROMETHEUS_MULTIPROC_DIR so every worker's samples are aggregated.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def observe_llm_call(
+    task: str,
+    model: str,
+    tier: str,
+    latency: float,
+    prompt_tokens: int,
+    completion_tokens: int,
+    cached_tokens: int,
+    cost: float,
+    failed: bool
+) -> None:
+    LLM_LATENCY.labels(task, model, tier, "failure" if failed else "success").observe(latency)
+    if prompt_tokens:
+        LLM_TOKENS.labels(task, model, "prompt").inc(prompt_tokens)
+    if completion_tokens:
+        LLM_TOKENS.labels(task, model, "completion").inc(completion_tokens)
+    if cached_tokens:
+        LLM_TOKENS.labels(task, model, "cached").inc(cached_tokens)
+    if cost:
+        LLM_COST.labels(task, model).inc(cost)
@@ -0,0 +1,232 @@
+# app/utils/pagination.py
+
+import base64
+import binascii
+import json
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, List, Optional
+
+from fastapi import HTTPException, Query, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+
+from app.utils.field_selection import FieldSelection
+
+logger = logging.getLogger(__name__)
+
+MAX_PAGE_SIZE = 1000
+
+CURSOR_DESCRIPTION = (
+    "Keyset pagination: omit for offset mode (skip/limit, plain list), pass an empty "
+    "value for the first page and then each response's next_cursor."
+)
+
+
+@dataclass(frozen=True)
+class PageRequest:
+    limit: int = 100
+    skip: int = 0
+    # None: offset pagination (the original behaviour); otherwise keyset pagination
+    cursor: Optional[str] = None
+    include_total: bool = False
+
+    @property
+    def keyset(self) -> bool:
+        return self.cursor is not None
+
+
+@dataclass(frozen=True)
+class SortOrder:
+    """
+    A ?sort= value resolved against a model: the column, descending with a leading "-".
+    """
+    column: Any
+    descending: bool = False
+
+    @classmethod
+    def parse(cls, model, sort: Optional[str]) -> Optional["SortOrder"]:
+        if not sort:
+            return None
+        return cls(column=getattr(model, sort.lstrip("-")), descending=sort.startswith("-"))
+
+    @property
+    def name(self) -> str:
+        return f"{'-' if self.descending else ''}{self.column.key}"
+
+
+@dataclass
+class PageResult:
+    items: List[Any]
+    keyset: bool
+    next_cursor: Optional[str] = None
+    total_estimate: Optional[int] = None
+
+
+def page_params(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    include_total: bool = Query(False, description="Add an estimated total to cursor pages.")
+) -> PageRequest:
+    return PageRequest(limit=limit, skip=skip, cursor=cursor, include_total=include_total)
+
+
+def encode_cursor(key: str, value: Any) -> str:
+    payload = json.dumps({"k": key, "v": value}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor.")
+
+
+def decode_cursor(cursor: str, key: str) -> Optional[Any]:
+    """
+    Returns the key value the page starts after (None for the first page).
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or was issued for another ordering.
+    """
+    if not cursor:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if payload["k"] != key:
+            raise ValueError("cursor ordering mismatch")
+        return payload["v"]
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise _invalid_cursor()
+
+
+def ordering(key, sort: Optional[SortOrder]) -> tuple:
+    if sort is None:
+        return (key,)
+    column = sort.column.desc() if sort.descending else sort.column.asc()
+    # Rows without a value come last either way; the key makes the order total
+    return (column.nulls_last(), key)
+
+
+def _cursor_key(key, sort: Optional[SortOrder]) -> str:
+    return key.key if sort is None else f"{sort.name},{key.key}"
+
+
+def _from_json(column, value):
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type in (date, datetime):
+        return python_type.fromisoformat(value)
+    return python_type(value)
+
+
+def _after(key, sort: Optional[SortOrder], position):
+    """
+    The filter for rows following `position` (the last row's key, or its sort
+    value and key) in the ordering() order.
+    """
+    if sort is None:
+        try:
+            position = _from_json(key, position)
+        except (ValueError, TypeError):
+            raise _invalid_cursor()
+        return key > position
+    try:
+        value, last_key = position
+        value = _from_json(sort.column, value)
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
+    if value is None:
+        return and_(sort.column.is_(None), key > last_key)
+    beyond = sort.column < value if sort.descending else sort.column > value
+    return or_(beyond, and_(sort.column == value, key > last_key), sort.column.is_(None))
+
+
+async def estimate_count(db: AsyncSession, query) -> int:
+    """
+    The planner's row estimate for the query (EXPLAIN, no scan). Other databases
+    get an exact count.
+    """
+    dialect = db.get_bind().dialect
+    if dialect.name != "postgresql":
+        result = await db.execute(select(func.count()).select_from(query.order_by(None).subquery()))
+        return result.scalar_one()
+    # Bound, not inlined, so values are never parsed as SQL or as bind markers
+    compiled = query.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    connection = await db.connection()
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled.string}", params)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query,
+    key,
+    page: PageRequest,
+    sort: Optional[SortOrder] = None
+) -> PageResult:
+    """
+    Runs an owner-scoped list query ordered by `sort` (if given) and then by `key`
+    (an indexed, unique column).
+
+    In offset mode this is ORDER BY ... OFFSET skip LIMIT limit. In keyset mode the
+    page starts after the cursor's position, so it reads `limit` index entries
+    regardless of how deep it is, and pages stay stable while rows are added. A
+    cursor only continues the ordering it was issued for.
+    """
+    total = None
+    if page.keyset and page.include_total:
+        try:
+            total = await estimate_count(db, query)
+        except Exception as e:
+            logger.warning(f"Could not estimate the list size: {e}")
+
+    order = ordering(key, sort)
+    if not page.keyset:
+        result = await db.execute(query.order_by(*order).offset(page.skip).limit(page.limit))
+        return PageResult(items=list(result.unique().scalars().all()), keyset=False)
+
+    cursor_key = _cursor_key(key, sort)
+    if sort is not None:
+        # The next cursor reads the sort value, even when ?fields= leaves it out
+        query = query.options(undefer(sort.column))
+    position = decode_cursor(page.cursor, cursor_key)
+    if position is not None:
+        query = query.filter(_after(key, sort, position))
+    # One extra row tells whether there is a next page
+    result = await db.execute(query.order_by(*order).limit(page.limit + 1))
+    rows = list(result.unique().scalars().all())
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        last = rows[-1]
+        position = getattr(last, key.key)
+        if sort is not None:
+            position = [getattr(last, sort.column.key), position]
+        next_cursor = encode_cursor(cursor_key, position)
+    return PageResult(items=rows, keyset=True, next_cursor=next_cursor, total_estimate=total)
+
+
+def page_response(result: PageResult, selection: Optional[FieldSelection] = None):
+    """
+    The endpoint's return value: a plain list in offset mode, a Page envelope in
+    keyset mode, holding only the selected fields.
+    """
+    if not result.keyset:
+        return selection.respond(result.items) if selection is not None else result.items
+    if selection is None or selection.complete:
+        return {"items": result.items, "next_cursor": result.next_cursor, "total_estimate": result.total_estimate}
+    return JSONResponse(content={
+        "items": [selection.render(obj) for obj in result.items],
+        "next_cursor": result.next_cursor,
+        "total_estimate": result.total_estimate,
+    })
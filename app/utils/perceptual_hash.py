@@ -0,0 +1,95 @@
+# app/utils/perceptual_hash.py
+
+import numpy as np
+from PIL import Image
+
+def dhash(image: Image.Image, hash_size: int = 8) -> int:
+    """
+    Computes a difference hash: the image is shrunk to (hash_size + 1) x hash_size
+    grayscale pixels and each bit records whether a pixel is brighter than its
+    right-hand neighbour. Re-renders, rescans and recompressions of the same page
+    produce identical or nearly identical hashes.
+    """
+    resized = image.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS)
+    pixels = list(resized.getdata())
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+def hash_to_hex(value: int, hash_size: int = 8) -> str:
+    return f"{value:0{hash_size * hash_size // 4}x}"
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+def _dct_matrix(size: int) -> np.ndarray:
+    matrix = np.zeros((size, size))
+    for k in range(size):
+        scale = np.sqrt(1 / size) if k == 0 else np.sqrt(2 / size)
+        for n in range(size):
+            matrix[k, n] = scale * np.cos(np.pi * (2 * n + 1) * k / (2 * size))
+    return matrix
+
+_DCT_32 = _dct_matrix(32)
+
+def phash(image: Image.Image) -> int:
+    """
+    Computes a DCT-based perceptual hash: the 8x8 lowest frequencies of a 32x32
+    grayscale thumbnail, each compared with their median. More robust than dHash
+    to lighting and contrast changes between two photos of the same receipt.
+    """
+    pixels = np.asarray(image.convert("L").resize((32, 32), Image.LANCZOS), dtype=np.float64)
+    frequencies = (_DCT_32 @ pixels @ _DCT_32.T)[:8, :8].flatten()
+    # The DC term only encodes overall brightness
+    median = np.median(frequencies[1:])
+    value = 0
+    for coefficient in frequencies:
+        value = (value << 1) | int(coefficient > median)
+    return value
+
+class BKTree:
+    """
+    A Burkhard-Keller tree over 64-bit hashes for Hamming-distance range queries.
+    Each node's children are keyed by their distance to the node, so a query only
+    descends into children whose key is within the search radius of the query's distance.
+    """
+
+    def __init__(self):
+        self.root = None
+        self.size = 0
+
+    def add(self, value: int, item) -> None:
+        node = (value, item, {})
+        self.size += 1
+        if self.root is None:
+            self.root = node
+            return
+        current = self.root
+        while True:
+            distance = hamming_distance(value, current[0])
+            child = current[2].get(distance)
+            if child is None:
+                current[2][distance] = node
+                return
+            current = child
+
+    def search(self, value: int, max_distance: int) -> list:
+        """
+        Returns (distance, item) pairs within max_distance of value, closest first.
+        """
+        if self.root is None:
+            return []
+        matches = []
+        stack = [self.root]
+        while stack:
+            node_value, item, children = stack.pop()
+            distance = hamming_distance(value, node_value)
+            if distance <= max_distance:
+                matches.append((distance, item))
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        return sorted(matches, key=lambda match: match[0])
@@ -0,0 +1,24 @@
+# app/utils/related.py
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.interfaces import MANYTOONE
+
+
+async def attach_related(db: AsyncSession, obj, *names: str) -> None:
+    """
+    Sets the named many-to-one relationships of a just-written object to the rows
+    its foreign keys point at, so the response can serialize them without a
+    refresh. Rows already in the session's identity map (e.g. the property the
+    ownership check loaded) cost no query; others are fetched by primary key.
+    """
+    mapper = inspect(obj).mapper
+    for name in names:
+        relationship = mapper.relationships[name]
+        if relationship.direction is not MANYTOONE:
+            raise ValueError(f"{mapper.class_.__name__}.{name} is not a many-to-one relationship.")
+        (column,) = relationship.local_columns
+        value = getattr(obj, mapper.get_property_by_column(column).key)
+        target = await db.get(relationship.mapper.class_, value) if value is not None else None
+        set_committed_value(obj, name, target)
@@ -1,27 +1,154 @@
 # app/utils/timing.py
 import time
 import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import wraps
+from typing import Any, Dict, Optional
 import asyncio
 
+from app.utils.tracing import span
+
 logger = logging.getLogger(__name__)
 
-def log_timing(step_name):
+
+class StageTimer:
+    """
+    Collects per-stage durations and counters (pages, tokens, ...) for the document
+    being processed. The active timer lives in a context variable, so code deep in
+    the pipeline can report to it without being passed a handle.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.labels: Dict[str, Any] = {}
+        # Set once a document's telemetry owns this timer
+        self.claimed = False
+        self._open_stage: Optional[tuple] = None
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.durations[stage] = self.durations.get(stage, 0.0) + seconds
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def begin(self, name: str) -> None:
+        """
+        Starts a stage that runs until the next `begin` or `finish`, for sequential
+        steps that do not fit in one block.
+        """
+        self.finish()
+        self._open_stage = (name, time.perf_counter())
+
+    def finish(self) -> None:
+        if self._open_stage is not None:
+            name, started = self._open_stage
+            self.add(name, time.perf_counter() - started)
+            self._open_stage = None
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+_stage_timer: ContextVar[Optional[StageTimer]] = ContextVar("stage_timer", default=None)
+
+
+def current_stage_timer() -> Optional[StageTimer]:
+    return _stage_timer.get()
+
+
+def start_stage_timer() -> StageTimer:
+    """
+    Starts a timer for the rest of the current request (or task).
+    """
+    timer = StageTimer()
+    _stage_timer.set(timer)
+    return timer
+
+
+@contextmanager
+def stage_timer(timer: Optional[StageTimer] = None):
+    """
+    Makes `timer` (or a new one) the active timer inside the block.
+    """
+    timer = timer or StageTimer()
+    token = _stage_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _stage_timer.reset(token)
+
+
+@contextmanager
+def timed_stage(name: str):
+    """
+    Adds the time spent in the block to a stage of the active timer, if any.
+    """
+    timer = _stage_timer.get()
+    if timer is None:
+        yield
+        return
+    with timer.stage(name):
+        yield
+
+
+def begin_stage(name: str) -> None:
+    timer = _stage_timer.get()
+    if timer is not None:
+        timer.begin(name)
+
+
+def count_stage(name: str, amount: int = 1) -> None:
+    timer = _stage_timer.get()
+    if timer is not None:
+        timer.count(name, amount)
+
+
+def label_stage_timer(name: str, value: Any) -> None:
+    timer = _stage_timer.get()
+    if timer is not None:
+        timer.labels[name] = value
+
+
+def log_timing(step_name, stage: Optional[str] = None):
+    """
+    Logs how long the decorated function took, in a tracing span named after the
+    step. With `stage`, the duration is also added to that stage of the active StageTimer.
+    """
+    def record(duration):
+        timer = _stage_timer.get()
+        if stage and timer is not None:
+            timer.add(stage, duration)
+
     def decorator(func):
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
             start_time = time.time()
             logger.info(f"Starting {step_name}...")
             try:
-                if asyncio.iscoroutinefunction(func):
-                    result = await func(*args, **kwargs)
-                else:
-                    result = func(*args, **kwargs)
+                with span(step_name, {"pipeline.stage": stage}):
+                    if asyncio.iscoroutinefunction(func):
+                        result = await func(*args, **kwargs)
+                    else:
+                        result = func(*args, **kwargs)
                 duration = time.time() - start_time
+                record(duration)
                 logger.info(f"Completed {step_name} in {duration:.2f} seconds")
                 return result
             except Exception as e:
                 duration = time.time() - start_time
+                record(duration)
                 logger.error(f"Error in {step_name} after {duration:.2f} seconds: {str(e)}")
                 raise
 
@@ -30,12 +157,15 @@ def log_timing(step_name):
             start_time = time.time()
             logger.info(f"Starting {step_name}...")
             try:
-                result = func(*args, **kwargs)
+                with span(step_name, {"pipeline.stage": stage}):
+                    result = func(*args, **kwargs)
                 duration = time.time() - start_time
+                record(duration)
                 logger.info(f"Completed {step_name} in {duration:.2f} seconds")
                 return result
             except Exception as e:
                 duration = time.time() - start_time
+                record(duration)
                 logger.error(f"Error in {step_name} after {duration:.2f} seconds: {str(e)}")
                 raise
 
@@ -43,4 +173,4 @@ def log_timing(step_name):
             return async_wrapper
         return sync_wrapper
 
-    return decorator
\ No newline at end of file
+    return decorator
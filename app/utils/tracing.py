@@ -0,0 +1,109 @@
+# app/utils/tracing.py
+
+import logging
+from contextlib import contextmanager
+from typing import List, Optional
+
+from opentelemetry import propagate, trace
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# A proxy until configure_tracing installs a provider; spans are no-ops before that
+tracer = trace.get_tracer("spaceify")
+
+_provider = None
+
+
+@contextmanager
+def span(name: str, attributes: Optional[dict] = None, links: Optional[List[trace.Link]] = None):
+    """
+    Runs the block in a child span of the current one. Exceptions leaving the block
+    are recorded on the span and mark it as failed.
+    """
+    attributes = {key: value for key, value in (attributes or {}).items() if value is not None}
+    with tracer.start_as_current_span(name, attributes=attributes, links=links) as current:
+        yield current
+
+
+def current_trace_context() -> Optional[str]:
+    """
+    Returns the W3C traceparent of the current span, to be stored with work that
+    runs later (e.g. a document deferred to the extraction worker).
+    """
+    carrier: dict = {}
+    propagate.inject(carrier)
+    return carrier.get("traceparent")
+
+
+def links_to(traceparent: Optional[str]) -> List[trace.Link]:
+    """
+    Links to the span a stored traceparent came from. Deferred work starts its own
+    trace and links back, rather than extending a request trace by minutes.
+    """
+    if not traceparent:
+        return []
+    context = propagate.extract({"traceparent": traceparent})
+    span_context = trace.get_current_span(context).get_span_context()
+    return [trace.Link(span_context)] if span_context.is_valid else []
+
+
+def _exporter():
+    if settings.TRACING_EXPORTER == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+    if settings.TRACING_EXPORTER == "console":
+        return ConsoleSpanExporter()
+    # One JSON span per line, readable offline or importable into a collector
+    return ConsoleSpanExporter(
+        out=open(settings.TRACING_FILE_PATH, "a", encoding="utf-8"),
+        formatter=lambda finished: finished.to_json(indent=None) + "\n"
+    )
+
+
+def configure_tracing(app, engines: list) -> None:
+    """
+    Installs the tracer provider and instruments FastAPI routes and every SQL
+    statement on the engines (the primary and any read replicas). Does nothing
+    unless TRACING_ENABLED is set.
+
+    Sampling is decided once per trace at its root (TRACING_SAMPLE_RATIO); child
+    spans, including those in tasks started from a traced request, follow it.
+    """
+    global _provider
+    if not settings.TRACING_ENABLED or _provider is not None:
+        return
+
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO))
+    )
+    _provider.add_span_processor(BatchSpanProcessor(_exporter()))
+    trace.set_tracer_provider(_provider)
+
+    FastAPIInstrumentor.instrument_app(app, tracer_provider=_provider, excluded_urls="metrics")
+    SQLAlchemyInstrumentor().instrument(
+        engines=[engine.sync_engine for engine in engines], tracer_provider=_provider
+    )
+    logger.info(
+        f"Tracing enabled ({settings.TRACING_EXPORTER} exporter, sample ratio {settings.TRACING_SAMPLE_RATIO})."
+    )
+
+
+def shutdown_tracing() -> None:
+    """
+    Flushes spans still waiting in the batch processor.
+    """
+    global _provider
+    if _provider is not None:
+        _provider.shutdown()
+        _provider = None
@@ -0,0 +1,390 @@
+# benchmarks/evaluation.py
+"""
+Extraction quality evaluation against a labeled golden set.
+
+Every case in benchmarks/golden/ holds a document (inline "text", or a "document"
+file in benchmarks/documents/ that goes through text extraction first), its
+document type, and the expected output of the map_*_data function. Each
+variant in the variants file runs OpenAIService.extract_information and the
+mapping over every case, and the report gives field-level accuracy next to
+latency, tokens and cost, then names the cheapest variant that meets the
+accuracy target.
+
+A variant overrides settings (e.g. LLM_FAST_MODEL or LLM_TASK_TIERS) and/or
+prompts, e.g.:
+    {"name": "lease-v3", "prompts": {"lease": {"version": 3, "instructions_file": "prompts/lease_v3.txt"}}}
+Paths are relative to the variants file.
+
+Model calls use the configured LLM_PROVIDER (replay works for repeatable runs)
+and are spread over --requests-per-minute.
+
+Usage:
+    python -m benchmarks.evaluation --target 0.95
+    python -m benchmarks.evaluation --variants my_variants.json --repeats 3 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime
+from io import BytesIO
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.services.document_processor import extract_text_from_file
+from app.services.mapping_functions import map_contract_data, map_invoice_data, map_lease_data, parse_json
+from app.services.openai.llm_client import ModelClient, ModelResponse
+from app.services.openai.openai_document import OpenAIService
+from app.services.openai.prompts import compile_prompts
+from benchmarks.metrics import percentile
+from benchmarks.samples import BUNDLED_SAMPLES_DIR
+
+logger = logging.getLogger("benchmarks")
+
+BENCHMARKS_DIR = os.path.dirname(__file__)
+GOLDEN_DIR = os.path.join(BENCHMARKS_DIR, "golden")
+DEFAULT_VARIANTS = os.path.join(BENCHMARKS_DIR, "variants.json")
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, "results")
+MAPPERS = {"lease": map_lease_data, "invoice": map_invoice_data, "contract": map_contract_data}
+NUMBER_PATTERN = re.compile(r"^\$?\s*-?[\d,]*\.?\d+$")
+
+
+@dataclass
+class GoldenCase:
+    name: str
+    document_type: str
+    expected: Dict[str, Any]
+    text: Optional[str] = None
+    document: Optional[str] = None
+
+
+@dataclass
+class CaseResult:
+    variant: str
+    case: str
+    document_type: str
+    fields: int = 0
+    correct: int = 0
+    mismatches: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    latency_s: float = 0.0
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    cost: float = 0.0
+    models: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def load_golden_cases(directory: str = GOLDEN_DIR) -> List[GoldenCase]:
+    cases = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(".json"):
+            continue
+        with open(os.path.join(directory, filename), encoding="utf-8") as f:
+            data = json.load(f)
+        cases.append(GoldenCase(
+            name=os.path.splitext(filename)[0],
+            document_type=data["document_type"],
+            expected=data["expected"],
+            text=data.get("text"),
+            document=data.get("document"),
+        ))
+    return cases
+
+
+def case_text(case: GoldenCase) -> Optional[str]:
+    if case.text is not None:
+        return case.text
+    with open(os.path.join(BUNDLED_SAMPLES_DIR, case.document), "rb") as f:
+        return extract_text_from_file(BytesIO(f.read()), case.document)
+
+
+def flatten(value: Any, prefix: str = "") -> Dict[str, Any]:
+    """
+    Flattens nested dicts and lists into {"tenant_info.email": ..., "line_items[0].quantity": ...}.
+    """
+    if isinstance(value, dict):
+        items = {}
+        for key, child in value.items():
+            items.update(flatten(child, f"{prefix}.{key}" if prefix else str(key)))
+        return items
+    if isinstance(value, list):
+        items = {}
+        for index, child in enumerate(value):
+            items.update(flatten(child, f"{prefix}[{index}]"))
+        return items
+    return {prefix: value}
+
+
+def normalize(value: Any) -> Any:
+    """
+    Makes equivalent values compare equal: missing markers become None, amounts
+    become floats, and strings ignore case, spacing and trailing punctuation.
+    """
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()[:10]
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        return round(float(value), 2)
+    text = str(value).strip()
+    if text.lower() in {"", "not found", "none", "null", "n/a"}:
+        return None
+    if NUMBER_PATTERN.match(text):
+        return round(float(text.replace("$", "").replace(",", "").strip()), 2)
+    return re.sub(r"\s+", " ", text).lower().rstrip(".,;")
+
+
+def score_fields(expected: Dict[str, Any], actual: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Returns the expected fields whose actual value differs, with both values.
+    Fields the golden case does not label are not scored.
+    """
+    actual_fields = flatten(actual)
+    mismatches = {}
+    for path, expected_value in flatten(expected).items():
+        actual_value = actual_fields.get(path)
+        if normalize(expected_value) != normalize(actual_value):
+            mismatches[path] = {"expected": expected_value, "actual": actual_value}
+    return mismatches
+
+
+class RateLimiter:
+    """
+    Spaces out requests so a run stays within a requests-per-minute budget.
+    """
+
+    def __init__(self, requests_per_minute: float):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self.next_slot = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if not self.interval:
+            return
+        async with self.lock:
+            now = time.monotonic()
+            wait = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class RateLimitedModelClient(ModelClient):
+    def __init__(self, client: ModelClient, limiter: RateLimiter):
+        self.client = client
+        self.limiter = limiter
+
+    async def complete(self, messages: list, model: str, timeout: float, task: str) -> ModelResponse:
+        await self.limiter.acquire()
+        return await self.client.complete(messages, model=model, timeout=timeout, task=task)
+
+
+@contextmanager
+def apply_variant(variant: Dict[str, Any], base_dir: str):
+    """
+    Applies a variant's settings and prompt overrides, restoring both afterwards.
+    """
+    saved_settings = {name: getattr(settings, name) for name in variant.get("settings", {})}
+    registry = compile_prompts()
+    saved_prompts = {name: registry.get(name) for name in variant.get("prompts", {})}
+    try:
+        for name, value in variant.get("settings", {}).items():
+            setattr(settings, name, value)
+        for name, override in variant.get("prompts", {}).items():
+            override = dict(override)
+            instructions_file = override.pop("instructions_file", None)
+            if instructions_file:
+                with open(os.path.join(base_dir, instructions_file), encoding="utf-8") as f:
+                    override["instructions"] = f.read()
+            registry[name] = replace(registry[name], compiled_version=None, **override).compile()
+        yield
+    finally:
+        for name, value in saved_settings.items():
+            setattr(settings, name, value)
+        for name, template in saved_prompts.items():
+            registry[name] = template
+
+
+def _serializable(value: Any) -> Any:
+    return json.loads(json.dumps(value, default=lambda v: v.isoformat() if isinstance(v, (date, datetime)) else str(v)))
+
+
+async def evaluate_case(variant: str, case: GoldenCase, text: str, limiter: RateLimiter) -> CaseResult:
+    result = CaseResult(variant=variant, case=case.name, document_type=case.document_type)
+    service = OpenAIService()
+    service.client = RateLimitedModelClient(service.client, limiter)
+    started = time.perf_counter()
+    try:
+        extracted = await service.extract_information(text, case.document_type)
+        mapped = MAPPERS[case.document_type](parse_json(json.dumps(extracted))) if extracted else {}
+        result.mismatches = _serializable(score_fields(case.expected, mapped))
+    except Exception as e:
+        logger.error(f"{variant}/{case.name} failed: {e}")
+        result.error = str(e)
+        result.mismatches = {path: {"expected": value, "actual": None} for path, value in flatten(case.expected).items()}
+    result.latency_s = time.perf_counter() - started
+
+    result.fields = len(flatten(case.expected))
+    result.correct = result.fields - len(result.mismatches)
+    for record in service.usage:
+        result.calls += 1
+        result.prompt_tokens += record.prompt_tokens
+        result.completion_tokens += record.completion_tokens
+        result.cached_tokens += record.cached_tokens
+        result.cost += record.cost
+        if record.model not in result.models:
+            result.models.append(record.model)
+    return result
+
+
+async def evaluate_variant(
+    variant: Dict[str, Any],
+    cases: List[GoldenCase],
+    texts: Dict[str, str],
+    repeats: int,
+    concurrency: int,
+    limiter: RateLimiter
+) -> List[CaseResult]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(case: GoldenCase) -> CaseResult:
+        async with semaphore:
+            return await evaluate_case(variant["name"], case, texts[case.name], limiter)
+
+    return await asyncio.gather(*(run(case) for case in cases for _ in range(repeats)))
+
+
+def summarize(variant: Dict[str, Any], results: List[CaseResult]) -> Dict[str, Any]:
+    fields = sum(r.fields for r in results)
+    latencies = [r.latency_s for r in results]
+    by_type: Dict[str, List[CaseResult]] = {}
+    field_misses: Dict[str, int] = {}
+    for r in results:
+        by_type.setdefault(r.document_type, []).append(r)
+        for path in r.mismatches:
+            key = f"{r.document_type}:{path}"
+            field_misses[key] = field_misses.get(key, 0) + 1
+    cost = sum(r.cost for r in results)
+    return {
+        "name": variant["name"],
+        "description": variant.get("description"),
+        "documents": len(results),
+        "errors": sum(1 for r in results if r.error),
+        "accuracy": round(sum(r.correct for r in results) / fields, 4) if fields else None,
+        "accuracy_by_type": {
+            document_type: round(sum(r.correct for r in rs) / max(1, sum(r.fields for r in rs)), 4)
+            for document_type, rs in sorted(by_type.items())
+        },
+        "latency_p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "latency_p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "calls": sum(r.calls for r in results),
+        "prompt_tokens": sum(r.prompt_tokens for r in results),
+        "completion_tokens": sum(r.completion_tokens for r in results),
+        "cached_tokens": sum(r.cached_tokens for r in results),
+        "cost_usd": round(cost, 6),
+        "cost_per_document_usd": round(cost / len(results), 6) if results else None,
+        "models": sorted({model for r in results for model in r.models}),
+        "most_missed_fields": dict(sorted(field_misses.items(), key=lambda item: -item[1])[:10]),
+    }
+
+
+def recommend(summaries: List[Dict[str, Any]], target: float, max_p95_ms: Optional[float]) -> Optional[Dict[str, Any]]:
+    """
+    The cheapest variant per document that meets the accuracy target (and latency limit, if given).
+    """
+    eligible = [
+        s for s in summaries
+        if s["accuracy"] is not None and s["accuracy"] >= target
+        and (max_p95_ms is None or s["latency_p95_ms"] <= max_p95_ms)
+    ]
+    return min(eligible, key=lambda s: (s["cost_per_document_usd"], s["latency_p95_ms"]), default=None)
+
+
+async def run_evaluation(args: argparse.Namespace) -> Dict[str, Any]:
+    with open(args.variants, encoding="utf-8") as f:
+        variants = json.load(f)
+    if args.only:
+        wanted = {name.strip() for name in args.only.split(",")}
+        variants = [variant for variant in variants if variant["name"] in wanted]
+    cases = load_golden_cases(args.golden)
+    # Text extraction is not what is being compared, so each document is read once
+    texts = {case.name: case_text(case) or "" for case in cases}
+    limiter = RateLimiter(args.requests_per_minute)
+    base_dir = os.path.dirname(os.path.abspath(args.variants))
+
+    summaries, cases_out = [], []
+    for variant in variants:
+        logger.info(f"Evaluating variant {variant['name']} on {len(cases)} cases")
+        with apply_variant(variant, base_dir):
+            results = await evaluate_variant(variant, cases, texts, args.repeats, args.concurrency, limiter)
+        summaries.append(summarize(variant, results))
+        cases_out.extend(r.__dict__ for r in results)
+
+    best = recommend(summaries, args.target, args.max_p95_ms)
+    return {
+        "run": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "llm_provider": settings.LLM_PROVIDER,
+            "cases": [case.name for case in cases],
+            "repeats": args.repeats,
+            "target": args.target,
+            "max_p95_ms": args.max_p95_ms,
+        },
+        "variants": summaries,
+        "recommended": best["name"] if best else None,
+        "cases": cases_out,
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"{'variant':<24}{'accuracy':>10}{'p50 ms':>10}{'p95 ms':>10}{'calls':>7}{'tokens':>10}{'$/doc':>11}")
+    for s in report["variants"]:
+        tokens = s["prompt_tokens"] + s["completion_tokens"]
+        print(
+            f"{s['name']:<24}{s['accuracy']:>10}{s['latency_p50_ms']:>10}{s['latency_p95_ms']:>10}"
+            f"{s['calls']:>7}{tokens:>10}{s['cost_per_document_usd']:>11}"
+        )
+        for path, misses in s["most_missed_fields"].items():
+            print(f"    missed {misses}x  {path}")
+    if report["recommended"]:
+        print(f"\nCheapest variant meeting the target: {report['recommended']}")
+    else:
+        print("\nNo variant meets the target.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Evaluate extraction accuracy, latency and cost across variants.")
+    parser.add_argument("--variants", default=DEFAULT_VARIANTS)
+    parser.add_argument("--only", default="", help="Comma-separated variant names to run")
+    parser.add_argument("--golden", default=GOLDEN_DIR)
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests-per-minute", type=float, default=60, help="0 disables rate limiting")
+    parser.add_argument("--target", type=float, default=0.95, help="Minimum field accuracy")
+    parser.add_argument("--max-p95-ms", type=float, default=None)
+    parser.add_argument("--output", help="Report file (default: benchmarks/results/eval-<timestamp>.json)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    report = asyncio.run(run_evaluation(args))
+    print_report(report)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"eval-{datetime.utcnow():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/metrics.py
+
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of a list of values.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of this process. ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+class StageTimings:
+    """
+    Collects wall-clock and CPU time per stage across iterations.
+    """
+
+    def __init__(self):
+        self.wall: Dict[str, List[float]] = {}
+        self.cpu: Dict[str, float] = {}
+        self.pages: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+
+    @contextmanager
+    def measure(self, stage: str, pages: int = 0):
+        started_wall = time.perf_counter()
+        started_cpu = time.process_time()
+        try:
+            yield
+        except Exception:
+            self.errors[stage] = self.errors.get(stage, 0) + 1
+            raise
+        finally:
+            # CPU time is process-wide, so it includes other tasks running at the same time
+            self.cpu[stage] = self.cpu.get(stage, 0.0) + time.process_time() - started_cpu
+            self.wall.setdefault(stage, []).append(time.perf_counter() - started_wall)
+            self.pages[stage] = self.pages.get(stage, 0) + pages
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        stages = {}
+        for stage, values in self.wall.items():
+            total = sum(values)
+            stages[stage] = {
+                "count": len(values),
+                "errors": self.errors.get(stage, 0),
+                "mean_ms": round(total / len(values) * 1000, 2),
+                "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+                "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+                "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+                "max_ms": round(max(values) * 1000, 2),
+                "cpu_ms": round(self.cpu.get(stage, 0.0) * 1000, 2),
+                "pages": self.pages.get(stage, 0),
+                "pages_per_sec": round(self.pages[stage] / total, 2) if self.pages.get(stage) and total else None,
+            }
+        return stages
+
+
+def resource_usage() -> Dict[str, float]:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return {
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "cpu_user_s": round(usage.ru_utime, 3),
+        "cpu_system_s": round(usage.ru_stime, 3),
+    }
+
+
+def compare(previous: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """
+    Lines describing how p50/p95 latency, throughput and peak RSS changed per stage between two results.
+    """
+    lines = []
+    for stage, now in current["stages"].items():
+        before = previous.get("stages", {}).get(stage)
+        if not before:
+            lines.append(f"{stage}: new")
+            continue
+        changes = []
+        for key in ("p50_ms", "p95_ms", "pages_per_sec"):
+            if before.get(key) and now.get(key) is not None:
+                change = (now[key] - before[key]) / before[key] * 100
+                changes.append(f"{key} {before[key]} -> {now[key]} ({change:+.1f}%)")
+        lines.append(f"{stage}: " + ", ".join(changes))
+    before_rss = previous.get("resources", {}).get("peak_rss_mb")
+    if before_rss:
+        lines.append(f"peak_rss_mb: {before_rss} -> {current['resources']['peak_rss_mb']}")
+    return lines
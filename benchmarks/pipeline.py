@@ -0,0 +1,239 @@
+# benchmarks/pipeline.py
+"""
+End-to-end benchmark of the document ingest pipeline.
+
+Runs text extraction, the mapping functions and the full process_*_upload
+pipelines over generated samples (text-layer, scanned and mixed PDFs, DOCX,
+JPEG and, with pillow-heif or a bundled file, HEIC) plus any real documents in
+benchmarks/documents/, and writes per-stage latency percentiles, pages/sec, CPU
+time and peak RSS to benchmarks/results/.
+
+The model is stubbed with canned extractions unless LLM_PROVIDER is set, e.g.
+LLM_PROVIDER=replay to replay recorded responses with their real latency.
+The pipeline stage writes to the database in DATABASE_URL (override with
+BENCHMARK_DATABASE_URL); point it at a local database, never production.
+
+Usage:
+    python -m benchmarks.pipeline --iterations 5
+    python -m benchmarks.pipeline --stages extract,map --compare benchmarks/results/<previous>.json
+"""
+
+import os
+
+from benchmarks.samples import STUB_RESPONSES, all_samples, stub_responses_setting
+
+# Settings are read on import, so the environment is set before any app module is loaded
+os.environ.setdefault("LLM_PROVIDER", "stub")
+os.environ.setdefault("LLM_STUB_RESPONSES", stub_responses_setting())
+if os.environ.get("BENCHMARK_DATABASE_URL"):
+    os.environ["DATABASE_URL"] = os.environ["BENCHMARK_DATABASE_URL"]
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import subprocess
+import uuid
+from datetime import datetime
+from io import BytesIO
+from typing import List
+
+from app import crud, schemas
+from app.core.auth.auth_service import create_user
+from app.core.config import settings
+from app.db.database import Base, SessionLocal, engine
+from app.services.contract_processor import process_contract_upload
+from app.services.document_processor import extract_text_from_file
+from app.services.invoice_processor import process_invoice_upload
+from app.services.lease_processor import process_lease_upload
+from app.services.mapping_functions import map_contract_data, map_invoice_data, map_lease_data, parse_json
+from app.services.openai.prompts import compile_prompts
+from benchmarks.metrics import StageTimings, compare, resource_usage
+from benchmarks.samples import Sample
+
+logger = logging.getLogger("benchmarks")
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+STAGES = ("extract", "map", "pipeline")
+MAPPERS = {"lease": map_lease_data, "invoice": map_invoice_data, "contract": map_contract_data}
+# Mapping takes microseconds, so each timed sample covers a batch of calls
+MAPPING_BATCH = 100
+
+
+def run_extraction(samples: List[Sample], iterations: int, timings: StageTimings) -> None:
+    for sample in samples:
+        for _ in range(iterations):
+            with timings.measure(f"extract:{sample.name}", pages=sample.pages):
+                extract_text_from_file(BytesIO(sample.content), sample.filename)
+
+
+def run_mapping(iterations: int, timings: StageTimings) -> None:
+    for document_type, mapper in MAPPERS.items():
+        raw = json.dumps(STUB_RESPONSES[document_type])
+        for _ in range(iterations):
+            with timings.measure(f"map:{document_type}"):
+                for _ in range(MAPPING_BATCH):
+                    mapper(parse_json(raw))
+
+
+async def create_benchmark_owner() -> tuple:
+    """
+    Creates a throwaway user and property for the run and returns their ids.
+    """
+    run_id = uuid.uuid4().hex[:12]
+    async with SessionLocal() as db:
+        user = await create_user(
+            db=db,
+            user_in=schemas.UserCreate(email=f"benchmark-{run_id}@example.com", password=run_id, name="Benchmark")
+        )
+        property = await crud.crud_property.create_with_owner(
+            db=db,
+            obj_in=schemas.PropertyCreate(address=f"Benchmark property {run_id}"),
+            owner_id=user.id
+        )
+        return user.id, property.id
+
+
+async def process_sample(sample: Sample, owner_id: int, property_id: int) -> None:
+    async with SessionLocal() as db:
+        if sample.document_type == "lease":
+            await process_lease_upload(
+                file_content=sample.content,
+                filename=sample.filename,
+                property_id=property_id,
+                document_type="lease",
+                db=db,
+                owner_id=owner_id
+            )
+        elif sample.document_type == "invoice":
+            # Every iteration uploads the same image again
+            await process_invoice_upload(
+                file_content=sample.content,
+                filename=sample.filename,
+                property_id=property_id,
+                document_type="invoice",
+                db=db,
+                owner_id=owner_id,
+                allow_duplicate=True
+            )
+        else:
+            await process_contract_upload(
+                file_content=sample.content,
+                filename=sample.filename,
+                property_id=property_id,
+                document_type="contract",
+                db=db,
+                owner_id=owner_id
+            )
+
+
+async def run_pipelines(samples: List[Sample], iterations: int, concurrency: int, timings: StageTimings) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    compile_prompts()
+    owner_id, property_id = await create_benchmark_owner()
+    logger.info(f"Benchmark data is owned by user {owner_id}, property {property_id}")
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed(sample: Sample) -> None:
+        async with semaphore:
+            try:
+                with timings.measure(f"pipeline:{sample.name}", pages=sample.pages):
+                    await process_sample(sample, owner_id, property_id)
+            except Exception as e:
+                logger.error(f"Pipeline failed for {sample.name}: {e}")
+
+    for sample in samples:
+        await asyncio.gather(*(timed(sample) for _ in range(iterations)))
+    await engine.dispose()
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_summary(stages: dict) -> None:
+    print(f"{'stage':<40}{'n':>5}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}{'cpu ms':>11}{'pages/s':>10}")
+    for stage, row in stages.items():
+        pages_per_sec = row["pages_per_sec"] if row["pages_per_sec"] is not None else "-"
+        print(
+            f"{stage:<40}{row['count']:>5}{row['p50_ms']:>11}{row['p95_ms']:>11}"
+            f"{row['p99_ms']:>11}{row['cpu_ms']:>11}{pages_per_sec:>10}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the document ingest pipeline.")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated subset of extract,map,pipeline")
+    parser.add_argument("--samples", default="", help="Comma-separated sample names (default: all)")
+    parser.add_argument("--lease-pages", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=1, help="Concurrent uploads in the pipeline stage")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="Previous results file to compare against")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if not args.verbose:
+        # The pipeline logs every step; keep only warnings from the app
+        logging.getLogger("app").setLevel(logging.WARNING)
+
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"Unknown stages: {', '.join(sorted(unknown))}")
+
+    samples = all_samples(args.lease_pages)
+    if args.samples:
+        wanted = {name.strip() for name in args.samples.split(",")}
+        samples = [sample for sample in samples if sample.name in wanted]
+
+    timings = StageTimings()
+    if "extract" in stages:
+        run_extraction(samples, args.iterations, timings)
+    if "map" in stages:
+        run_mapping(args.iterations, timings)
+    if "pipeline" in stages:
+        asyncio.run(run_pipelines(samples, args.iterations, args.concurrency, timings))
+
+    results = {
+        "run": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "llm_provider": settings.LLM_PROVIDER,
+            "samples": {sample.name: {"filename": sample.filename, "pages": sample.pages, "bytes": len(sample.content)} for sample in samples},
+        },
+        "stages": timings.summary(),
+        "resources": resource_usage(),
+    }
+
+    print_summary(results["stages"])
+    print(f"peak RSS {results['resources']['peak_rss_mb']} MB, "
+          f"CPU {results['resources']['cpu_user_s']}s user / {results['resources']['cpu_system_s']}s system")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.utcnow():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+        print(f"\nCompared with {args.compare} ({previous['run'].get('git_commit')}):")
+        for line in compare(previous, results):
+            print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+# benchmarks/samples.py
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Dict, List, Optional
+
+import fitz  # PyMuPDF
+from docx import Document
+from PIL import Image, ImageDraw, ImageFont
+
+logger = logging.getLogger(__name__)
+
+# Real documents (e.g. HEIC photos from a phone) dropped here are benchmarked alongside the generated ones
+BUNDLED_SAMPLES_DIR = os.path.join(os.path.dirname(__file__), "documents")
+
+LEASE_TEXT = """RESIDENTIAL LEASE AGREEMENT
+
+This Residential Lease Agreement is made by and between Harbor View Properties LLC ("Landlord") and Jane Doe ("Tenant"), email jane.doe@example.com, phone (555) 201-3344.
+
+PREMISES. Landlord leases to Tenant the premises located at 1200 Ocean Avenue, Unit 4B, Santa Monica, CA 90401, a residential apartment with 2 bedrooms and 1 bathroom on 1 floor.
+
+TERM. The lease term commences on 01/01/2025 and ends on 12/31/2025.
+
+RENT. Tenant shall pay a total rent of $30,000.00, payable in monthly installments of $2,500.00 due on the first day of each month.
+
+SECURITY DEPOSIT. Upon execution of this Lease, Tenant shall deposit $2,500.00 with Landlord as a security deposit, held by Landlord.
+
+UTILITIES. Tenant is responsible for electricity and internet. Landlord pays water, sewer and trash.
+
+PETS. No pets are allowed without the prior written consent of Landlord.
+
+MAINTENANCE. Tenant shall keep the premises clean and report any damage promptly. Landlord is responsible for structural repairs.
+"""
+
+INVOICE_TEXT = """ACME PLUMBING SUPPLY
+450 Industrial Way, Los Angeles, CA 90021
+(555) 310-7788  billing@acmeplumbing.example.com
+
+INVOICE #INV-20417
+Invoice Date: 03/14/2025
+Due Date: 04/13/2025
+
+Description                   Qty   Unit Price   Total
+Kitchen faucet replacement      1      $245.00   $245.00
+Supply lines                    2       $18.50    $37.00
+Labor (hours)                   3       $95.00   $285.00
+
+Amount Due: $567.00
+Paid: $0.00
+Status: Unpaid
+"""
+
+CONTRACT_TEXT = """PROPERTY MANAGEMENT SERVICES AGREEMENT
+
+This Agreement is entered into by and between Harbor View Properties LLC ("Client") and Summit Property Services Inc. ("Contractor"), contact person Mark Lee, phone (555) 420-1100, email mark.lee@summit.example.com, address 88 Market Street, San Francisco, CA 94105.
+
+TERM. This Agreement is effective from 02/01/2025 and ends on 01/31/2026, renewing automatically for one-year terms unless terminated.
+
+SERVICES. Contractor shall provide tenant screening, rent collection, maintenance coordination and monthly financial reporting.
+
+FEES. Client shall pay a management fee of 8% of collected rent, invoiced monthly.
+
+TERMINATION. Either party may terminate this Agreement with 30 days written notice.
+"""
+
+# Canned model responses for the stubbed LLM, shaped like real extractions
+STUB_RESPONSES: Dict[str, dict] = {
+    "classification": {"document_type": "lease"},
+    "lease": {
+        "Lease Type": "Residential",
+        "Description": "Twelve month apartment lease",
+        "Rent Amount": {"Total": "$30,000.00", "Monthly Installment": "$2,500.00"},
+        "Security Deposit": {"Amount": "$2,500.00", "Held By": "Landlord"},
+        "Start Date": "01/01/2025",
+        "End Date": "12/31/2025",
+        "Payment Frequency": "Monthly",
+        "Tenant Information": {
+            "First Name": "Jane",
+            "Last Name": "Doe",
+            "Email": "jane.doe@example.com",
+            "Phone Number": "(555) 201-3344",
+            "Landlord": "Harbor View Properties LLC",
+        },
+        "Special Lease Terms": {"Pets": "Not allowed without written consent"},
+        "Property Information": {
+            "Address": "1200 Ocean Avenue, Unit 4B, Santa Monica, CA 90401",
+            "Num Bedrooms": 2,
+            "Num Bathrooms": 1,
+            "Num Floors": 1,
+            "Property Type": "residential",
+        },
+    },
+    "invoice": {
+        "Invoice Number": "INV-20417",
+        "Amount": "$567.00",
+        "Paid Amount": "$0.00",
+        "Invoice Date": "03/14/2025",
+        "Due Date": "04/13/2025",
+        "Status": "Unpaid",
+        "Description": "Kitchen faucet replacement",
+        "Vendor Information": {
+            "Name": "Acme Plumbing Supply",
+            "Address": "450 Industrial Way, Los Angeles, CA 90021",
+            "Phone Number": "(555) 310-7788",
+            "Email": "billing@acmeplumbing.example.com",
+        },
+        "Line Items": [
+            {"Description": "Kitchen faucet replacement", "Quantity": "1", "Unit Price": "$245.00", "Total Price": "$245.00"},
+            {"Description": "Supply lines", "Quantity": "2", "Unit Price": "$18.50", "Total Price": "$37.00"},
+            {"Description": "Labor (hours)", "Quantity": "3", "Unit Price": "$95.00", "Total Price": "$285.00"},
+        ],
+    },
+    "contract": {
+        "Contract Type": "Property Management",
+        "Description": "Property management services",
+        "Start Date": "02/01/2025",
+        "End Date": "01/31/2026",
+        "Terms": {"Management Fee": "8% of collected rent", "Termination": "30 days written notice"},
+        "Is Active": "true",
+        "Parties Involved": ["Harbor View Properties LLC", "Summit Property Services Inc."],
+        "Vendor Information": {
+            "Name": "Summit Property Services Inc.",
+            "Address": "88 Market Street, San Francisco, CA 94105",
+            "Contact Person": "Mark Lee",
+            "Phone Number": "(555) 420-1100",
+            "Email": "mark.lee@summit.example.com",
+        },
+    },
+}
+
+
+@dataclass
+class Sample:
+    name: str
+    filename: str
+    content: bytes
+    # Document type the sample is processed as in the pipeline benchmark
+    document_type: str
+    pages: int
+
+
+def stub_responses_setting() -> str:
+    """
+    The LLM_STUB_RESPONSES value for the benchmark, as the JSON string pydantic-settings reads.
+    """
+    return json.dumps({task: json.dumps(response) for task, response in STUB_RESPONSES.items()})
+
+
+def render_text_image(text: str, width: int = 1700, height: int = 2200) -> Image.Image:
+    """
+    Renders text on a white letter-size page at roughly 200 DPI, like a phone photo or scan.
+    """
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=30)
+    y = 100
+    for paragraph in text.splitlines():
+        line = ""
+        for word in paragraph.split():
+            candidate = f"{line} {word}".strip()
+            if draw.textlength(candidate, font=font) > width - 200:
+                draw.text((100, y), line, fill="black", font=font)
+                y += 42
+                line = word
+            else:
+                line = candidate
+        draw.text((100, y), line, fill="black", font=font)
+        y += 42
+        if y > height - 100:
+            break
+    return image
+
+
+def _jpeg(image: Image.Image) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def build_pdf(pages: List[Dict[str, object]]) -> bytes:
+    """
+    Builds a PDF from page specs: {"text": str} pages get a text layer, {"image": Image}
+    pages contain only a scanned image and go through OCR.
+    """
+    doc = fitz.open()
+    for spec in pages:
+        page = doc.new_page(width=612, height=792)
+        if "text" in spec:
+            page.insert_textbox(fitz.Rect(54, 54, 558, 738), spec["text"], fontsize=10, fontname="helv")
+        else:
+            page.insert_image(page.rect, stream=_jpeg(spec["image"]))
+    content = doc.tobytes()
+    doc.close()
+    return content
+
+
+def build_docx(text: str) -> bytes:
+    document = Document()
+    for paragraph in text.split("\n\n"):
+        document.add_paragraph(paragraph.strip())
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def build_heic(image: Image.Image) -> Optional[bytes]:
+    """
+    pyheif can only read HEIC; writing needs pillow-heif, which is not a dependency.
+    Without it, HEIC is covered by bundled samples only.
+    """
+    try:
+        import pillow_heif
+    except ImportError:
+        return None
+    pillow_heif.register_heif_opener()
+    buffer = BytesIO()
+    image.save(buffer, format="HEIF")
+    return buffer.getvalue()
+
+
+def generate_samples(lease_pages: int = 8) -> List[Sample]:
+    """
+    Generates one sample of each format the pipeline accepts.
+
+    Args:
+        lease_pages (int): Pages in the multi-page lease PDFs.
+    """
+    invoice_scan = render_text_image(INVOICE_TEXT)
+    lease_scans = [render_text_image(LEASE_TEXT) for _ in range(2)]
+
+    samples = [
+        Sample("pdf_text_lease", "lease_text.pdf", build_pdf([{"text": LEASE_TEXT}] * lease_pages), "lease", lease_pages),
+        Sample("pdf_scanned_lease", "lease_scanned.pdf", build_pdf([{"image": image} for image in lease_scans]), "lease", len(lease_scans)),
+        Sample(
+            "pdf_mixed_lease",
+            "lease_mixed.pdf",
+            build_pdf([{"text": LEASE_TEXT}] * (lease_pages - 1) + [{"image": lease_scans[0]}]),
+            "lease",
+            lease_pages,
+        ),
+        Sample("pdf_text_contract", "contract_text.pdf", build_pdf([{"text": CONTRACT_TEXT}] * 2), "contract", 2),
+        Sample("docx_contract", "contract.docx", build_docx(CONTRACT_TEXT), "contract", 1),
+        Sample("jpeg_invoice", "invoice.jpeg", _jpeg(invoice_scan), "invoice", 1),
+    ]
+
+    heic = build_heic(invoice_scan)
+    if heic is not None:
+        samples.append(Sample("heic_invoice", "invoice.heic", heic, "invoice", 1))
+    return samples
+
+
+def load_bundled_samples(directory: str = BUNDLED_SAMPLES_DIR) -> List[Sample]:
+    """
+    Loads real documents from benchmarks/documents/. The document type is the
+    filename prefix (e.g. invoice_receipt.heic), defaulting to invoice for images.
+    """
+    samples = []
+    if not os.path.isdir(directory):
+        return samples
+    for filename in sorted(os.listdir(directory)):
+        extension = os.path.splitext(filename)[1].lower()
+        if extension not in {".pdf", ".docx", ".jpg", ".jpeg", ".png", ".heic"}:
+            continue
+        with open(os.path.join(directory, filename), "rb") as f:
+            content = f.read()
+        prefix = filename.split("_")[0].lower()
+        if prefix in {"lease", "invoice", "contract"}:
+            document_type = prefix
+        else:
+            document_type = "lease" if extension in {".pdf", ".docx"} else "invoice"
+        pages = 1
+        if extension == ".pdf":
+            with fitz.open(stream=content, filetype="pdf") as doc:
+                pages = doc.page_count
+        samples.append(Sample(f"bundled_{os.path.splitext(filename)[0]}", filename, content, document_type, pages))
+    return samples
+
+
+def all_samples(lease_pages: int = 8) -> List[Sample]:
+    samples = generate_samples(lease_pages) + load_bundled_samples()
+    if not any(sample.filename.lower().endswith(".heic") for sample in samples):
+        logger.warning(
+            "No HEIC sample: install pillow-heif to generate one or add a .heic file to benchmarks/documents/"
+        )
+    return samples
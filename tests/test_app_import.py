@@ -0,0 +1,10 @@
+# tests/test_app_import.py
+
+import importlib
+
+
+def test_app_imports():
+    # Catches import errors in any router, CRUD module or service the API loads
+    main = importlib.import_module("app.main")
+
+    assert main.app.title == "Spaceify"
@@ -0,0 +1,97 @@
+# tests/test_model_router.py
+
+import asyncio
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.services.openai.circuit_breaker import llm_breaker
+from app.services.openai.llm_client import StubModelClient
+from app.services.openai.model_router import complete_json
+
+VALID_INVOICE = json.dumps({"Invoice Number": "INV-1", "Amount": "120.00"})
+
+
+class TieredStubClient(StubModelClient):
+    """
+    Answers each model with its own canned response; an exception is raised instead.
+    """
+
+    def __init__(self, by_model: dict):
+        super().__init__(responses={})
+        self.by_model = by_model
+        self.models = []
+
+    async def complete(self, messages: list, model: str, timeout: float, task: str):
+        self.models.append(model)
+        response = self.by_model[model]
+        if isinstance(response, Exception):
+            raise response
+        self.responses = {task: response}
+        return await super().complete(messages, model, timeout, task)
+
+
+@pytest.fixture(autouse=True)
+def fast_first(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "openai")
+    monkeypatch.setattr(settings, "LLM_TASK_TIERS", {"invoice": "fast"})
+    llm_breaker.record_success()
+    yield
+    llm_breaker.record_success()
+
+
+def run(client, validate=None, usage=None):
+    messages = [{"role": "user", "content": "Invoice INV-1, total $120.00"}]
+    return asyncio.run(complete_json(client, "invoice", messages, validate=validate, usage=usage))
+
+
+def test_valid_fast_response_does_not_escalate():
+    client = TieredStubClient({settings.LLM_FAST_MODEL: VALID_INVOICE})
+
+    assert run(client) == json.loads(VALID_INVOICE)
+    assert client.models == [settings.LLM_FAST_MODEL]
+
+
+def test_exception_escalates_to_strong_tier():
+    client = TieredStubClient({
+        settings.LLM_FAST_MODEL: ValueError("bad request"),
+        settings.LLM_STRONG_MODEL: VALID_INVOICE,
+    })
+    usage = []
+
+    assert run(client, usage=usage) == json.loads(VALID_INVOICE)
+    assert client.models == [settings.LLM_FAST_MODEL, settings.LLM_STRONG_MODEL]
+    assert [(record.tier, record.success) for record in usage] == [("fast", False), ("strong", True)]
+
+
+def test_invalid_json_escalates_to_strong_tier():
+    client = TieredStubClient({
+        settings.LLM_FAST_MODEL: "Here is the invoice: {Invoice Number: INV-1",
+        settings.LLM_STRONG_MODEL: VALID_INVOICE,
+    })
+
+    assert run(client) == json.loads(VALID_INVOICE)
+    assert client.models == [settings.LLM_FAST_MODEL, settings.LLM_STRONG_MODEL]
+
+
+def test_rejected_response_escalates_to_strong_tier():
+    client = TieredStubClient({
+        settings.LLM_FAST_MODEL: json.dumps({"Invoice Number": "INV-1", "Amount": "Not Found"}),
+        settings.LLM_STRONG_MODEL: VALID_INVOICE,
+    })
+
+    result = run(client, validate=lambda parsed: parsed.get("Amount") != "Not Found")
+
+    assert result == json.loads(VALID_INVOICE)
+    assert client.models == [settings.LLM_FAST_MODEL, settings.LLM_STRONG_MODEL]
+
+
+def test_last_parsed_response_returned_when_every_tier_is_rejected():
+    partial = json.dumps({"Invoice Number": "INV-1", "Amount": "Not Found"})
+    client = TieredStubClient({settings.LLM_FAST_MODEL: partial, settings.LLM_STRONG_MODEL: partial})
+
+    result = run(client, validate=lambda parsed: False)
+
+    assert result == json.loads(partial)
+    assert client.models == [settings.LLM_FAST_MODEL, settings.LLM_STRONG_MODEL]
@@ -0,0 +1,25 @@
+# tests/test_packet_headers.py
+
+import pytest
+
+from app.services.packet_processor import detect_header
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("RESIDENTIAL LEASE AGREEMENT\nThis lease is made between", "lease"),
+    ("Lease\nThis lease is made between", "lease"),
+    ("LEASE\nPremises: 12 Elm St", "lease"),
+    ("Invoice #1042\nBill to: Elm Street LLC", "invoice"),
+    ("ADDENDUM A\nPets", "addendum"),
+])
+def test_titles_start_a_segment(text, expected):
+    assert detect_header(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "Lease term: 12 months\nRent is due on the first",
+    "Lease Date 01/01/2026\nAmount due $1,200.00",
+    "Tenant shall keep the premises clean",
+])
+def test_body_lines_mentioning_a_lease_are_not_titles(text):
+    assert detect_header(text) is None
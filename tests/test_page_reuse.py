@@ -0,0 +1,62 @@
+# tests/test_page_reuse.py
+
+from io import BytesIO
+
+import fitz
+from PIL import Image, ImageDraw
+
+from app.services.document_processor import PDFProcessor
+
+
+def scanned_pdf(rent: str) -> bytes:
+    """
+    A one-page PDF holding only an image (no text layer), like a scan.
+    """
+    image = Image.new("RGB", (850, 1100), "white")
+    draw = ImageDraw.Draw(image)
+    draw.text((100, 100), "RESIDENTIAL LEASE AGREEMENT", fill="black")
+    draw.text((100, 200), f"Monthly rent: {rent}", fill="black")
+    png = BytesIO()
+    image.save(png, format="PNG")
+
+    with fitz.open() as doc:
+        page = doc.new_page(width=612, height=792)
+        page.insert_image(page.rect, stream=png.getvalue())
+        return doc.tobytes()
+
+
+def extract(content: bytes, known_ocr_pages=None):
+    processor = PDFProcessor(BytesIO(content), "lease.pdf")
+    return processor.extract_page_records(fingerprint=True, known_ocr_pages=known_ocr_pages)
+
+
+def known_pages(pages):
+    known = {}
+    for page in pages:
+        known.setdefault(page.image_hash, {})[page.pixel_hash] = page.text
+    return known
+
+
+def test_identical_scan_reuses_ocr_text(monkeypatch):
+    monkeypatch.setattr(PDFProcessor, "_run_ocr", lambda self, img, page_number: "Monthly rent: $1,200.00")
+    original = extract(scanned_pdf("$1,200.00"))
+
+    monkeypatch.setattr(PDFProcessor, "_run_ocr", lambda self, img, page_number: "OCR ran again")
+    [page] = extract(scanned_pdf("$1,200.00"), known_pages(original))
+
+    assert page.reused
+    assert page.text == "Monthly rent: $1,200.00"
+
+
+def test_edited_figure_is_ocred_again(monkeypatch):
+    monkeypatch.setattr(PDFProcessor, "_run_ocr", lambda self, img, page_number: "Monthly rent: $1,200.00")
+    [original] = extract(scanned_pdf("$1,200.00"))
+
+    monkeypatch.setattr(PDFProcessor, "_run_ocr", lambda self, img, page_number: "Monthly rent: $1,950.00")
+    [amended] = extract(scanned_pdf("$1,950.00"), known_pages([original]))
+
+    # The thumbnail hash cannot tell the two apart; the pixel hash can
+    assert amended.image_hash == original.image_hash
+    assert amended.pixel_hash != original.pixel_hash
+    assert not amended.reused
+    assert amended.text == "Monthly rent: $1,950.00"
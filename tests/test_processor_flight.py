@@ -0,0 +1,105 @@
+# tests/test_processor_flight.py
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import Request
+
+from app.api.endpoints import processor
+from app.core.security import get_current_user
+from app.db.database import SessionLocal, get_db
+from app.main import app
+from app.models.property import Property
+from app.models.user import User
+
+# owner id -> the property ids they own
+OWNED = {1: {10, 11}, 2: {20}}
+
+LEASE_PDF = b"%PDF-1.4 lease signed by both parties"
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """
+    Replaces the lease pipeline with one that waits for `release` and counts its
+    runs. Everything in front of it (auth, property check, flight key) is real.
+    """
+    state = {"runs": [], "release": asyncio.Event()}
+
+    async def fake_lease_upload(file_content, filename, property_id, document_type, db, owner_id, **kwargs):
+        state["runs"].append((owner_id, property_id))
+        run = len(state["runs"])
+        await state["release"].wait()
+        return {"owner_id": owner_id, "property_id": property_id, "run": run}
+
+    async def get_property_by_owner(db, property_id, owner_id, **kwargs):
+        if property_id in OWNED.get(owner_id, set()):
+            return Property(id=property_id, owner_id=owner_id)
+        return None
+
+    async def override_db():
+        async with SessionLocal() as session:
+            yield session
+
+    async def override_user(request: Request):
+        owner_id = int(request.headers["Authorization"].removeprefix("Bearer owner-"))
+        return User(id=owner_id, email=f"owner{owner_id}@example.com")
+
+    monkeypatch.setattr(processor, "process_lease_upload", fake_lease_upload)
+    monkeypatch.setattr(processor.crud.crud_property, "get_property_by_owner", get_property_by_owner)
+    monkeypatch.setattr(processor, "processing_flight", processor.SingleFlight("document processing"))
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_current_user] = override_user
+    yield state
+    app.dependency_overrides.clear()
+
+
+def upload(client, owner_id, property_id):
+    return client.post(
+        "/processor/process",
+        data={"property_id": str(property_id), "document_type": "lease"},
+        files={"file": ("lease.pdf", LEASE_PDF, "application/pdf")},
+        headers={"Authorization": f"Bearer owner-{owner_id}"},
+    )
+
+
+async def wait_for(condition):
+    for _ in range(500):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("timed out")
+
+
+def test_identical_uploads_share_one_pipeline_run(pipeline):
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = [asyncio.ensure_future(upload(client, 1, 10)) for _ in range(3)]
+            await wait_for(lambda: processor.processing_flight.coalesced == 2)
+
+            # Another owner sending the same file for owner 1's property is refused
+            # before reaching the flight
+            intruder = await upload(client, 2, 10)
+            assert processor.processing_flight.coalesced == 2
+
+            # The same file for their own property is a separate run, as is the
+            # same file for another of owner 1's properties
+            second = asyncio.ensure_future(upload(client, 2, 20))
+            await wait_for(lambda: len(pipeline["runs"]) == 2)
+            other_property = asyncio.ensure_future(upload(client, 1, 11))
+            await wait_for(lambda: len(pipeline["runs"]) == 3)
+
+            pipeline["release"].set()
+            return await asyncio.gather(*first), intruder, await second, await other_property
+
+    first, intruder, second, other_property = asyncio.run(scenario())
+
+    assert pipeline["runs"] == [(1, 10), (2, 20), (1, 11)]
+    assert [response.status_code for response in first] == [200, 200, 200]
+    assert [response.json() for response in first] == [{"owner_id": 1, "property_id": 10, "run": 1}] * 3
+    assert intruder.status_code == 404
+    assert second.status_code == 200
+    assert second.json() == {"owner_id": 2, "property_id": 20, "run": 2}
+    assert other_property.json() == {"owner_id": 1, "property_id": 11, "run": 3}
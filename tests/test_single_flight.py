@@ -0,0 +1,116 @@
+# tests/test_single_flight.py
+
+import asyncio
+
+import pytest
+
+from app.utils.single_flight import SingleFlight
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight("test")
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"value": calls}
+
+    async def scenario():
+        return await asyncio.gather(*(flight.do("key", work) for _ in range(10)))
+
+    results = run(scenario())
+
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"started": 1, "coalesced": 9, "in_flight": 0}
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def work(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return key
+
+    async def scenario():
+        return await asyncio.gather(
+            flight.do("a", lambda: work("a")),
+            flight.do("b", lambda: work("b")),
+        )
+
+    assert run(scenario()) == ["a", "b"]
+    assert sorted(calls) == ["a", "b"]
+
+
+def test_exception_propagates_to_every_waiter():
+    flight = SingleFlight("test")
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise ValueError("extraction failed")
+
+    async def scenario():
+        return await asyncio.gather(*(flight.do("key", work) for _ in range(5)), return_exceptions=True)
+
+    errors = run(scenario())
+
+    assert calls == 1
+    assert all(isinstance(error, ValueError) for error in errors)
+    assert all(error is errors[0] for error in errors)
+    assert flight.in_flight == 0
+
+
+def test_cancelled_caller_does_not_cancel_shared_call():
+    flight = SingleFlight("test")
+
+    async def scenario():
+        started = asyncio.Event()
+        finish = asyncio.Event()
+
+        async def work():
+            started.set()
+            await finish.wait()
+            return "done"
+
+        leader = asyncio.ensure_future(flight.do("key", work))
+        await started.wait()
+        follower = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+
+        # The client that started the call disconnects
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+        finish.set()
+        return await follower
+
+    assert run(scenario()) == "done"
+    assert flight.stats()["started"] == 1
+
+
+def test_next_call_after_completion_starts_again():
+    flight = SingleFlight("test")
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    async def scenario():
+        return await flight.do("key", work), await flight.do("key", work)
+
+    assert run(scenario()) == (1, 2)
+